@@ -23,7 +23,7 @@ from app.schemas.auth import (
     UserCreate,
     UserResponse,
 )
-from app.services.database import DatabaseService, database_service
+from app.services.database import database_service
 from app.utils.auth import create_access_token, verify_token
 from app.utils.sanitization import (
     sanitize_email,
@@ -32,7 +32,6 @@ from app.utils.sanitization import (
 )
 router = APIRouter()
 security = HTTPBearer()
-db_service = DatabaseService()
 
 
 
@@ -199,7 +198,7 @@ async def get_user_sessions(user: User = Depends(get_current_user)):
     Retrieve all historical chat sessions for the user.
     """
     try:
-        sessions = await db_service.get_user_sessions(user.id)
+        sessions = await database_service.get_user_sessions(user.id)
         return [
             SessionResponse(
                 session_id=sanitize_string(session.id),
@@ -237,7 +236,7 @@ async def update_session_name(
             raise HTTPException(status_code=403, detail="Cannot modify other sessions")
 
         # Update the session name
-        session = await db_service.update_session_name(sanitized_session_id, sanitized_name)
+        session = await database_service.update_session_name(sanitized_session_id, sanitized_name)
 
         # Create a new token (not strictly necessary but maintains consistency)
         token = create_access_token(sanitized_session_id)
@@ -261,7 +260,7 @@ async def delete_session(session_id: str, current_session: Session = Depends(get
             raise HTTPException(status_code=403, detail="Cannot delete other sessions")
 
         # Delete the session
-        await db_service.delete_session(sanitized_session_id)
+        await database_service.delete_session(sanitized_session_id)
 
         logger.info("session_deleted", session_id=session_id, user_id=current_session.user_id)
     except ValueError as ve:
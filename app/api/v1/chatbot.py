@@ -1,25 +1,42 @@
 import json
-from typing import List
+import time
+from typing import (
+    List,
+    Optional,
+)
 
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
     HTTPException,
+    Query,
     Request,
 )
 
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from app.api.v1.auth import get_current_session
 from app.core.config import settings
-from app.core.langgraph.graph import LangGraphAgent
+from app.core.langgraph.graph import (
+    HistoryCursorError,
+    LangGraphAgent,
+)
 from app.core.limiter import limiter
 from app.core.config.logging import get_logger
 
 from app.core.metrics import llm_stream_duration_seconds
 from app.models.session import Session
+from app.services.idempotency import (
+    IdempotencyKeyMismatchError,
+    chat_requests,
+    request_fingerprint,
+)
+from app.services.llm_dispatcher import LLMOverloadedError
 
 from app.schemas.chat import (
+    ChatHistoryResponse,
     ChatRequest,
     ChatResponse,
     Message,
@@ -32,16 +49,29 @@ router = APIRouter()
 agent = LangGraphAgent()
 
 
+def _overloaded(error: LLMOverloadedError) -> HTTPException:
+    """503 telling the client when to retry a request shed by LLM admission control."""
+    return HTTPException(
+        status_code=503,
+        detail="The assistant is busy, please retry shortly",
+        headers={"Retry-After": str(int(error.retry_after))},
+    )
+
+
 @router.post("/chat", response_model=ChatResponse)
 @limiter.limit(settings.RATE_LIMIT_ENDPOINTS["chat"][0])
 async def chat(
     request: Request,
     chat_request: ChatRequest,
     session: Session = Depends(get_current_session),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key", max_length=255),
 ):
     """
     Standard Request/Response Chat Endpoint.
     Executes the full LangGraph workflow and returns the final state.
+
+    With an Idempotency-Key header, a retry of the same request (same session and
+    body) reuses the in-flight or completed result instead of running the graph again.
     """
     try:
         logger.info(
@@ -52,14 +82,28 @@ async def chat(
 
         # Delegate execution to our LangGraph Agent
         # session.id becomes the "thread_id" for graph persistence
-        result = await agent.get_response(
-            chat_request.messages, 
-            session_id=session.id, 
-            user_id=str(session.user_id)
-        )
+        def run_graph():
+            return agent.get_response(
+                chat_request.messages,
+                session_id=session.id,
+                user_id=str(session.user_id)
+            )
+
+        if idempotency_key:
+            result = await chat_requests.run(
+                f"{session.id}:{idempotency_key}",
+                request_fingerprint(chat_request.model_dump()),
+                run_graph,
+            )
+        else:
+            result = await run_graph()
         logger.info("chat_request_processed", session_id=session.id)
         return ChatResponse(messages=result)
-        
+
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except LLMOverloadedError as e:
+        raise _overloaded(e)
     except Exception as e:
         logger.error("chat_request_failed", session_id=session.id, error=str(e), exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -78,6 +122,14 @@ async def chat_stream(
     try:
         logger.info("stream_chat_init", session_id=session.id)
 
+        stream = agent.get_stream_response(chat_request.messages, session.id, user_id=session.user_id)
+        started = time.perf_counter()
+        # Wait for the first chunk before sending headers, so a request shed by
+        # admission control still gets a 503 with Retry-After
+        try:
+            first_chunk = await anext(stream)
+        except StopAsyncIteration:
+            first_chunk = None
 
         async def event_generator():
             """
@@ -85,13 +137,14 @@ async def chat_stream(
             """
             try:
                 full_response = ""
-                with llm_stream_duration_seconds.labels(model=agent.llm_service.get_llm().get_name()).time():
-                    async for chunk in agent.get_stream_response(
-                        chat_request.messages, session.id, user_id=session.user_id
-                    ):
-                        full_response += chunk
-                        response = StreamResponse(content=chunk, done=False)
-                        yield f"data: {json.dumps(response.model_dump())}\n\n"
+                if first_chunk is not None:
+                    full_response += first_chunk
+                    response = StreamResponse(content=first_chunk, done=False)
+                    yield f"data: {json.dumps(response.model_dump())}\n\n"
+                async for chunk in stream:
+                    full_response += chunk
+                    response = StreamResponse(content=chunk, done=False)
+                    yield f"data: {json.dumps(response.model_dump())}\n\n"
 
                 # Send final message indicating completion
                 final_response = StreamResponse(content="", done=True)
@@ -106,9 +159,25 @@ async def chat_stream(
                 )
                 error_response = StreamResponse(content=str(e), done=True)
                 yield f"data: {json.dumps(error_response.model_dump())}\n\n"
+            finally:
+                await stream.aclose()
+                llm_stream_duration_seconds.labels(model=agent.llm_service.default_model).observe(
+                    time.perf_counter() - started
+                )
 
-        return StreamingResponse(event_generator(), media_type="text/event-stream")
-
+        # From the first chunk on, the agent stream holds the thread lock and an LLM
+        # slot: close it if anything fails before the response is handed over, and
+        # after the response even when the body was never iterated (client gone)
+        try:
+            return StreamingResponse(
+                event_generator(), media_type="text/event-stream", background=BackgroundTask(stream.aclose)
+            )
+        except BaseException:
+            await stream.aclose()
+            raise
+
+    except LLMOverloadedError as e:
+        raise _overloaded(e)
     except Exception as e:
         logger.error(
             "stream_chat_request_failed",
@@ -118,19 +187,26 @@ async def chat_stream(
         )
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/messages", response_model=ChatResponse)
+@router.get("/messages", response_model=ChatHistoryResponse)
 @limiter.limit(settings.RATE_LIMIT_ENDPOINTS["messages"][0])
 async def get_session_messages(
     request: Request,
     session: Session = Depends(get_current_session),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000, description="Return at most this many recent messages"),
+    before: Optional[str] = Query(default=None, description="Cursor from a previous page's next_before"),
 ):
     """
-    Retrieve the full conversation history for the current session.
-    Fetches state directly from the LangGraph checkpoints.
+    Retrieve the conversation history for the current session, newest page first.
+    Reads only the messages of the latest LangGraph checkpoint; without `limit`
+    the whole history is returned. An unknown `before` cursor (mistyped, or its
+    message was folded into the summary) gets a 400.
     """
     try:
-        messages = await agent.get_chat_history(session.id)
-        return ChatResponse(messages=messages)
+        messages, next_before = await agent.get_chat_history(session.id, limit=limit, before=before)
+        return ChatHistoryResponse(messages=messages, next_before=next_before)
+    except HistoryCursorError as e:
+        # Mistyped, or its message was folded into the summary: restart from the latest page
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("fetch_history_failed", session_id=session.id, error=str(e))
         raise HTTPException(status_code=500, detail="Failed to fetch history")
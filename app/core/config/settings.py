@@ -125,6 +125,16 @@ def parse_dict_of_lists_from_env(prefix, default_dict=None):
     return result
 
 
+# Parse per-name overrides from environment variables with prefix
+def parse_prefixed_env(prefix, cast=str):
+    """Parse {name: value} from environment variables like <PREFIX><NAME>=<value>."""
+    result = {}
+    for key, value in os.environ.items():
+        if key.startswith(prefix) and value:
+            result[key[len(prefix) :].lower()] = cast(value.strip("\"'"))
+    return result
+
+
 class Settings:
     """Application settings without using pydantic."""
 
@@ -168,15 +178,134 @@ class Settings:
         self.MAX_TOKENS = int(os.getenv("MAX_TOKENS", "2000"))
         self.MAX_LLM_CALL_RETRIES = int(os.getenv("MAX_LLM_CALL_RETRIES", "3"))
 
+        # Per-model circuit breaker over a rolling window: opens when, with at least
+        # MIN_CALLS attempts, the error rate or p95 latency crosses its threshold
+        self.LLM_BREAKER_WINDOW_SECONDS = float(os.getenv("LLM_BREAKER_WINDOW_SECONDS", "60"))
+        self.LLM_BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "5"))
+        self.LLM_BREAKER_ERROR_RATE = float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+        self.LLM_BREAKER_SLOW_CALL_SECONDS = float(os.getenv("LLM_BREAKER_SLOW_CALL_SECONDS", "30"))
+        self.LLM_BREAKER_OPEN_SECONDS = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+        self.LLM_BREAKER_HALF_OPEN_PROBES = int(os.getenv("LLM_BREAKER_HALF_OPEN_PROBES", "1"))
+
+        # Hedged requests (non-streaming /chat only, opt-in): fire a backup call when the
+        # primary outlives the LLM_HEDGE_PERCENTILE of recent latency; target "same" model
+        # or the next model in the route ("fallback")
+        self.LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "false").lower() in ("true", "1", "t", "yes")
+        self.LLM_HEDGE_TARGET = os.getenv("LLM_HEDGE_TARGET", "same")
+        self.LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+        self.LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1.0"))
+        self.LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+        self.LLM_HEDGE_WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", "200"))
+        # Budget: hedges earned per hedgeable call, and the max that can be saved up
+        self.LLM_HEDGE_BUDGET_RATIO = float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.05"))
+        self.LLM_HEDGE_BUDGET_BURST = int(os.getenv("LLM_HEDGE_BUDGET_BURST", "5"))
+
+        # Client-side RPM/TPM token buckets per model. Limits of 0 are learned from the
+        # provider's x-ratelimit-* headers; per-model overrides: LLM_RPM_LIMIT_GPT_4O=500.
+        # A call waits up to MAX_WAIT seconds for quota before moving to the next model;
+        # the last model of the route waits up to MAX_QUEUE_WAIT
+        self.LLM_RATE_LIMIT_ENABLED = os.getenv("LLM_RATE_LIMIT_ENABLED", "true").lower() in ("true", "1", "t", "yes")
+        self.LLM_RPM_LIMIT = float(os.getenv("LLM_RPM_LIMIT", "0"))
+        self.LLM_TPM_LIMIT = float(os.getenv("LLM_TPM_LIMIT", "0"))
+        self.LLM_RPM_LIMITS = parse_prefixed_env("LLM_RPM_LIMIT_", float)
+        self.LLM_TPM_LIMITS = parse_prefixed_env("LLM_TPM_LIMIT_", float)
+        self.LLM_RATE_LIMIT_MAX_WAIT = float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT", "1.0"))
+        self.LLM_RATE_LIMIT_MAX_QUEUE_WAIT = float(os.getenv("LLM_RATE_LIMIT_MAX_QUEUE_WAIT", "30"))
+
+        # Priority admission control for LLM work (stream > chat > background): slots are
+        # capped globally and per class (LLM_CONCURRENCY_STREAM/CHAT/BACKGROUND); a request
+        # waiting longer than LLM_QUEUE_SLO_<CLASS> seconds gets a 503 (0 = never shed)
+        self.LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+        self.LLM_CONCURRENCY_LIMITS = {"background": 4, **parse_prefixed_env("LLM_CONCURRENCY_", int)}
+        self.LLM_QUEUE_SLOS = {"stream": 5.0, "chat": 10.0, **parse_prefixed_env("LLM_QUEUE_SLO_", float)}
+
+        # Exact-match LLM response cache: backend "memory" (per process), "postgres"
+        # (memory in front of a shared table) or "none". Opt-in: a repeated prompt gets
+        # the earlier completion instead of a fresh sample
+        self.LLM_RESPONSE_CACHE_BACKEND = os.getenv("LLM_RESPONSE_CACHE_BACKEND", "none")
+        self.LLM_RESPONSE_CACHE_TTL = float(os.getenv("LLM_RESPONSE_CACHE_TTL", "600"))
+        self.LLM_RESPONSE_CACHE_MAX_SIZE = int(os.getenv("LLM_RESPONSE_CACHE_MAX_SIZE", "1000"))
+
+        # Idempotency-Key on /chat: how long (and how many) completed results are replayed
+        self.IDEMPOTENCY_KEY_TTL = float(os.getenv("IDEMPOTENCY_KEY_TTL", "3600"))
+        self.IDEMPOTENCY_KEY_MAX_SIZE = int(os.getenv("IDEMPOTENCY_KEY_MAX_SIZE", "10000"))
+
+        # Prompt templates: hot-reload check interval (0 disables) and the date
+        # resolution rendered into the system prompt (coarser = more prompt-cache hits)
+        self.PROMPT_RELOAD_INTERVAL = float(os.getenv("PROMPT_RELOAD_INTERVAL", "5"))
+        self.PROMPT_DATETIME_FORMAT = os.getenv("PROMPT_DATETIME_FORMAT", "%Y-%m-%d")
+        # "cache_aware" puts date/memory after the history so the prompt prefix is reusable;
+        # "legacy" keeps them inside the leading system message
+        self.PROMPT_LAYOUT = os.getenv("PROMPT_LAYOUT", "cache_aware")
+
+        # Tool execution: the calls of one model turn run concurrently, each tool capped
+        # at TOOL_MAX_CONCURRENCY in-flight calls per process and TOOL_CALL_TIMEOUT seconds.
+        # Per-tool overrides: TOOL_CONCURRENCY_<TOOL_NAME>=2, TOOL_TIMEOUT_<TOOL_NAME>=10
+        self.TOOL_MAX_CONCURRENCY = int(os.getenv("TOOL_MAX_CONCURRENCY", "4"))
+        self.TOOL_CALL_TIMEOUT = float(os.getenv("TOOL_CALL_TIMEOUT", "30"))
+        self.TOOL_CONCURRENCY_LIMITS = parse_prefixed_env("TOOL_CONCURRENCY_", int)
+        self.TOOL_TIMEOUTS = parse_prefixed_env("TOOL_TIMEOUT_", float)
+
+        # Tool result cache: backend "memory" (per process), "postgres" (shared) or "none".
+        # Per-tool overrides: TOOL_CACHE_TTL_<TOOL_NAME>=60 (0 disables), TOOL_CACHE_MAX_SIZE_<TOOL_NAME>=100
+        self.TOOL_CACHE_BACKEND = os.getenv("TOOL_CACHE_BACKEND", "memory")
+        self.TOOL_CACHE_TTL = float(os.getenv("TOOL_CACHE_TTL", "900"))
+        self.TOOL_CACHE_MAX_SIZE = int(os.getenv("TOOL_CACHE_MAX_SIZE", "1000"))
+        self.TOOL_CACHE_TTLS = parse_prefixed_env("TOOL_CACHE_TTL_", float)
+        self.TOOL_CACHE_MAX_SIZES = parse_prefixed_env("TOOL_CACHE_MAX_SIZE_", int)
+
         # Long term memory Configuration
         self.LONG_TERM_MEMORY_MODEL = os.getenv("LONG_TERM_MEMORY_MODEL", "gpt-5-nano")
         self.LONG_TERM_MEMORY_EMBEDDER_MODEL = os.getenv("LONG_TERM_MEMORY_EMBEDDER_MODEL", "text-embedding-3-small")
         self.LONG_TERM_MEMORY_COLLECTION_NAME = os.getenv("LONG_TERM_MEMORY_COLLECTION_NAME", "longterm_memory")
+        # Max seconds a chat turn waits for the memory search before proceeding without it
+        self.LONG_TERM_MEMORY_SEARCH_TIMEOUT = float(os.getenv("LONG_TERM_MEMORY_SEARCH_TIMEOUT", "1.5"))
+        # Background ingestion: bounded queue, per-user debounce, concurrent memory.add calls
+        self.LONG_TERM_MEMORY_QUEUE_SIZE = int(os.getenv("LONG_TERM_MEMORY_QUEUE_SIZE", "1000"))
+        self.LONG_TERM_MEMORY_FLUSH_DELAY = float(os.getenv("LONG_TERM_MEMORY_FLUSH_DELAY", "5"))
+        self.LONG_TERM_MEMORY_WRITER_CONCURRENCY = int(os.getenv("LONG_TERM_MEMORY_WRITER_CONCURRENCY", "2"))
+        self.LONG_TERM_MEMORY_DRAIN_TIMEOUT = float(os.getenv("LONG_TERM_MEMORY_DRAIN_TIMEOUT", "30"))
+        # Sessions whose already-ingested message ids are remembered (LRU, kept for a day)
+        self.LONG_TERM_MEMORY_TRACKED_SESSIONS = int(os.getenv("LONG_TERM_MEMORY_TRACKED_SESSIONS", "10000"))
+
+        # Running conversation summary (older messages folded out of the history): a cheap
+        # registry model, and the summary's length budget
+        self.CONVERSATION_SUMMARY_MODEL = os.getenv("CONVERSATION_SUMMARY_MODEL", "gpt-4o-mini")
+        self.CONVERSATION_SUMMARY_MAX_WORDS = int(os.getenv("CONVERSATION_SUMMARY_MAX_WORDS", "300"))
+        # In-graph summarization: once a thread's history exceeds TRIGGER_TOKENS (0 = off), the
+        # summarize node folds all but the newest KEEP_TOKENS into the summary during the turn
+        self.CONVERSATION_SUMMARY_TRIGGER_TOKENS = int(os.getenv("CONVERSATION_SUMMARY_TRIGGER_TOKENS", "0"))
+        self.CONVERSATION_SUMMARY_KEEP_TOKENS = int(os.getenv("CONVERSATION_SUMMARY_KEEP_TOKENS", "1000"))
+
+        # Semantic response cache (opt-in): reuse answers to near-duplicate opening questions.
+        # Backend "local" (per process) or "postgres" (pgvector, shared); scope "user" or "global"
+        self.SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() in (
+            "true",
+            "1",
+            "t",
+            "yes",
+        )
+        self.SEMANTIC_CACHE_BACKEND = os.getenv("SEMANTIC_CACHE_BACKEND", "local")
+        self.SEMANTIC_CACHE_SCOPE = os.getenv("SEMANTIC_CACHE_SCOPE", "user")
+        self.SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        self.SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+        self.SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000"))
+        self.SEMANTIC_CACHE_MAX_SCOPES = int(os.getenv("SEMANTIC_CACHE_MAX_SCOPES", "1000"))
+        # Only turns of threads with at most this many messages (before trimming) are cached (1 = conversation openers)
+        self.SEMANTIC_CACHE_MAX_HISTORY_MESSAGES = int(os.getenv("SEMANTIC_CACHE_MAX_HISTORY_MESSAGES", "1"))
+        self.SEMANTIC_CACHE_EMBEDDING_MODEL = os.getenv(
+            "SEMANTIC_CACHE_EMBEDDING_MODEL", self.LONG_TERM_MEMORY_EMBEDDER_MODEL
+        )
+        self.SEMANTIC_CACHE_EMBEDDING_DIMS = int(os.getenv("SEMANTIC_CACHE_EMBEDDING_DIMS", "1536"))
         # JWT Configuration
         self.JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "")
         self.JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
         self.JWT_ACCESS_TOKEN_EXPIRE_DAYS = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_DAYS", "30"))
 
+        # Auth lookup cache (verified tokens, sessions and users); per process
+        self.AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+        self.AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))
+
         # Logging Configuration
         self.LOG_DIR = Path(os.getenv("LOG_DIR", "logs"))
         self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -189,8 +318,48 @@ class Settings:
         self.POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
         self.POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
         self.POSTGRES_POOL_SIZE = int(os.getenv("POSTGRES_POOL_SIZE", "20"))
-        self.POSTGRES_MAX_OVERFLOW = int(os.getenv("POSTGRES_MAX_OVERFLOW", "10"))
-        self.CHECKPOINT_TABLES = ["checkpoint_blobs", "checkpoint_writes", "checkpoints"]
+        self.POSTGRES_POOL_TIMEOUT = float(os.getenv("POSTGRES_POOL_TIMEOUT", "30"))
+
+        # Per-consumer share of POSTGRES_POOL_SIZE (ORM, LangGraph checkpointer, mem0, result caches).
+        # The pools are sized by these; the pool manager refuses to open if they add up to more
+        # than POSTGRES_POOL_SIZE
+        default_pool_quotas = {
+            "orm": 8,
+            "checkpointer": 5,
+            "memory": 5,
+            "cache": 2,
+        }
+        self.POSTGRES_POOL_QUOTAS = default_pool_quotas.copy()
+        for consumer in default_pool_quotas:
+            value = os.getenv(f"POSTGRES_POOL_QUOTA_{consumer.upper()}")
+            if value:
+                self.POSTGRES_POOL_QUOTAS[consumer] = int(value)
+
+        # Background checkpoint compaction: every INTERVAL seconds, threads idle for IDLE_SECONDS
+        # keep only their newest KEEP_LAST checkpoints (BATCH_SIZE threads per pass). Threads
+        # idle for RETENTION_DAYS are deleted (0 = keep forever); threads with more than
+        # FOLD_MESSAGES messages have all but the last FOLD_KEEP_MESSAGES summarized (0 = off)
+        self.CHECKPOINT_COMPACTION_ENABLED = os.getenv("CHECKPOINT_COMPACTION_ENABLED", "false").lower() in (
+            "true",
+            "1",
+            "t",
+            "yes",
+        )
+        self.CHECKPOINT_COMPACTION_INTERVAL = float(os.getenv("CHECKPOINT_COMPACTION_INTERVAL", "900"))
+        self.CHECKPOINT_COMPACTION_IDLE_SECONDS = float(os.getenv("CHECKPOINT_COMPACTION_IDLE_SECONDS", "600"))
+        self.CHECKPOINT_COMPACTION_BATCH_SIZE = int(os.getenv("CHECKPOINT_COMPACTION_BATCH_SIZE", "200"))
+        self.CHECKPOINT_KEEP_LAST = max(1, int(os.getenv("CHECKPOINT_KEEP_LAST", "10")))
+        self.CHECKPOINT_RETENTION_DAYS = float(os.getenv("CHECKPOINT_RETENTION_DAYS", "0"))
+        self.CHECKPOINT_FOLD_MESSAGES = int(os.getenv("CHECKPOINT_FOLD_MESSAGES", "0"))
+        self.CHECKPOINT_FOLD_KEEP_MESSAGES = int(os.getenv("CHECKPOINT_FOLD_KEEP_MESSAGES", "20"))
+
+        # Checkpoint blob encoding: compress blobs of at least COMPRESS_MIN_BYTES with SERDE_COMPRESSION
+        # (zlib | zstd | none; zstd needs the optional `zstandard` extra, else zlib is used) and store
+        # tool results of at least PAYLOAD_MIN_BYTES once per thread instead of in every checkpoint (0 = inline)
+        self.CHECKPOINT_SERDE_COMPRESSION = os.getenv("CHECKPOINT_SERDE_COMPRESSION", "zlib").lower()
+        self.CHECKPOINT_SERDE_COMPRESSION_LEVEL = int(os.getenv("CHECKPOINT_SERDE_COMPRESSION_LEVEL", "3"))
+        self.CHECKPOINT_SERDE_COMPRESS_MIN_BYTES = int(os.getenv("CHECKPOINT_SERDE_COMPRESS_MIN_BYTES", "1024"))
+        self.CHECKPOINT_PAYLOAD_MIN_BYTES = int(os.getenv("CHECKPOINT_PAYLOAD_MIN_BYTES", "2048"))
 
         # Rate Limiting Configuration
         self.RATE_LIMIT_DEFAULT = parse_list_from_env("RATE_LIMIT_DEFAULT", ["200 per day", "50 per hour"])
@@ -1,34 +1,24 @@
 """This file contains the LangGraph Agent/workflow and interactions with the LLM."""
 
 import asyncio
+import time
+from dataclasses import (
+    dataclass,
+    field,
+)
 from typing import (
+    TYPE_CHECKING,
     AsyncGenerator,
     Optional,
+    Tuple,
 )
-from urllib.parse import quote_plus
 
-from asgiref.sync import sync_to_async
 from langchain_core.messages import (
     BaseMessage,
-    ToolMessage,
+    RemoveMessage,
     convert_to_openai_messages,
 )
-from langfuse import propagate_attributes
-from langfuse.langchain import CallbackHandler
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
-from langgraph.graph import (
-    END,
-    StateGraph,
-)
-from langgraph.graph.state import (
-    Command,
-    CompiledStateGraph,
-)
-from langgraph.types import (
-    RunnableConfig,
-    StateSnapshot,
-)
-from mem0 import AsyncMemory
+from langchain_core.runnables import RunnableConfig
 from psycopg_pool import AsyncConnectionPool
 
 from app.core.config import (
@@ -36,16 +26,61 @@ from app.core.config import (
     settings,
 )
 from app.core.langgraph.tools import tools
+from app.core.langgraph.tools.executor import ToolExecutor
 from app.core.config.logging import get_logger
-from app.core.metrics import llm_inference_duration_seconds
-from app.core.prompts import load_system_prompt
-from app.schemas import GraphState, Message
+from app.core.metrics import (
+    chat_pipeline_stage_duration_seconds,
+    llm_inference_duration_seconds,
+)
+from app.core.prompts import load_context_prompt, summarize_prompt, system_prompt
+from app.schemas import Message
+from app.services.checkpoint_compaction import CheckpointCompactor
+from app.services.checkpoint_store import checkpoint_store
+from app.services.connection_pool import pool_manager
+from app.services.idempotency import request_fingerprint
 from app.services.llm import llm_service
-from app.utils.graph import dump_messages, prepare_messages, process_llm_response
+from app.services.llm_dispatcher import LLMOverloadedError, Priority
+from app.services.memory_writer import MemoryWriter
+from app.services.semantic_cache import semantic_cache
+from app.services.single_flight import ThreadSingleFlight
+from app.utils.graph import dump_messages, fold_point, layout_messages, process_llm_response, trim_history
+from app.utils.tokens import (
+    count_tokens_incremental,
+    suffix_start,
+)
+
+if TYPE_CHECKING:
+    from langgraph.graph.state import CompiledStateGraph
+    from langgraph.types import Command
+    from mem0 import AsyncMemory
+
+    from app.schemas.graph import GraphState
 
 
 logger = get_logger(__name__)
 
+NO_RELEVANT_MEMORY = "No relevant memory found."
+
+
+class HistoryCursorError(ValueError):
+    """The `before` cursor is not a message of the thread (mistyped, or folded into the summary)."""
+
+
+@dataclass
+class _Turn:
+    """Per-request pipeline state, passed to graph nodes via config["configurable"]["turn"].
+
+    The memory search is started before the graph runs and only awaited by the
+    chat node, so it overlaps with graph setup, checkpoint load and history trimming.
+    """
+
+    memory_task: asyncio.Task
+    deadline: float
+    invoked_at: float = field(default_factory=time.perf_counter)
+    first_node_at: Optional[float] = None
+    long_term_memory: Optional[str] = None
+
+
 class LangGraphAgent:
     """Manages the LangGraph Agent/workflow and interactions with the LLM.
 
@@ -58,30 +93,36 @@ class LangGraphAgent:
         # Use the LLM service with tools bound
         self.llm_service = llm_service
         self.llm_service.bind_tools(tools)
-        self.tools_by_name = {tool.name: tool for tool in tools}
+        self.tool_executor = ToolExecutor(tools)
         self._connection_pool: Optional[AsyncConnectionPool] = None
-        self._graph: Optional[CompiledStateGraph] = None
-        self.memory: Optional[AsyncMemory] = None
+        self._graph: Optional["CompiledStateGraph"] = None
+        self.memory: Optional["AsyncMemory"] = None
+        self.memory_writer = MemoryWriter(self._long_term_memory)
+        # At most one graph run per thread; identical concurrent requests share it
+        self.single_flight = ThreadSingleFlight()
+        # Prunes old checkpoints in the background and folds long idle threads
+        self.compactor = CheckpointCompactor(fold=self.fold_history, lock=self.single_flight.serialized)
         logger.info(
             "langgraph_agent_initialized",
             model=settings.DEFAULT_LLM_MODEL,
             environment=settings.ENVIRONMENT.value,
         )
 
-    async def _long_term_memory(self) -> AsyncMemory:
+    async def _long_term_memory(self) -> "AsyncMemory":
         """Initialize the long term memory."""
         if self.memory is None:
+            # mem0 pulls in its vector store and LLM clients: import it on first use
+            from mem0 import AsyncMemory
+
+            await pool_manager.open()
             self.memory = await AsyncMemory.from_config(
                 config_dict={
                     "vector_store": {
                         "provider": "pgvector",
                         "config": {
                             "collection_name": settings.LONG_TERM_MEMORY_COLLECTION_NAME,
-                            "dbname": settings.POSTGRES_DB,
-                            "user": settings.POSTGRES_USER,
-                            "password": settings.POSTGRES_PASSWORD,
-                            "host": settings.POSTGRES_HOST,
-                            "port": settings.POSTGRES_PORT,
+                            # Draw from the shared pool's "memory" quota instead of opening our own
+                            "connection_pool": pool_manager.memory_pool,
                         },
                     },
                     "llm": {
@@ -95,34 +136,23 @@ class LangGraphAgent:
         return self.memory
 
     async def _get_connection_pool(self) -> AsyncConnectionPool:
-        """Get a PostgreSQL connection pool using environment-specific settings.
+        """Get the shared PostgreSQL connection pool.
+
+        The pool is owned by `pool_manager` (opened in the application lifespan);
+        opening here is a no-op unless the agent is used outside the app.
 
         Returns:
-            AsyncConnectionPool: A connection pool for PostgreSQL database.
+            AsyncConnectionPool: The shared connection pool for PostgreSQL.
         """
         if self._connection_pool is None:
             try:
-                # Configure pool size based on environment
-                max_size = settings.POSTGRES_POOL_SIZE
-
-                connection_url = (
-                    "postgresql://"
-                    f"{quote_plus(settings.POSTGRES_USER)}:{quote_plus(settings.POSTGRES_PASSWORD)}"
-                    f"@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
-                )
-
-                self._connection_pool = AsyncConnectionPool(
-                    connection_url,
-                    open=False,
-                    max_size=max_size,
-                    kwargs={
-                        "autocommit": True,
-                        "connect_timeout": 5,
-                        "prepare_threshold": None,
-                    },
+                await pool_manager.open()
+                self._connection_pool = pool_manager.pool
+                logger.info(
+                    "connection_pool_attached",
+                    max_size=self._connection_pool.max_size,
+                    environment=settings.ENVIRONMENT.value,
                 )
-                await self._connection_pool.open()
-                logger.info("connection_pool_created", max_size=max_size, environment=settings.ENVIRONMENT.value)
             except Exception as e:
                 logger.error("connection_pool_creation_failed", error=str(e), environment=settings.ENVIRONMENT.value)
                 # In production, we might want to degrade gracefully
@@ -142,35 +172,60 @@ class LangGraphAgent:
         Returns:
             str: The relevant memory.
         """
+        start = time.perf_counter()
         try:
             memory = await self._long_term_memory()
             results = await memory.search(user_id=str(user_id), query=query)
-            print(results)
             return "\n".join([f"* {result['memory']}" for result in results["results"]])
         except Exception as e:
             logger.error("failed_to_get_relevant_memory", error=str(e), user_id=user_id, query=query)
             return ""
+        finally:
+            chat_pipeline_stage_duration_seconds.labels(stage="memory_search").observe(time.perf_counter() - start)
 
-    async def _update_long_term_memory(self, user_id: str, messages: list[dict], metadata: dict = None) -> None:
-        """Update the long term memory.
+    def _start_turn(self, user_id: Optional[str], query: str) -> _Turn:
+        """Kick off the long-term memory search for a request without awaiting it.
 
         Args:
-            user_id (str): The user ID.
-            messages (list[dict]): The messages to update the long term memory with.
-            metadata (dict): Optional metadata to include.
+            user_id (Optional[str]): The user ID.
+            query (str): The latest user message, used as the search query.
+
+        Returns:
+            _Turn: Pipeline state carrying the in-flight memory search and its deadline.
         """
-        try:
-            memory = await self._long_term_memory()
-            await memory.add(messages, user_id=str(user_id), metadata=metadata)
-            logger.info("long_term_memory_updated_successfully", user_id=user_id)
-        except Exception as e:
-            logger.exception(
-                "failed_to_update_long_term_memory",
-                user_id=user_id,
-                error=str(e),
-            )
+        memory_task = asyncio.create_task(self._get_relevant_memory(user_id, query))
+        return _Turn(
+            memory_task=memory_task,
+            deadline=time.perf_counter() + settings.LONG_TERM_MEMORY_SEARCH_TIMEOUT,
+        )
+
+    async def _resolve_long_term_memory(self, state: "GraphState", turn: Optional[_Turn]) -> str:
+        """Wait for the turn's memory search, but no longer than its deadline.
+
+        Args:
+            state (GraphState): The current graph state (fallback when there is no turn).
+            turn (Optional[_Turn]): The request pipeline state.
 
-    async def _chat(self, state: GraphState, config: RunnableConfig) -> Command:
+        Returns:
+            str: Formatted memories, or NO_RELEVANT_MEMORY if none arrived in time.
+        """
+        if turn is None:
+            return state.long_term_memory or NO_RELEVANT_MEMORY
+        if turn.long_term_memory is None:
+            start = time.perf_counter()
+            try:
+                memory = await asyncio.wait_for(turn.memory_task, timeout=max(turn.deadline - start, 0))
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "long_term_memory_deadline_exceeded",
+                    timeout_seconds=settings.LONG_TERM_MEMORY_SEARCH_TIMEOUT,
+                )
+                memory = ""
+            chat_pipeline_stage_duration_seconds.labels(stage="memory_wait").observe(time.perf_counter() - start)
+            turn.long_term_memory = memory or NO_RELEVANT_MEMORY
+        return turn.long_term_memory
+
+    async def _chat(self, state: "GraphState", config: RunnableConfig) -> "Command":
         """Process the chat state and generate a response.
 
         Args:
@@ -179,26 +234,78 @@ class LangGraphAgent:
         Returns:
             Command: Command object with updated state and next node to execute.
         """
-        # Get the current LLM instance for metrics
-        current_llm = self.llm_service.get_llm()
-        model_name = (
-            current_llm.model_name
-            if current_llm and hasattr(current_llm, "model_name")
-            else settings.DEFAULT_LLM_MODEL
-        )
-
-        SYSTEM_PROMPT = load_system_prompt(long_term_memory=state.long_term_memory)
-
-        # Prepare messages with system prompt
-        messages = prepare_messages(state.messages, current_llm, SYSTEM_PROMPT)
+        from langgraph.graph import END
+        from langgraph.types import Command
+
+        # Per-request model (configurable "model"); the shared service is never mutated
+        model_name = config["configurable"].get("model") or self.llm_service.default_model
+        current_llm = self.llm_service.get_llm(model_name)
+
+        turn: Optional[_Turn] = config["configurable"].get("turn")
+        if turn is not None and turn.first_node_at is None:
+            # Time from ainvoke/astream to the first node: graph start-up plus checkpoint load
+            turn.first_node_at = time.perf_counter()
+            chat_pipeline_stage_duration_seconds.labels(stage="checkpoint_load").observe(
+                turn.first_node_at - turn.invoked_at
+            )
 
+        # Trim history first; the memory search keeps running in the background meanwhile.
+        # Only messages added since the last turn are tokenized.
+        start = time.perf_counter()
         try:
-            # Use LLM service with automatic retries and circular fallback
-            with llm_inference_duration_seconds.labels(model=model_name).time():
-                response_message = await self.llm_service.call(dump_messages(messages))
+            token_counts, new_token_counts = count_tokens_incremental(
+                state.messages, model_name, state.token_counts.get(model_name)
+            )
+        except Exception as e:
+            # e.g. tiktoken can't fetch its encoding: trim_history re-counts with the model instead
+            logger.warning("incremental_token_count_failed", model=model_name, error=str(e))
+            token_counts, new_token_counts = None, {}
+        history = trim_history(state.messages, current_llm, token_counts=token_counts)
+        chat_pipeline_stage_duration_seconds.labels(stage="history_trim").observe(time.perf_counter() - start)
+
+        long_term_memory = await self._resolve_long_term_memory(state, turn)
+
+        start = time.perf_counter()
+        instructions = system_prompt.render()
+        context = load_context_prompt(long_term_memory=long_term_memory, summary=state.summary)
+        # Static instructions lead and the volatile context trails (see PROMPT_LAYOUT)
+        messages = layout_messages(history, instructions, context)
+        chat_pipeline_stage_duration_seconds.labels(stage="prompt_render").observe(time.perf_counter() - start)
+
+        cache_scope = self._semantic_cache_scope(
+            history, len(state.messages), long_term_memory, config, summary=state.summary
+        )
+        if cache_scope is not None:
+            question = history[-1].content
+            prompt_hash = semantic_cache.prompt_hash(model_name, instructions, context)
 
-            # Process response to handle structured content blocks
-            response_message = process_llm_response(response_message)
+        try:
+            response_message = None
+            if cache_scope is not None:
+                response_message = await semantic_cache.lookup(cache_scope, prompt_hash, question)
+
+            if response_message is None:
+                # Use LLM service with automatic retries and circular fallback
+                priority = config["configurable"].get("priority", Priority.CHAT)
+                with llm_inference_duration_seconds.labels(model=model_name).time():
+                    if config["configurable"].get("stream"):
+                        # Tokens reach astream(stream_mode="messages") as the model produces them
+                        response_message = await self.llm_service.call_stream(
+                            dump_messages(messages), model_name=model_name, priority=priority
+                        )
+                    else:
+                        response_message = await self.llm_service.call(
+                            dump_messages(messages),
+                            model_name=model_name,
+                            # Hedging only on the non-streaming path (get_response sets "hedge")
+                            hedge=config["configurable"].get("hedge", False),
+                            priority=priority,
+                        )
+
+                # Process response to handle structured content blocks
+                response_message = process_llm_response(response_message)
+                if cache_scope is not None:
+                    await semantic_cache.store(cache_scope, prompt_hash, question, response_message)
 
             logger.info(
                 "llm_response_generated",
@@ -213,7 +320,13 @@ class LangGraphAgent:
             else:
                 goto = END
 
-            return Command(update={"messages": [response_message]}, goto=goto)
+            update = {"messages": [response_message], "long_term_memory": long_term_memory}
+            if new_token_counts:
+                update["token_counts"] = {model_name: new_token_counts}
+            return Command(update=update, goto=goto)
+        except LLMOverloadedError:
+            # Surfaced as-is so the API can answer 503 with Retry-After
+            raise
         except Exception as e:
             logger.error(
                 "llm_call_failed_all_models",
@@ -223,46 +336,148 @@ class LangGraphAgent:
             )
             raise Exception(f"failed to get llm response after trying all models: {str(e)}")
 
+    @staticmethod
+    def _semantic_cache_scope(
+        history: list, thread_length: int, long_term_memory: str, config: RunnableConfig, summary: str = ""
+    ) -> Optional[str]:
+        """Return the semantic cache scope for this turn, or None when the cache must be bypassed.
+
+        Only plain user questions are cacheable: turns answering tool results, turns
+        with user-specific memory in the prompt and (by default) follow-up questions,
+        whose meaning depends on the conversation, always reach the model. Follow-ups
+        are judged on `thread_length`, the untrimmed message count: trimming can leave
+        a single message in `history` while the question still refers to earlier turns.
+        """
+        if not settings.SEMANTIC_CACHE_ENABLED:
+            return None
+        if not history or not isinstance(history[-1], Message) or history[-1].role != "user":
+            reason = "tool_results"
+        elif long_term_memory != NO_RELEVANT_MEMORY:
+            reason = "user_memory"
+        elif summary or thread_length > settings.SEMANTIC_CACHE_MAX_HISTORY_MESSAGES:
+            reason = "conversation_history"
+        elif settings.SEMANTIC_CACHE_SCOPE == "global":
+            return "global"
+        else:
+            user_id = config.get("metadata", {}).get("user_id")
+            if user_id is not None:
+                return f"user:{user_id}"
+            reason = "no_user"
+        semantic_cache.record_bypass(reason)
+        return None
+
+    def _history_token_counts(self, state: "GraphState", config: RunnableConfig) -> Optional[list[int]]:
+        """Per-message token counts of the thread for the request's model (None if they can't be computed).
+
+        Uses the counts cached in the state, so only the new user message is tokenized.
+        """
+        model_name = config["configurable"].get("model") or self.llm_service.default_model
+        try:
+            counts, _ = count_tokens_incremental(state.messages, model_name, state.token_counts.get(model_name))
+        except Exception as e:
+            logger.warning("incremental_token_count_failed", model=model_name, error=str(e))
+            return None
+        return counts
+
+    def _route_turn(self, state: "GraphState", config: RunnableConfig) -> list[str]:
+        """Entry router: also run the summarize node when the history exceeds CONVERSATION_SUMMARY_TRIGGER_TOKENS."""
+        counts = self._history_token_counts(state, config)
+        if counts is not None and sum(counts) > settings.CONVERSATION_SUMMARY_TRIGGER_TOKENS:
+            return ["chat", "summarize"]
+        return ["chat"]
+
+    async def _summarize_history(self, state: "GraphState", config: RunnableConfig) -> dict:
+        """Fold all but the newest CONVERSATION_SUMMARY_KEEP_TOKENS of history into the running summary.
+
+        Runs in the same step as the chat node, from the state at the start of the turn,
+        so the summary model call overlaps the answer instead of delaying it; the shorter
+        history and the new summary are used from the next turn on. Failures leave the
+        thread unchanged: the turn never depends on its summary.
+
+        Args:
+            state (GraphState): The state at the start of the turn.
+
+        Returns:
+            dict: The removal of the folded messages and the new summary, or no update.
+        """
+        start = time.perf_counter()
+        try:
+            counts = self._history_token_counts(state, config)
+            if counts is None:
+                return {}
+            keep = len(counts) - suffix_start(counts, settings.CONVERSATION_SUMMARY_KEEP_TOKENS)
+            update = await self._fold_update(state.summary, state.messages, keep)
+        except Exception as e:
+            logger.warning(
+                "conversation_summary_failed", session_id=config["configurable"]["thread_id"], error=str(e)
+            )
+            return {}
+        finally:
+            chat_pipeline_stage_duration_seconds.labels(stage="summarize").observe(time.perf_counter() - start)
+        if update is None:
+            return {}
+        logger.info(
+            "conversation_summarized",
+            session_id=config["configurable"]["thread_id"],
+            folded_messages=len(update["messages"]),
+            history_tokens=sum(counts),
+        )
+        return update
+
     # Define our tool node
-    async def _tool_call(self, state: GraphState) -> Command:
+    async def _tool_call(self, state: "GraphState", config: RunnableConfig) -> "Command":
         """Process tool calls from the last message.
 
         Args:
             state: The current agent state containing messages and tool calls.
+            config: The node's config, passed on to the tools.
 
         Returns:
             Command: Command object with updated messages and routing back to chat.
         """
-        outputs = []
-        for tool_call in state.messages[-1].tool_calls:
-            tool_result = await self.tools_by_name[tool_call["name"]].ainvoke(tool_call["args"])
-            outputs.append(
-                ToolMessage(
-                    content=tool_result,
-                    name=tool_call["name"],
-                    tool_call_id=tool_call["id"],
-                )
-            )
+        from langgraph.types import Command
+
+        # Calls run concurrently; results keep the order of tool_calls
+        outputs = await self.tool_executor.run(state.messages[-1].tool_calls, config)
         return Command(update={"messages": outputs}, goto="chat")
 
-    async def create_graph(self) -> Optional[CompiledStateGraph]:
+    async def create_graph(self) -> Optional["CompiledStateGraph"]:
         """Create and configure the LangGraph workflow.
 
         Returns:
-            Optional[CompiledStateGraph]: The configured LangGraph instance or None if init fails
+            Optional["CompiledStateGraph"]: The configured LangGraph instance or None if init fails
         """
         if self._graph is None:
+            # langgraph (and the checkpointer built on it) is imported when the graph is
+            # first built, not when the app starts; the nodes import what they use
+            from langgraph.graph import (
+                END,
+                START,
+                StateGraph,
+            )
+
+            from app.schemas.graph import GraphState
+            from app.services.checkpoint_saver import CompactPostgresSaver
+
             try:
                 graph_builder = StateGraph(GraphState)
                 graph_builder.add_node("chat", self._chat, ends=["tool_call", END])
                 graph_builder.add_node("tool_call", self._tool_call, ends=["chat"])
-                graph_builder.set_entry_point("chat")
+                if settings.CONVERSATION_SUMMARY_TRIGGER_TOKENS > 0:
+                    # Long threads summarize older turns alongside the chat node
+                    graph_builder.add_node("summarize", self._summarize_history)
+                    graph_builder.add_conditional_edges(START, self._route_turn, ["chat", "summarize"])
+                    graph_builder.add_edge("summarize", END)
+                else:
+                    graph_builder.set_entry_point("chat")
                 graph_builder.set_finish_point("chat")
 
                 # Get connection pool (may be None in production if DB unavailable)
                 connection_pool = await self._get_connection_pool()
                 if connection_pool:
-                    checkpointer = AsyncPostgresSaver(connection_pool)
+                    # The saver's queries count against the "checkpointer" pool quota.
+                    # Large tool results are stored once per thread (see checkpoint_serde).
+                    checkpointer = CompactPostgresSaver(connection_pool, serde=checkpoint_store.serde)
                     await checkpointer.setup()
                 else:
                     # In production, proceed without checkpointer if needed
@@ -290,11 +505,20 @@ class LangGraphAgent:
 
         return self._graph
 
+    async def _timed_create_graph(self) -> Optional["CompiledStateGraph"]:
+        """Create the graph, recording the setup time as a pipeline stage."""
+        start = time.perf_counter()
+        try:
+            return await self.create_graph()
+        finally:
+            chat_pipeline_stage_duration_seconds.labels(stage="graph_setup").observe(time.perf_counter() - start)
+
     async def get_response(
         self,
         messages: list[Message],
         session_id: str,
         user_id: Optional[str] = None,
+        model_name: Optional[str] = None,
     ) -> list[dict]:
         """Get a response from the LLM.
 
@@ -302,14 +526,47 @@ class LangGraphAgent:
             messages (list[Message]): The messages to send to the LLM.
             session_id (str): The session ID for Langfuse tracking.
             user_id (Optional[str]): The user ID for Langfuse tracking.
+            model_name (Optional[str]): Registry model for this request (defaults to DEFAULT_LLM_MODEL).
 
         Returns:
             list[dict]: The response from the LLM.
         """
+        # Identical concurrent requests on a thread share one run; different ones wait their turn
+        fingerprint = request_fingerprint([[m.model_dump() for m in messages], user_id, model_name])
+        return await self.single_flight.run(
+            session_id,
+            fingerprint,
+            lambda: self._get_response(messages, session_id, user_id=user_id, model_name=model_name),
+        )
+
+    async def _get_response(
+        self,
+        messages: list[Message],
+        session_id: str,
+        user_id: Optional[str] = None,
+        model_name: Optional[str] = None,
+    ) -> list[dict]:
+        """Run the graph for one request (see `get_response`)."""
+        # Langfuse (and its OpenTelemetry exporter) loads with the first request, not at import
+        from langfuse import propagate_attributes
+        from langfuse.langchain import CallbackHandler
+
+        # Start the memory search first so it overlaps with graph setup and checkpoint load
+        turn = self._start_turn(user_id, messages[-1].content)
         if self._graph is None:
-            self._graph = await self.create_graph()
+            try:
+                self._graph = await self._timed_create_graph()
+            except Exception:
+                turn.memory_task.cancel()
+                raise
         config = {
-            "configurable": {"thread_id": session_id},
+            "configurable": {
+                "thread_id": session_id,
+                "turn": turn,
+                "model": model_name,
+                "hedge": True,
+                "priority": Priority.CHAT,
+            },
             "callbacks": [CallbackHandler()],
             "metadata": {
                 "user_id": user_id,
@@ -318,9 +575,6 @@ class LangGraphAgent:
                 "debug": settings.DEBUG,
             },
         }
-        relevant_memory = (
-            await self._get_relevant_memory(user_id, messages[-1].content)
-        ) or "No relevant memory found."
         try:
             with propagate_attributes(
                 user_id=str(user_id) if user_id is not None else "",
@@ -330,23 +584,26 @@ class LangGraphAgent:
                     "debug": str(settings.DEBUG),
                 },
             ):
+                turn.invoked_at = time.perf_counter()
                 response = await self._graph.ainvoke(
-                    input={"messages": dump_messages(messages), "long_term_memory": relevant_memory},
+                    input={"messages": dump_messages(messages)},
                     config=config,
                 )
-            # Run memory update in background without blocking the response
-            asyncio.create_task(
-                self._update_long_term_memory(
-                    user_id, convert_to_openai_messages(response["messages"]), config["metadata"]
-                )
-            )
+            # Queue the memory update; the writer batches it in the background
+            self.memory_writer.submit(user_id, session_id, response["messages"], config["metadata"])
             return self.__process_messages(response["messages"])
         except Exception as e:
             logger.error("Error getting response", error=str(e))
             raise
+        finally:
+            turn.memory_task.cancel()
 
     async def get_stream_response(
-        self, messages: list[Message], session_id: str, user_id: Optional[str] = None
+        self,
+        messages: list[Message],
+        session_id: str,
+        user_id: Optional[str] = None,
+        model_name: Optional[str] = None,
     ) -> AsyncGenerator[str, None]:
         """Get a stream response from the LLM.
 
@@ -354,75 +611,114 @@ class LangGraphAgent:
             messages (list[Message]): The messages to send to the LLM.
             session_id (str): The session ID for the conversation.
             user_id (Optional[str]): The user ID for the conversation.
+            model_name (Optional[str]): Registry model for this request (defaults to DEFAULT_LLM_MODEL).
 
         Yields:
             str: Tokens of the LLM response.
         """
-        config = {
-            "configurable": {"thread_id": session_id},
-            "callbacks": [CallbackHandler()],
-            "metadata": {
-                "user_id": user_id,
-                "session_id": session_id,
-                "environment": settings.ENVIRONMENT.value,
-                "debug": settings.DEBUG,
-            },
-        }
-        if self._graph is None:
-            self._graph = await self.create_graph()
-
-        relevant_memory = (
-            await self._get_relevant_memory(user_id, messages[-1].content)
-        ) or "No relevant memory found."
-
-        try:
-            with propagate_attributes(
-                user_id=str(user_id) if user_id is not None else "",
-                metadata={
+        from langfuse import propagate_attributes
+        from langfuse.langchain import CallbackHandler
+
+        # Hold the thread for the whole stream so other runs can't interleave checkpoint writes
+        async with self.single_flight.serialized(session_id):
+            # Start the memory search first so it overlaps with graph setup and checkpoint load
+            turn = self._start_turn(user_id, messages[-1].content)
+            config = {
+                "configurable": {
+                    "thread_id": session_id,
+                    "turn": turn,
+                    "model": model_name,
+                    "stream": True,
+                    "priority": Priority.STREAM,
+                },
+                "callbacks": [CallbackHandler()],
+                "metadata": {
+                    "user_id": user_id,
                     "session_id": session_id,
                     "environment": settings.ENVIRONMENT.value,
-                    "debug": str(settings.DEBUG),
+                    "debug": settings.DEBUG,
                 },
-            ):
-                async for token, _ in self._graph.astream(
-                    {"messages": dump_messages(messages), "long_term_memory": relevant_memory},
-                    config,
-                    stream_mode="messages",
+            }
+            try:
+                if self._graph is None:
+                    self._graph = await self._timed_create_graph()
+
+                with propagate_attributes(
+                    user_id=str(user_id) if user_id is not None else "",
+                    metadata={
+                        "session_id": session_id,
+                        "environment": settings.ENVIRONMENT.value,
+                        "debug": str(settings.DEBUG),
+                    },
                 ):
-                    try:
-                        yield token.content
-                    except Exception as token_error:
-                        logger.error("Error processing token", error=str(token_error), session_id=session_id)
-                        continue
-
-                # After streaming completes, get final state and update memory in background
-                state: StateSnapshot = await sync_to_async(self._graph.get_state)(config=config)
-            if state.values and "messages" in state.values:
-                asyncio.create_task(
-                    self._update_long_term_memory(
-                        user_id, convert_to_openai_messages(state.values["messages"]), config["metadata"]
-                    )
-                )
-        except Exception as stream_error:
-            logger.error("Error in stream processing", error=str(stream_error), session_id=session_id)
-            raise stream_error
-
-    async def get_chat_history(self, session_id: str) -> list[Message]:
-        """Get the chat history for a given thread ID.
+                    turn.invoked_at = time.perf_counter()
+                    async for token, metadata in self._graph.astream(
+                        {"messages": dump_messages(messages)},
+                        config,
+                        stream_mode="messages",
+                    ):
+                        if metadata.get("langgraph_node") == "summarize":
+                            # The summary model's output isn't part of the answer
+                            continue
+                        try:
+                            yield token.content
+                        except Exception as token_error:
+                            logger.error("Error processing token", error=str(token_error), session_id=session_id)
+                            continue
+
+                    # After streaming completes, read the final messages and update memory in background
+                    thread_messages = await self._thread_messages(session_id)
+                if thread_messages:
+                    self.memory_writer.submit(user_id, session_id, thread_messages, config["metadata"])
+            except Exception as stream_error:
+                logger.error("Error in stream processing", error=str(stream_error), session_id=session_id)
+                raise stream_error
+            finally:
+                turn.memory_task.cancel()
+
+    async def _thread_messages(self, session_id: str) -> list[BaseMessage]:
+        """Messages of the thread's latest checkpoint (empty when running without a checkpointer)."""
+        if self._graph is None or self._graph.checkpointer is None:
+            return []
+        return await checkpoint_store.latest_messages(session_id)
+
+    async def get_chat_history(
+        self, session_id: str, limit: Optional[int] = None, before: Optional[str] = None
+    ) -> Tuple[list[Message], Optional[str]]:
+        """Get a page of the chat history for a given thread ID.
+
+        Cursors are message ids, so they stay valid as new turns are appended and as
+        older messages are folded into the summary, as long as the cursor's own message
+        is still in the history.
 
         Args:
             session_id (str): The session ID for the conversation.
+            limit (Optional[int]): Max messages to return (the most recent ones); all when None.
+            before (Optional[str]): Only return messages older than the message with this id.
 
         Returns:
-            list[Message]: The chat history.
+            Tuple[list[Message], Optional[str]]: The page, oldest first, and the cursor
+            for the previous page (None when this page reaches the start of the thread).
+
+        Raises:
+            HistoryCursorError: If no message of the thread has the id `before`.
         """
         if self._graph is None:
             self._graph = await self.create_graph()
 
-        state: StateSnapshot = await sync_to_async(self._graph.get_state)(
-            config={"configurable": {"thread_id": session_id}}
-        )
-        return self.__process_messages(state.values["messages"]) if state.values else []
+        visible = [
+            message
+            for message in await self._thread_messages(session_id)
+            if message.type in ("human", "ai") and message.content
+        ]
+        end = len(visible)
+        if before is not None:
+            end = next((index for index, message in enumerate(visible) if message.id == before), None)
+            if end is None:
+                raise HistoryCursorError(f"Unknown history cursor '{before}'")
+        start = 0 if limit is None else max(0, end - limit)
+        # Only the returned page is converted to API messages
+        return self.__process_messages(visible[start:end]), visible[start].id if start else None
 
     def __process_messages(self, messages: list[BaseMessage]) -> list[Message]:
         openai_style_messages = convert_to_openai_messages(messages)
@@ -433,6 +729,83 @@ class LangGraphAgent:
             if message["role"] in ["assistant", "user"] and message["content"]
         ]
 
+    async def _summarize(self, summary: str, messages: list[BaseMessage]) -> str:
+        """Fold `messages` into the running `summary` with the cheap summary model."""
+        transcript = "\n".join(
+            f"{'User' if message.type == 'human' else 'Assistant'}: {message.content}"
+            for message in messages
+            if message.type in ("human", "ai") and message.content
+        )
+        prompt = summarize_prompt.render(
+            summary=summary or "(empty)",
+            transcript=transcript,
+            max_words=settings.CONVERSATION_SUMMARY_MAX_WORDS,
+        )
+        response = await self.llm_service.call(
+            [{"role": "user", "content": prompt}],
+            model_name=settings.CONVERSATION_SUMMARY_MODEL,
+            priority=Priority.BACKGROUND,
+            tools=False,
+        )
+        return process_llm_response(response).content.strip()
+
+    async def _fold_update(self, summary: str, messages: list[BaseMessage], keep: int) -> Optional[dict]:
+        """State update folding all but (at least) the last `keep` messages into `summary`.
+
+        Returns:
+            Optional[dict]: RemoveMessages for the folded messages, the pruning of their
+            token counts and the new summary, or None when there is nothing to fold.
+        """
+        from app.schemas.graph import removed_token_counts
+
+        split = fold_point(messages, keep)
+        if not split:
+            return None
+        return {
+            "messages": [RemoveMessage(id=message.id) for message in messages[:split]],
+            "token_counts": removed_token_counts(message.id for message in messages[:split]),
+            "summary": await self._summarize(summary, messages[:split]),
+        }
+
+    async def fold_history(self, session_id: str) -> bool:
+        """Fold a long thread's older messages into its running summary.
+
+        Threads with more than CHECKPOINT_FOLD_MESSAGES messages keep their last
+        CHECKPOINT_FOLD_KEEP_MESSAGES messages; the others are summarized and removed
+        from the state. The summary is sent with every later turn (see load_context_prompt).
+
+        Args:
+            session_id (str): The session ID for the conversation.
+
+        Returns:
+            bool: True if messages were folded.
+        """
+        if not settings.CHECKPOINT_FOLD_MESSAGES:
+            return False
+        if self._graph is None:
+            self._graph = await self.create_graph()
+        config = {"configurable": {"thread_id": session_id}}
+
+        # Hold the thread so a new turn can't interleave with the rewrite
+        async with self.single_flight.serialized(session_id):
+            messages = await self._thread_messages(session_id)
+            if len(messages) <= settings.CHECKPOINT_FOLD_MESSAGES:
+                return False
+            state = await self._graph.aget_state(config)
+            update = await self._fold_update(
+                state.values.get("summary", ""), messages, settings.CHECKPOINT_FOLD_KEEP_MESSAGES
+            )
+            if update is None:
+                return False
+            await self._graph.aupdate_state(config, update, as_node="chat")
+        logger.info("thread_history_folded", session_id=session_id, folded_messages=len(update["messages"]))
+        return True
+
+    async def shutdown(self) -> None:
+        """Stop background compaction and flush pending long-term memory updates before the process exits."""
+        await self.compactor.stop()
+        await self.memory_writer.drain()
+
     async def clear_chat_history(self, session_id: str) -> None:
         """Clear all chat history for a given thread ID.
 
@@ -442,20 +815,13 @@ class LangGraphAgent:
         Raises:
             Exception: If there's an error clearing the chat history.
         """
-        try:
-            # Make sure the pool is initialized in the current event loop
-            conn_pool = await self._get_connection_pool()
-
-            # Use a new connection for this specific operation
-            async with conn_pool.connection() as conn:
-                for table in settings.CHECKPOINT_TABLES:
-                    try:
-                        await conn.execute(f"DELETE FROM {table} WHERE thread_id = %s", (session_id,))
-                        logger.info(f"Cleared {table} for session {session_id}")
-                    except Exception as e:
-                        logger.error(f"Error clearing {table}", error=str(e))
-                        raise
+        # Make sure the pool is initialized in the current event loop
+        await self._get_connection_pool()
 
-        except Exception as e:
-            logger.error("Failed to clear chat history", error=str(e))
-            raise
\ No newline at end of file
+        # Wait for any run on the thread, then purge all checkpoint tables atomically
+        async with self.single_flight.serialized(session_id):
+            try:
+                await checkpoint_store.purge_threads([session_id])
+            except Exception as e:
+                logger.error("clear_chat_history_failed", session_id=session_id, error=str(e))
+                raise
@@ -1,5 +1,6 @@
 from langchain_core.tools.base import BaseTool
+from .cache import cached
 from .duckduck_search import duckduckgo_search_tool
 
-# Central registry of tools available to the agent
-tools: list[BaseTool] = [duckduckgo_search_tool]
\ No newline at end of file
+# Central registry of tools available to the agent (results cached per TOOL_CACHE_*)
+tools: list[BaseTool] = [cached(duckduckgo_search_tool)]
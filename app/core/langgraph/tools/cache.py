@@ -0,0 +1,255 @@
+"""TTL result cache for registry tools.
+
+Wrap a tool with `cached(tool)` to reuse its result for identical calls (same tool,
+same arguments after whitespace normalization) within a per-tool TTL. Results live
+in-process (TOOL_CACHE_BACKEND=memory) or in a Postgres table shared by all workers
+(TOOL_CACHE_BACKEND=postgres).
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import (
+    Any,
+    Optional,
+    Protocol,
+)
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import patch_config
+from langchain_core.tools.base import BaseTool
+from psycopg.types.json import Jsonb
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.core.metrics import cache_lookups_total
+from app.services.connection_pool import pool_manager
+from app.utils.cache import TTLCache
+
+logger = get_logger(__name__)
+
+
+# ==================================================
+# Cache Keys
+# ==================================================
+def _normalize(value: Any) -> Any:
+    """Collapse whitespace in strings, recursively, so trivially different calls share a key."""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def tool_cache_key(tool_name: str, tool_input: Any) -> str:
+    """Stable hash of a normalized tool name and its arguments."""
+    payload = json.dumps(
+        [tool_name.strip().lower(), _normalize(tool_input)],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# ==================================================
+# Backends
+# ==================================================
+class ToolResultCache(Protocol):
+    """Per-tool result store."""
+
+    async def get(self, key: str) -> Optional[Any]: ...
+
+    async def set(self, key: str, value: Any) -> None: ...
+
+
+class MemoryToolCache:
+    """In-process LRU + TTL store (see app/utils/cache.py)."""
+
+    def __init__(self, tool_name: str, ttl: float, maxsize: int):
+        self._cache: TTLCache[str, Any] = TTLCache(f"tool:{tool_name}", maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        self._cache.set(key, value)
+
+
+class PostgresToolCache:
+    """Shared store in the `tool_cache` table, drawing from the pool's "cache" quota.
+
+    Expired and over-`maxsize` rows are pruned every PRUNE_EVERY writes per tool.
+    Database errors are logged and treated as misses so tools keep working.
+    """
+
+    PRUNE_EVERY = 100
+
+    _setup_lock: Optional[asyncio.Lock] = None
+    _table_ready = False
+
+    def __init__(self, tool_name: str, ttl: float, maxsize: int):
+        self.tool_name = tool_name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._cache_label = f"tool:{tool_name}"
+        self._writes = 0
+
+    @classmethod
+    async def _ensure_table(cls) -> None:
+        """Create the cache table once per process."""
+        if cls._table_ready:
+            return
+        if cls._setup_lock is None:
+            cls._setup_lock = asyncio.Lock()
+        async with cls._setup_lock:
+            if cls._table_ready:
+                return
+            async with pool_manager.connection("cache") as conn:
+                await conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS tool_cache (
+                        tool TEXT NOT NULL,
+                        key TEXT NOT NULL,
+                        value JSONB NOT NULL,
+                        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                        expires_at TIMESTAMPTZ NOT NULL,
+                        PRIMARY KEY (tool, key)
+                    )
+                    """
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS tool_cache_tool_created_idx ON tool_cache (tool, created_at)"
+                )
+            cls._table_ready = True
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = None
+        try:
+            await self._ensure_table()
+            async with pool_manager.connection("cache") as conn:
+                cursor = await conn.execute(
+                    "SELECT value FROM tool_cache WHERE tool = %s AND key = %s AND expires_at > now()",
+                    (self.tool_name, key),
+                )
+                row = await cursor.fetchone()
+            value = row[0] if row else None
+        except Exception as e:
+            logger.warning("tool_cache_read_failed", tool=self.tool_name, error=str(e))
+        cache_lookups_total.labels(cache=self._cache_label, result="miss" if value is None else "hit").inc()
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        try:
+            payload = Jsonb(json.loads(json.dumps(value)))
+        except (TypeError, ValueError):
+            # Not JSON-serializable: skip caching rather than storing a lossy copy
+            return
+        try:
+            await self._ensure_table()
+            async with pool_manager.connection("cache") as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO tool_cache (tool, key, value, expires_at)
+                    VALUES (%s, %s, %s, now() + make_interval(secs => %s))
+                    ON CONFLICT (tool, key) DO UPDATE
+                    SET value = EXCLUDED.value, created_at = now(), expires_at = EXCLUDED.expires_at
+                    """,
+                    (self.tool_name, key, payload, self.ttl),
+                )
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    await conn.execute(
+                        """
+                        DELETE FROM tool_cache
+                        WHERE tool = %s AND (expires_at <= now() OR key IN (
+                            SELECT key FROM tool_cache WHERE tool = %s ORDER BY created_at DESC OFFSET %s
+                        ))
+                        """,
+                        (self.tool_name, self.tool_name, self.maxsize),
+                    )
+        except Exception as e:
+            logger.warning("tool_cache_write_failed", tool=self.tool_name, error=str(e))
+
+
+def build_tool_cache(tool_name: str) -> Optional[ToolResultCache]:
+    """Create the configured cache for a tool, or None if caching is disabled for it."""
+    ttl = settings.TOOL_CACHE_TTLS.get(tool_name.lower(), settings.TOOL_CACHE_TTL)
+    maxsize = settings.TOOL_CACHE_MAX_SIZES.get(tool_name.lower(), settings.TOOL_CACHE_MAX_SIZE)
+    if ttl <= 0 or maxsize <= 0:
+        return None
+    if settings.TOOL_CACHE_BACKEND == "memory":
+        return MemoryToolCache(tool_name, ttl=ttl, maxsize=maxsize)
+    if settings.TOOL_CACHE_BACKEND == "postgres":
+        return PostgresToolCache(tool_name, ttl=ttl, maxsize=maxsize)
+    return None
+
+
+# ==================================================
+# Tool Wrapper
+# ==================================================
+class CachedTool(BaseTool):
+    """Transparent wrapper exposing the wrapped tool's name, description and schema.
+
+    The lookup happens in `_arun`, after BaseTool has validated the arguments and
+    started the tool run, so callbacks and tracing see cache hits like any other
+    call. Async calls are cached whatever the input shape (arguments or ToolCall);
+    sync calls go straight to the wrapped tool.
+    """
+
+    tool: BaseTool
+    cache: Any
+
+    def __init__(self, tool: BaseTool, cache: ToolResultCache):
+        super().__init__(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            return_direct=tool.return_direct,
+            tool=tool,
+            cache=cache,
+        )
+
+    def _run(
+        self,
+        *args: Any,
+        config: RunnableConfig,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+        **kwargs: Any,
+    ) -> Any:
+        child_config = patch_config(config, callbacks=run_manager.get_child() if run_manager else None)
+        return self.tool.invoke(kwargs or (args[0] if args else {}), child_config)
+
+    async def _arun(
+        self,
+        *args: Any,
+        config: RunnableConfig,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+        **kwargs: Any,
+    ) -> Any:
+        tool_input = kwargs or (args[0] if args else {})
+        key = tool_cache_key(self.name, tool_input)
+        cached_result = await self.cache.get(key)
+        if cached_result is not None:
+            logger.debug("tool_cache_hit", tool=self.name)
+            return cached_result
+
+        child_config = patch_config(config, callbacks=run_manager.get_child() if run_manager else None)
+        result = await self.tool.ainvoke(tool_input, child_config)
+        if result is not None:
+            await self.cache.set(key, result)
+        return result
+
+
+def cached(tool: BaseTool) -> BaseTool:
+    """Wrap a registry tool with its configured result cache (no-op when disabled)."""
+    cache = build_tool_cache(tool.name)
+    if cache is None:
+        return tool
+    return CachedTool(tool, cache)
@@ -0,0 +1,101 @@
+"""Concurrent execution of the tool calls requested in one model turn."""
+
+import asyncio
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools.base import BaseTool
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.core.metrics import (
+    tool_call_duration_seconds,
+    tool_calls_total,
+)
+
+logger = get_logger(__name__)
+
+
+class ToolExecutor:
+    """Runs tool calls concurrently while keeping their order.
+
+    Each tool gets a process-wide semaphore (TOOL_MAX_CONCURRENCY, or
+    TOOL_CONCURRENCY_<NAME>) so a burst of parallel calls can't hammer one
+    backend, and every call is bounded by TOOL_CALL_TIMEOUT (or TOOL_TIMEOUT_<NAME>),
+    including the time spent waiting for a slot. A failing call becomes an error
+    ToolMessage for the model instead of aborting the graph.
+    """
+
+    def __init__(self, tools: Sequence[BaseTool]):
+        """Initialize the executor.
+
+        Args:
+            tools: The tools the model may call.
+        """
+        self.tools_by_name: Dict[str, BaseTool] = {tool.name: tool for tool in tools}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {
+            name: asyncio.Semaphore(settings.TOOL_CONCURRENCY_LIMITS.get(name.lower(), settings.TOOL_MAX_CONCURRENCY))
+            for name in self.tools_by_name
+        }
+
+    async def run(
+        self, tool_calls: Sequence[Dict[str, Any]], config: Optional[RunnableConfig] = None
+    ) -> List[ToolMessage]:
+        """Execute tool calls concurrently.
+
+        Args:
+            tool_calls: The `tool_calls` of the model's last AIMessage.
+            config: The calling node's config, passed to every tool so callbacks and tracing follow the run.
+
+        Returns:
+            List[ToolMessage]: One message per call, in the same order as `tool_calls`.
+        """
+        return list(await asyncio.gather(*(self._run_one(tool_call, config) for tool_call in tool_calls)))
+
+    async def _run_one(self, tool_call: Dict[str, Any], config: Optional[RunnableConfig]) -> ToolMessage:
+        """Execute a single tool call, converting failures into an error ToolMessage."""
+        name = tool_call["name"]
+        tool = self.tools_by_name.get(name)
+        if tool is None:
+            tool_calls_total.labels(tool=name, status="error").inc()
+            logger.warning("unknown_tool_requested", tool=name)
+            return self._error_message(tool_call, f"Error: unknown tool '{name}'.")
+
+        timeout = settings.TOOL_TIMEOUTS.get(name.lower(), settings.TOOL_CALL_TIMEOUT)
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self._invoke(tool, tool_call["args"], config), timeout=timeout)
+            tool_calls_total.labels(tool=name, status="success").inc()
+            return ToolMessage(content=result, name=name, tool_call_id=tool_call["id"])
+        except asyncio.TimeoutError:
+            tool_calls_total.labels(tool=name, status="timeout").inc()
+            logger.warning("tool_call_timeout", tool=name, timeout_seconds=timeout)
+            return self._error_message(tool_call, f"Error: tool '{name}' timed out after {timeout:g}s.")
+        except Exception as e:
+            tool_calls_total.labels(tool=name, status="error").inc()
+            logger.error("tool_call_failed", tool=name, error=str(e))
+            return self._error_message(tool_call, f"Error: tool '{name}' failed: {e}")
+        finally:
+            tool_call_duration_seconds.labels(tool=name).observe(time.perf_counter() - start)
+
+    async def _invoke(self, tool: BaseTool, args: Dict[str, Any], config: Optional[RunnableConfig]) -> Any:
+        """Invoke a tool within its concurrency limit."""
+        async with self._semaphores[tool.name]:
+            return await tool.ainvoke(args, config)
+
+    @staticmethod
+    def _error_message(tool_call: Dict[str, Any], content: str) -> ToolMessage:
+        return ToolMessage(
+            content=content,
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+            status="error",
+        )
@@ -28,6 +28,21 @@ db_connections = Gauge(
     "Number of active database connections"
 )
 
+# Shared pool accounting (see app/services/connection_pool.py).
+# stage="quota" is time waiting for a consumer's quota slot,
+# stage="checkout" is time waiting for the pool to hand out a connection.
+db_pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["consumer", "stage"],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+)
+db_pool_connections_in_use = Gauge(
+    "db_pool_connections_in_use",
+    "Quota slots currently held per pool consumer",
+    ["consumer"]
+)
+
 # 3. AI / Business Logic Metrics
 # Critical for tracking LLM performance and cost. 
 # We use custom buckets because LLM calls are much slower than DB calls.
@@ -43,6 +58,149 @@ llm_stream_duration_seconds = Histogram(
     ["model"],
     buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 60.0]
 )
+llm_time_to_first_token_seconds = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time from a streamed LLM call's start (including retries and failover) to its first chunk",
+    ["model"],
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0]
+)
+# Per-model circuit breakers (see app/services/circuit_breaker.py)
+llm_circuit_breaker_state = Gauge(
+    "llm_circuit_breaker_state",
+    "Circuit breaker state per model (0=closed, 1=half_open, 2=open)",
+    ["model"]
+)
+llm_model_health_score = Gauge(
+    "llm_model_health_score",
+    "Routing health score per model (0-1, from rolling error rate and p95 latency)",
+    ["model"]
+)
+# Hedged requests (see app/services/hedging.py)
+# outcome: primary_won / hedge_won / budget_exhausted
+llm_hedged_requests_total = Counter(
+    "llm_hedged_requests_total",
+    "Hedge decisions for slow LLM calls",
+    ["model", "outcome"]
+)
+# Client-side RPM/TPM buckets (see app/services/rate_limiter.py)
+# decision: queued / rerouted / throttled (provider returned 429)
+llm_rate_limit_decisions_total = Counter(
+    "llm_rate_limit_decisions_total",
+    "Rate limiter decisions for LLM calls",
+    ["model", "decision"]
+)
+llm_rate_limit_wait_seconds = Histogram(
+    "llm_rate_limit_wait_seconds",
+    "Time LLM calls waited for RPM/TPM quota",
+    ["model"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
+)
+# Priority admission control (see app/services/llm_dispatcher.py), per class stream/chat/background
+llm_dispatcher_active = Gauge(
+    "llm_dispatcher_active",
+    "LLM slots currently held",
+    ["priority"]
+)
+llm_dispatcher_queue_wait_seconds = Histogram(
+    "llm_dispatcher_queue_wait_seconds",
+    "Time spent waiting for an LLM slot",
+    ["priority"],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
+)
+llm_dispatcher_shed_total = Counter(
+    "llm_dispatcher_shed_total",
+    "Requests rejected (503) after exceeding their queue SLO",
+    ["priority"]
+)
+# Provider prompt caching: cache hit ratio = cached / prompt tokens
+llm_prompt_tokens_total = Counter(
+    "llm_prompt_tokens_total",
+    "Input tokens sent to the LLM",
+    ["model"]
+)
+llm_prompt_cached_tokens_total = Counter(
+    "llm_prompt_cached_tokens_total",
+    "Input tokens served from the provider's prompt cache",
+    ["model"]
+)
+# Tool execution (see app/core/langgraph/tools/executor.py)
+tool_calls_total = Counter(
+    "tool_calls_total",
+    "Tool calls by outcome (success/error/timeout)",
+    ["tool", "status"]
+)
+tool_call_duration_seconds = Histogram(
+    "tool_call_duration_seconds",
+    "Tool call duration in seconds, including time waiting for a concurrency slot",
+    ["tool"],
+    buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
+)
+# Latency breakdown of a chat turn before the LLM call
+# (memory_search, memory_wait, graph_setup, checkpoint_load, history_trim, prompt_render)
+chat_pipeline_stage_duration_seconds = Histogram(
+    "chat_pipeline_stage_duration_seconds",
+    "Time spent in each stage of the chat request pipeline",
+    ["stage"],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0]
+)
+
+# Per-thread single flight (see app/services/single_flight.py): started/queued/coalesced runs
+graph_single_flight_total = Counter(
+    "graph_single_flight_total",
+    "Graph runs by single-flight outcome (started, queued behind another run, coalesced into one)",
+    ["outcome"]
+)
+
+# Long-term memory ingestion (see app/services/memory_writer.py)
+memory_writer_queue_depth = Gauge(
+    "memory_writer_queue_depth",
+    "Chat turns waiting in the long-term memory ingestion queue"
+)
+memory_writer_dropped_total = Counter(
+    "memory_writer_dropped_total",
+    "Chat turns dropped by the long-term memory writer",
+    ["reason"]
+)
+memory_writer_flushes_total = Counter(
+    "memory_writer_flushes_total",
+    "Batched memory.add calls by outcome",
+    ["status"]
+)
+
+# Checkpoint compaction (see app/services/checkpoint_compaction.py). Bytes are the
+# deleted rows' on-disk size; Postgres reuses the space once autovacuum has run
+checkpoint_compaction_runs_total = Counter(
+    "checkpoint_compaction_runs_total",
+    "Checkpoint compaction passes by outcome",
+    ["status"]
+)
+checkpoint_reclaimed_rows_total = Counter(
+    "checkpoint_reclaimed_rows_total",
+    "Checkpoint rows deleted, by table and reason (compaction, retention)",
+    ["table", "reason"]
+)
+checkpoint_reclaimed_bytes_total = Counter(
+    "checkpoint_reclaimed_bytes_total",
+    "Size of the checkpoint rows deleted, by table and reason (compaction, retention)",
+    ["table", "reason"]
+)
+checkpoint_threads_folded_total = Counter(
+    "checkpoint_threads_folded_total",
+    "Threads whose older messages were folded into the running summary"
+)
+
+# 4. Cache Metrics
+# Hit ratio per cache = rate(hit) / rate(hit + miss)
+cache_lookups_total = Counter(
+    "cache_lookups_total",
+    "Total cache lookups by result (hit/miss)",
+    ["cache", "result"]
+)
+cache_entries = Gauge(
+    "cache_entries",
+    "Number of entries currently held by a cache",
+    ["cache"]
+)
 
 
 orders_processed = Counter("orders_processed_total", "Total number of orders processed")
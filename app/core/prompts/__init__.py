@@ -1,16 +1,124 @@
 import os
+import string
+import time
 from datetime import datetime
+from typing import (
+    Any,
+    List,
+    Optional,
+    Tuple,
+)
+
 from app.core.config import settings
+from app.core.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==================================================
+# Prompt Templates
+# ==================================================
+class PromptTemplate:
+    """
+    A markdown prompt compiled once into literal/placeholder segments.
+
+    Placeholders whose values never change (e.g. agent_name) are baked in at load
+    time, so rendering is a single join. The file is re-read only when its mtime
+    changes (checked at most every PROMPT_RELOAD_INTERVAL seconds).
+
+    Placeholders are plain names: a conversion or format spec (`{x!r}`, `{x:>10}`)
+    raises ValueError when the file is compiled instead of being silently dropped.
+    """
+
+    def __init__(self, path: str, **static_vars: Any):
+        self.path = path
+        self._static_vars = static_vars
+        self._segments: List[Tuple[str, Optional[str]]] = []
+        self._mtime_ns: Optional[int] = None
+        self._checked_at = 0.0
+        self._load()
+
+    def render(self, **values: Any) -> str:
+        """Fill the per-request placeholders. Raises KeyError if one is missing."""
+        self._maybe_reload()
+        parts: List[str] = []
+        for literal, field in self._segments:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(values[field]))
+        return "".join(parts)
+
+    def _load(self) -> None:
+        """Read and compile the template file. Raises ValueError on a conversion or format spec."""
+        with open(self.path, "r") as f:
+            text = f.read()
+        mtime_ns = os.stat(self.path).st_mtime_ns
 
-def load_system_prompt(**kwargs) -> str:
+        segments: List[Tuple[str, Optional[str]]] = []
+        literal: List[str] = []
+        for literal_text, field, spec, conversion in string.Formatter().parse(text):
+            literal.append(literal_text)
+            if field is None:
+                continue
+            if spec or conversion:
+                raise ValueError(f"{self.path}: placeholder {{{field}}} has a conversion or format spec")
+            if field in self._static_vars:
+                literal.append(str(self._static_vars[field]))
+            else:
+                segments.append(("".join(literal), field))
+                literal = []
+        segments.append(("".join(literal), None))
+
+        self._segments = segments
+        self._mtime_ns = mtime_ns
+
+    def _maybe_reload(self) -> None:
+        """Recompile if the file changed on disk (hot reload)."""
+        interval = settings.PROMPT_RELOAD_INTERVAL
+        if interval <= 0:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < interval:
+            return
+        self._checked_at = now
+        try:
+            if os.stat(self.path).st_mtime_ns != self._mtime_ns:
+                self._load()
+                logger.info("prompt_template_reloaded", path=self.path)
+        except (OSError, ValueError) as e:
+            # Keep serving the last good version
+            logger.error("prompt_template_reload_failed", path=self.path, error=str(e))
+
+
+_PROMPTS_DIR = os.path.dirname(__file__)
+
+# Static instructions: identical for every request, so it can lead the cached prefix
+system_prompt = PromptTemplate(
+    os.path.join(_PROMPTS_DIR, "system.md"),
+    agent_name=settings.PROJECT_NAME + " Agent",
+)
+
+# Per-request context (date, long-term memory)
+context_prompt = PromptTemplate(os.path.join(_PROMPTS_DIR, "context.md"))
+
+# Running summary of the turns folded out of the history (only added when there is one)
+conversation_summary_prompt = PromptTemplate(os.path.join(_PROMPTS_DIR, "conversation_summary.md"))
+
+# Instructions for the model that writes the running summary
+summarize_prompt = PromptTemplate(os.path.join(_PROMPTS_DIR, "summarize.md"))
+
+
+def load_context_prompt(summary: str = "", **kwargs) -> str:
     """
-    Loads the system prompt from the markdown file and injects dynamic variables.
+    Renders the volatile context block with dynamic variables (e.g. 'long_term_memory').
+
+    The date uses PROMPT_DATETIME_FORMAT (day resolution by default) so the block
+    changes as rarely as possible. A non-empty conversation `summary` is appended.
     """
-    prompt_path = os.path.join(os.path.dirname(__file__), "system.md")
-    
-    with open(prompt_path, "r") as f:
-        return f.read().format(
-            agent_name=settings.PROJECT_NAME + " Agent",
-            current_date_and_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            **kwargs, # Inject dynamic variables like 'long_term_memory'
-        )
\ No newline at end of file
+    context = context_prompt.render(
+        current_date_and_time=datetime.now().strftime(settings.PROMPT_DATETIME_FORMAT),
+        **kwargs,  # Inject dynamic variables like 'long_term_memory'
+    )
+    if summary:
+        context += "\n\n" + conversation_summary_prompt.render(summary=summary)
+    return context
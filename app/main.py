@@ -8,17 +8,18 @@ from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from langfuse import Langfuse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 # Our Modules
 from app.api.v1.api import api_router
+from app.api.v1.chatbot import agent
 from app.core.config import settings
 from app.core.limiter import limiter
 from app.core.config.logging import get_logger
 from app.core.metrics import setup_metrics
 from app.core.middleware import LoggingContextMiddleware, MetricsMiddleware
+from app.services.connection_pool import pool_manager
 from app.services.database import database_service
 
 # Load environment variables
@@ -26,12 +27,6 @@ load_dotenv()
 # Get logger
 logger = get_logger(__name__)
 
-# Initialize Langfuse globally for background tracing
-langfuse = Langfuse(
-    public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
-    secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
-    host=os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com"),
-)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -46,12 +41,31 @@ async def lifespan(app: FastAPI):
         api_prefix=settings.API_V1_STR,
         environment=settings.ENVIRONMENT.value
     )
+    # Open the shared Postgres pool before any consumer (ORM, checkpointer, mem0) uses it
+    await pool_manager.open()
+    # Create tables on the async engine (needs the running event loop)
+    await database_service.initialize()
+    # Prune old checkpoints in the background while the app runs
+    agent.compactor.start()
+    # Langfuse client for background tracing: imported and created here rather than at
+    # import, so importing the app (workers, scripts, tests) doesn't load it or start its
+    # exporter threads
+    from langfuse import Langfuse
+
+    langfuse = Langfuse(
+        public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
+        secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
+        host=os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com"),
+    )
     
     yield # Application runs here
     
     # Shutdown Logic (Graceful cleanup)
     logger.info("application_shutdown")
-    # Here you would close DB connections or flush Langfuse buffers
+    # Stop compaction and drain queued long-term memory writes while the pool is still open
+    await agent.shutdown()
+    await database_service.close()
+    await pool_manager.close()
     langfuse.flush()
 # Initialize the Application
 app = FastAPI(
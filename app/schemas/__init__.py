@@ -1,8 +1,8 @@
 # Re-export schemas so "from app.schemas import GraphState, Message" works
-from app.schemas.chat import ChatRequest, ChatResponse, Message, StreamResponse
-from app.schemas.graph import GraphState
+from app.schemas.chat import ChatHistoryResponse, ChatRequest, ChatResponse, Message, StreamResponse
 from app.schemas.auth import Token
 __all__ = [
+    "ChatHistoryResponse",
     "ChatRequest",
     "ChatResponse",
     "GraphState",
@@ -10,3 +10,12 @@ __all__ = [
     "StreamResponse",
     "Token"
 ]
+
+
+def __getattr__(name: str):
+    # GraphState is built on langgraph: import it on first access, not with every schema
+    if name == "GraphState":
+        from app.schemas.graph import GraphState
+
+        return GraphState
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
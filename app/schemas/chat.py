@@ -1,5 +1,5 @@
 import re
-from typing import List, Literal
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field, field_validator
 
 # ==================================================
@@ -39,6 +39,14 @@ class ChatResponse(BaseModel):
     """
     messages: List[Message]
 
+class ChatHistoryResponse(ChatResponse):
+    """
+    A page of conversation history from the /messages endpoint.
+    """
+    next_before: Optional[str] = Field(
+        default=None, description="Cursor for the previous page (pass as `before`); null at the start of the thread"
+    )
+
 class StreamResponse(BaseModel):
     """
     Chunk format for Server-Sent Events (SSE) streaming.
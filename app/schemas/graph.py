@@ -1,7 +1,42 @@
-from typing import Annotated
+from typing import Annotated, Dict, Iterable
 from langgraph.graph.message import add_messages
 from pydantic import BaseModel, Field
 
+# ==================================================
+# Reducers
+# ==================================================
+# Pseudo-model key of a token_counts update: its message ids are dropped for every model
+REMOVED_MESSAGES = "__removed__"
+
+
+def merge_token_counts(
+    left: Dict[str, Dict[str, int]], right: Dict[str, Dict[str, int]]
+) -> Dict[str, Dict[str, int]]:
+    """
+    Merge per-model {message_id: token_count} maps, so nodes only return new counts.
+
+    Ids under REMOVED_MESSAGES (see `removed_token_counts`) are pruned from every model.
+    """
+    merged = dict(left or {})
+    right = dict(right or {})
+    removed = right.pop(REMOVED_MESSAGES, None)
+    if removed:
+        merged = {
+            model: {message_id: n for message_id, n in counts.items() if message_id not in removed}
+            for model, counts in merged.items()
+        }
+    for model, counts in right.items():
+        merged[model] = {**merged.get(model, {}), **counts}
+    return merged
+
+
+def removed_token_counts(message_ids: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """
+    token_counts update dropping the counts of messages removed from the history.
+    """
+    return {REMOVED_MESSAGES: dict.fromkeys(message_ids, 0)}
+
+
 # ==================================================
 # LangGraph State Schema
 # ==================================================
@@ -21,4 +56,17 @@ class GraphState(BaseModel):
     long_term_memory: str = Field(
         default="", 
         description="Relevant context extracted from vector store"
-    )
\ No newline at end of file
+    )
+
+    # Older turns folded out of `messages` (see LangGraphAgent.fold_history)
+    summary: str = Field(
+        default="",
+        description="Running summary of the messages removed from the history"
+    )
+
+    # Per-message prompt token counts, {model: {message_id: tokens}}, persisted with
+    # the checkpoint so trimming never re-tokenizes old messages
+    token_counts: Annotated[Dict[str, Dict[str, int]], merge_token_counts] = Field(
+        default_factory=dict,
+        description="Cached per-message token counts by model"
+    )
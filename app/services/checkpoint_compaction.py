@@ -0,0 +1,140 @@
+"""Background compaction and retention for the LangGraph checkpoint tables.
+
+AsyncPostgresSaver keeps every checkpoint (one per graph super-step) and its
+writes and channel blobs forever, so `checkpoints` and `checkpoint_blobs` grow
+with every turn while the app only ever reads a thread's latest checkpoint.
+
+Every CHECKPOINT_COMPACTION_INTERVAL seconds one pass:
+
+1. deletes threads idle for longer than CHECKPOINT_RETENTION_DAYS (if set);
+2. for threads idle for CHECKPOINT_COMPACTION_IDLE_SECONDS that have more than
+   CHECKPOINT_KEEP_LAST checkpoints, keeps only the newest CHECKPOINT_KEEP_LAST
+   checkpoints, then optionally folds older messages into the thread's running
+   summary (CHECKPOINT_FOLD_MESSAGES). Folding writes a new checkpoint, so it
+   comes last: the thread is no longer idle afterwards.
+
+Each thread is compacted under the agent's per-thread lock, and the delete itself
+re-checks that the thread is still idle.
+
+Reclaimed rows and bytes are exported per table as Prometheus counters.
+"""
+
+import asyncio
+from contextlib import (
+    AbstractAsyncContextManager,
+    nullcontext,
+    suppress,
+)
+from typing import (
+    Awaitable,
+    Callable,
+    Optional,
+)
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.core.metrics import (
+    checkpoint_compaction_runs_total,
+    checkpoint_reclaimed_bytes_total,
+    checkpoint_reclaimed_rows_total,
+    checkpoint_threads_folded_total,
+)
+from app.services.checkpoint_store import (
+    DeletedRows,
+    checkpoint_store,
+)
+
+logger = get_logger(__name__)
+
+
+class CheckpointCompactor:
+    """Periodic compaction task, started and stopped with the application.
+
+    Call `start()` from the running event loop (the app lifespan) and `stop()` on shutdown.
+    """
+
+    def __init__(
+        self,
+        fold: Optional[Callable[[str], Awaitable[bool]]] = None,
+        lock: Optional[Callable[[str], AbstractAsyncContextManager]] = None,
+    ):
+        """Initialize the compactor.
+
+        Args:
+            fold: Coroutine function folding a thread's older messages into its summary;
+                returns True if it rewrote the thread. It takes the thread's lock itself.
+            lock: Per-thread lock held while a thread is compacted, so no run starts on it
+                meanwhile (e.g. ThreadSingleFlight.serialized).
+        """
+        self._fold = fold
+        self._lock = lock
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the background loop (no-op when disabled or already running)."""
+        if not settings.CHECKPOINT_COMPACTION_ENABLED or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "checkpoint_compaction_started",
+            interval_seconds=settings.CHECKPOINT_COMPACTION_INTERVAL,
+            keep_last=settings.CHECKPOINT_KEEP_LAST,
+            retention_days=settings.CHECKPOINT_RETENTION_DAYS,
+        )
+
+    async def stop(self) -> None:
+        """Cancel the background loop, interrupting a pass in progress."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.CHECKPOINT_COMPACTION_INTERVAL)
+            try:
+                await self.run_once()
+                checkpoint_compaction_runs_total.labels(status="success").inc()
+            except Exception as e:
+                checkpoint_compaction_runs_total.labels(status="error").inc()
+                logger.exception("checkpoint_compaction_failed", error=str(e))
+
+    async def run_once(self) -> None:
+        """Run one retention and compaction pass over at most CHECKPOINT_COMPACTION_BATCH_SIZE threads each."""
+        batch_size = settings.CHECKPOINT_COMPACTION_BATCH_SIZE
+        if settings.CHECKPOINT_RETENTION_DAYS > 0:
+            deleted = await checkpoint_store.expire_threads(settings.CHECKPOINT_RETENTION_DAYS * 86400, batch_size)
+            self._record(deleted, "retention")
+
+        keep = settings.CHECKPOINT_KEEP_LAST
+        idle_seconds = settings.CHECKPOINT_COMPACTION_IDLE_SECONDS
+        thread_ids = await checkpoint_store.compaction_candidates(keep, idle_seconds, batch_size)
+        folded = 0
+        for thread_id in thread_ids:
+            async with self._lock(thread_id) if self._lock is not None else nullcontext():
+                self._record(await checkpoint_store.compact_thread(thread_id, keep, idle_seconds), "compaction")
+            if self._fold is not None and settings.CHECKPOINT_FOLD_MESSAGES:
+                try:
+                    if await self._fold(thread_id):
+                        folded += 1
+                        checkpoint_threads_folded_total.inc()
+                except Exception as e:
+                    # The thread is already compacted: carry on with the next one
+                    logger.warning("checkpoint_fold_failed", thread_id=thread_id, error=str(e))
+        if thread_ids:
+            logger.info("checkpoint_compaction_completed", threads=len(thread_ids), folded=folded)
+
+    @staticmethod
+    def _record(deleted: DeletedRows, reason: str) -> None:
+        for table, (rows, size) in deleted.items():
+            checkpoint_reclaimed_rows_total.labels(table=table, reason=reason).inc(rows)
+            checkpoint_reclaimed_bytes_total.labels(table=table, reason=reason).inc(size)
+        if any(rows for rows, _ in deleted.values()):
+            logger.info(
+                "checkpoint_rows_reclaimed",
+                reason=reason,
+                rows={table: rows for table, (rows, _) in deleted.items()},
+                bytes=sum(size for _, size in deleted.values()),
+            )
@@ -0,0 +1,129 @@
+"""LangGraph Postgres checkpointer that keeps large tool results out of the checkpoint blobs.
+
+Imported when the graph is built (see `LangGraphAgent.create_graph`): it pulls in
+langgraph's Postgres saver, which the rest of the app doesn't need at import time.
+Payload encoding lives in app/services/checkpoint_serde.py; direct reads of the
+same tables in app/services/checkpoint_store.py.
+"""
+
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg import AsyncCursor
+from psycopg.rows import DictRow
+
+from app.core.config import settings
+from app.services.checkpoint_serde import (
+    PAYLOAD_CHANNEL,
+    externalize_payloads,
+    payload_refs,
+    restore_payloads,
+)
+from app.services.checkpoint_store import PAYLOADS_SQL
+from app.services.connection_pool import pool_manager
+
+
+class CompactPostgresSaver(AsyncPostgresSaver):
+    """AsyncPostgresSaver storing large tool results once per thread instead of in every checkpoint.
+
+    Every checkpoint still gets its own `messages` blob, but ToolMessages above
+    CHECKPOINT_PAYLOAD_MIN_BYTES carry only the digest of their content. The
+    contents are written as PAYLOAD_CHANNEL rows of checkpoint_blobs, keyed by
+    digest, in the same batch as the blobs; ON CONFLICT DO NOTHING makes repeats
+    free. Reads restore them with one extra query when a checkpoint has references.
+
+    Pending writes (checkpoint_writes) are left inline: each holds only one node's
+    new messages, so a tool result appears there once rather than once per step.
+
+    Every query holds a slot of the "checkpointer" pool quota, like CheckpointStore.
+    """
+
+    @asynccontextmanager
+    async def _cursor(self, *, pipeline: bool = False) -> AsyncIterator[AsyncCursor[DictRow]]:
+        async with pool_manager.quota("checkpointer"), super()._cursor(pipeline=pipeline) as cur:
+            yield cur
+
+    def _dump_blobs(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        values: Dict[str, Any],
+        versions: ChannelVersions,
+    ) -> List[Tuple[str, str, str, str, str, Optional[bytes]]]:
+        payloads: Dict[str, str] = {}
+        compacted = {
+            channel: externalize_payloads(value, settings.CHECKPOINT_PAYLOAD_MIN_BYTES, payloads)
+            if channel in versions
+            else value
+            for channel, value in values.items()
+        }
+        rows = [
+            (thread_id, checkpoint_ns, PAYLOAD_CHANNEL, digest, *self.serde.dumps_typed(content))
+            for digest, content in payloads.items()
+        ]
+        return rows + super()._dump_blobs(thread_id, checkpoint_ns, compacted, versions)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get a checkpoint tuple, with out-of-line payloads restored (see AsyncPostgresSaver.aget_tuple)."""
+        checkpoint_tuple = await super().aget_tuple(config)
+        if checkpoint_tuple is not None:
+            await self._restore_payloads([checkpoint_tuple])
+        return checkpoint_tuple
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """List checkpoints, with out-of-line payloads restored (see AsyncPostgresSaver.alist)."""
+        # The parent holds the saver's lock while it yields, so restore once it is exhausted
+        checkpoint_tuples = [
+            checkpoint_tuple
+            async for checkpoint_tuple in super().alist(config, filter=filter, before=before, limit=limit)
+        ]
+        await self._restore_payloads(checkpoint_tuples)
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def _restore_payloads(self, checkpoint_tuples: Iterable[CheckpointTuple]) -> None:
+        by_thread: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for checkpoint_tuple in checkpoint_tuples:
+            configurable = checkpoint_tuple.config["configurable"]
+            key = (configurable["thread_id"], configurable["checkpoint_ns"])
+            by_thread.setdefault(key, []).append(checkpoint_tuple.checkpoint["channel_values"])
+        for (thread_id, checkpoint_ns), channel_values in by_thread.items():
+            digests = payload_refs(value for values in channel_values for value in values.values())
+            if not digests:
+                continue
+            async with self._cursor() as cur:
+                await cur.execute(
+                    PAYLOADS_SQL,
+                    {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "channel": PAYLOAD_CHANNEL,
+                        "digests": list(digests),
+                    },
+                )
+                rows = await cur.fetchall()
+            payloads = {row["version"]: self.serde.loads_typed((row["type"], row["blob"])) for row in rows}
+            for values in channel_values:
+                for value in values.values():
+                    restore_payloads(value, payloads)
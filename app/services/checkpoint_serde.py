@@ -0,0 +1,182 @@
+"""Compact serialization for the LangGraph checkpoint tables.
+
+The checkpointer writes a new version of the `messages` channel at every graph
+super-step, each one a full copy of the conversation. Tool results (ten search
+snippets per DuckDuckGo call) dominate those copies and are re-stored at every
+step of every later turn.
+
+Two things keep that in check:
+
+- `CompactSerializer` keeps the checkpointer's msgpack encoding and compresses
+  blobs above CHECKPOINT_SERDE_COMPRESS_MIN_BYTES (zlib by default, zstd with the
+  optional `zstd` extra). Blobs written without compression still load.
+- `externalize_payloads` swaps ToolMessage contents above CHECKPOINT_PAYLOAD_MIN_BYTES
+  for a reference to their SHA-256 digest. The saver (see `CompactPostgresSaver`)
+  stores each payload once per thread, keyed by digest, so identical results are
+  deduplicated as well; `restore_payloads` puts the contents back on read.
+
+Pending writes (checkpoint_writes) are compressed but keep their payloads inline:
+they hold only the messages a node added in that step, so a tool result is
+stored there once, and they are deleted along with their checkpoint.
+"""
+
+import hashlib
+import zlib
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from langchain_core.messages import ToolMessage
+
+from app.core.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+# checkpoint_blobs channel holding out-of-line payloads; the row's version is the payload digest
+PAYLOAD_CHANNEL = "__payload__"
+
+# additional_kwargs key a ToolMessage carries instead of its content once externalized
+PAYLOAD_REF_KEY = "payload_ref"
+
+Codec = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+
+def _zstd_codec(level: int) -> Optional[Codec]:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return (lambda data: zstandard.compress(data, level)), zstandard.decompress
+
+
+def _zlib_codec(level: int) -> Codec:
+    return (lambda data: zlib.compress(data, min(level, 9))), zlib.decompress
+
+
+class CompactSerializer:
+    """JsonPlusSerializer with transparent compression of large blobs.
+
+    Implements langgraph's SerializerProtocol (a runtime-checkable protocol, so no
+    base class is needed and langgraph is only imported once one is created).
+
+    Compressed blobs are stored with the codec appended to the type tag
+    (e.g. "msgpack+zstd"), so untagged blobs from before keep loading unchanged.
+    """
+
+    def __init__(self, compression: str = "zlib", min_bytes: int = 1024, level: int = 3):
+        """Initialize the serializer.
+
+        Args:
+            compression: "zstd", "zlib" or "none". zstd falls back to zlib when
+                the optional `zstandard` package isn't installed.
+            min_bytes: Smallest encoded blob that gets compressed.
+            level: Compression level.
+        """
+        from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+        self._inner = JsonPlusSerializer()
+        self._min_bytes = min_bytes
+        self._codecs: Dict[str, Codec] = {"zlib": _zlib_codec(level)}
+        zstd = _zstd_codec(level)
+        if zstd is not None:
+            self._codecs["zstd"] = zstd
+        elif compression == "zstd":
+            logger.warning("zstandard_not_installed_using_zlib")
+            compression = "zlib"
+        self._codec = compression if compression in self._codecs else None
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        """Serialize `obj`, compressing the encoding when it is large enough."""
+        type_, data = self._inner.dumps_typed(obj)
+        if self._codec is None or not isinstance(data, bytes) or len(data) < self._min_bytes:
+            return type_, data
+        compress, _ = self._codecs[self._codec]
+        return f"{type_}+{self._codec}", compress(data)
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        """Deserialize a blob written by this serializer or by a plain JsonPlusSerializer."""
+        type_, payload = data
+        type_, _, codec = type_.partition("+")
+        if codec:
+            if codec not in self._codecs:
+                raise ValueError(f"checkpoint blob compressed with unavailable codec {codec!r}")
+            _, decompress = self._codecs[codec]
+            payload = decompress(payload)
+        return self._inner.loads_typed((type_, payload))
+
+
+# ==================================================
+# Out-of-line tool payloads
+# ==================================================
+def externalize_payloads(value: Any, min_bytes: int, payloads: Dict[str, str]) -> Any:
+    """Replace large ToolMessage contents in a channel value with references to their digest.
+
+    Messages are copied, never modified: `value` is the live channel value.
+
+    Args:
+        value: A channel value; only lists of messages are rewritten.
+        min_bytes: Smallest content (UTF-8 bytes) moved out of line; 0 disables.
+        payloads: Collects {digest: content} for the contents moved out.
+
+    Returns:
+        Any: `value`, or a copy with references in place of the large contents.
+    """
+    if not min_bytes or not isinstance(value, list):
+        return value
+    compacted = None
+    for index, message in enumerate(value):
+        if not isinstance(message, ToolMessage) or not isinstance(message.content, str):
+            continue
+        encoded = message.content.encode()
+        if len(encoded) < min_bytes:
+            continue
+        digest = hashlib.sha256(encoded).hexdigest()
+        payloads[digest] = message.content
+        if compacted is None:
+            compacted = list(value)
+        compacted[index] = message.model_copy(
+            update={"content": "", "additional_kwargs": {**message.additional_kwargs, PAYLOAD_REF_KEY: digest}}
+        )
+    return value if compacted is None else compacted
+
+
+def payload_refs(values: Iterable[Any]) -> Set[str]:
+    """Digests referenced by externalized ToolMessages in the given channel values."""
+    return {
+        message.additional_kwargs[PAYLOAD_REF_KEY]
+        for value in values
+        if isinstance(value, list)
+        for message in value
+        if isinstance(message, ToolMessage) and PAYLOAD_REF_KEY in message.additional_kwargs
+    }
+
+
+def restore_payloads(value: Any, payloads: Dict[str, str]) -> Any:
+    """Put externalized ToolMessage contents back, in place.
+
+    References whose payload is missing are left as they are (empty content).
+
+    Args:
+        value: A channel value as loaded from a checkpoint.
+        payloads: {digest: content} of the referenced payloads.
+
+    Returns:
+        Any: `value`, with contents restored.
+    """
+    if not isinstance(value, list):
+        return value
+    for index, message in enumerate(value):
+        if not isinstance(message, ToolMessage):
+            continue
+        digest = message.additional_kwargs.get(PAYLOAD_REF_KEY)
+        if digest is None or digest not in payloads:
+            continue
+        additional_kwargs = {k: v for k, v in message.additional_kwargs.items() if k != PAYLOAD_REF_KEY}
+        value[index] = message.model_copy(update={"content": payloads[digest], "additional_kwargs": additional_kwargs})
+    return value
@@ -0,0 +1,316 @@
+"""Read-optimized access to the LangGraph Postgres checkpoint tables.
+
+`aget_state` on the checkpointer loads every channel of the latest checkpoint
+(messages, token counts, long-term memory, ...) and its pending writes, and
+deserializes all of them. Reading the conversation history only needs the
+`messages` channel of the latest checkpoint, so `latest_messages` fetches that
+single blob with one indexed query.
+
+The store uses the same serializer as the checkpointer (see `create_graph`), so
+it can decode what the saver wrote. It also owns the maintenance queries used by
+the compaction job (app/services/checkpoint_compaction.py). The saver itself,
+`CompactPostgresSaver`, lives in app/services/checkpoint_saver.py so that this
+module (used by the ORM service and the API) doesn't import langgraph.
+"""
+
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from langchain_core.messages import BaseMessage
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.services.checkpoint_serde import (
+    PAYLOAD_CHANNEL,
+    CompactSerializer,
+    payload_refs,
+    restore_payloads,
+)
+from app.services.connection_pool import pool_manager
+
+logger = get_logger(__name__)
+
+# Graph runs only write to the root namespace; subgraphs would use their own
+ROOT_NAMESPACE = ""
+
+# The blob for the channel version recorded in the thread's newest checkpoint.
+# checkpoint_ids are time-ordered, so the primary key serves the ORDER BY ... LIMIT 1.
+_LATEST_CHANNEL_SQL = """
+    SELECT bl.type, bl.blob
+    FROM (
+        SELECT thread_id, checkpoint_ns, checkpoint -> 'channel_versions' ->> %(channel)s AS version
+        FROM checkpoints
+        WHERE thread_id = %(thread_id)s AND checkpoint_ns = %(checkpoint_ns)s
+        ORDER BY checkpoint_id DESC
+        LIMIT 1
+    ) latest
+    JOIN checkpoint_blobs bl
+        ON bl.thread_id = latest.thread_id
+        AND bl.checkpoint_ns = latest.checkpoint_ns
+        AND bl.channel = %(channel)s
+        AND bl.version = latest.version
+"""
+
+# Out-of-line payloads of a thread, by digest (also read by CompactPostgresSaver)
+PAYLOADS_SQL = """
+    SELECT version, type, blob
+    FROM checkpoint_blobs
+    WHERE thread_id = %(thread_id)s AND checkpoint_ns = %(checkpoint_ns)s
+        AND channel = %(channel)s AND version = ANY(%(digests)s)
+"""
+
+# Threads with more than `keep` checkpoints and no new checkpoint for `idle` seconds
+_COMPACTION_CANDIDATES_SQL = """
+    SELECT thread_id
+    FROM checkpoints
+    WHERE checkpoint_ns = %(checkpoint_ns)s
+    GROUP BY thread_id
+    HAVING count(*) > %(keep)s
+        AND max((checkpoint ->> 'ts')::timestamptz) < now() - make_interval(secs => %(idle)s)
+    LIMIT %(limit)s
+"""
+
+# Row counts and sizes of the deleted_* CTEs, one row per table
+_DELETED_STATS_SQL = """
+    SELECT 'checkpoints', count(*), coalesce(sum(size), 0) FROM deleted_checkpoints
+    UNION ALL SELECT 'checkpoint_writes', count(*), coalesce(sum(size), 0) FROM deleted_writes
+    UNION ALL SELECT 'checkpoint_blobs', count(*), coalesce(sum(size), 0) FROM deleted_blobs
+"""
+
+# Drop all but the newest `keep` checkpoints of a thread, their writes, and the blobs
+# no remaining checkpoint refers to. All CTEs read the same snapshot, so `kept` sees
+# the checkpoints as they were before the deletes. Nothing is deleted unless the thread
+# is still idle, and only blobs older than the newest kept version of their channel go:
+# the saver writes a checkpoint's blobs before its row, so a blob written by a turn in
+# progress (in any process) has a newer version and is never touched. Out-of-line
+# payloads are referenced from inside the message blobs, so they stay until the thread
+# is deleted.
+_COMPACT_THREAD_SQL = (
+    """
+    WITH doomed AS (
+        SELECT checkpoint_id
+        FROM checkpoints
+        WHERE thread_id = %(thread_id)s AND checkpoint_ns = %(checkpoint_ns)s
+            AND NOT EXISTS (
+                SELECT 1 FROM checkpoints recent
+                WHERE recent.thread_id = %(thread_id)s AND recent.checkpoint_ns = %(checkpoint_ns)s
+                    AND (recent.checkpoint ->> 'ts')::timestamptz >= now() - make_interval(secs => %(idle)s)
+            )
+        ORDER BY checkpoint_id DESC
+        OFFSET %(keep)s
+    ),
+    kept AS (
+        SELECT DISTINCT versions.key AS channel, versions.value AS version
+        FROM checkpoints c, jsonb_each_text(c.checkpoint -> 'channel_versions') versions
+        WHERE c.thread_id = %(thread_id)s AND c.checkpoint_ns = %(checkpoint_ns)s
+            AND c.checkpoint_id NOT IN (SELECT checkpoint_id FROM doomed)
+    ),
+    deleted_checkpoints AS (
+        DELETE FROM checkpoints c USING doomed
+        WHERE c.thread_id = %(thread_id)s AND c.checkpoint_ns = %(checkpoint_ns)s
+            AND c.checkpoint_id = doomed.checkpoint_id
+        RETURNING pg_column_size(c.*) AS size
+    ),
+    deleted_writes AS (
+        DELETE FROM checkpoint_writes w USING doomed
+        WHERE w.thread_id = %(thread_id)s AND w.checkpoint_ns = %(checkpoint_ns)s
+            AND w.checkpoint_id = doomed.checkpoint_id
+        RETURNING pg_column_size(w.*) AS size
+    ),
+    deleted_blobs AS (
+        DELETE FROM checkpoint_blobs b
+        WHERE b.thread_id = %(thread_id)s AND b.checkpoint_ns = %(checkpoint_ns)s
+            AND b.channel <> %(payload_channel)s
+            AND EXISTS (SELECT 1 FROM doomed)
+            AND NOT EXISTS (SELECT 1 FROM kept WHERE kept.channel = b.channel AND kept.version = b.version)
+            AND b.version < (SELECT max(kept.version) FROM kept WHERE kept.channel = b.channel)
+        RETURNING pg_column_size(b.*) AS size
+    )
+    """
+    + _DELETED_STATS_SQL
+)
+
+# Delete, in every namespace, up to `limit` threads whose newest checkpoint is older than `max_age` seconds
+_EXPIRE_THREADS_SQL = (
+    """
+    WITH expired AS (
+        SELECT thread_id
+        FROM checkpoints
+        GROUP BY thread_id
+        HAVING max((checkpoint ->> 'ts')::timestamptz) < now() - make_interval(secs => %(max_age)s)
+        LIMIT %(limit)s
+    ),
+    deleted_checkpoints AS (
+        DELETE FROM checkpoints c USING expired WHERE c.thread_id = expired.thread_id
+        RETURNING pg_column_size(c.*) AS size
+    ),
+    deleted_writes AS (
+        DELETE FROM checkpoint_writes w USING expired WHERE w.thread_id = expired.thread_id
+        RETURNING pg_column_size(w.*) AS size
+    ),
+    deleted_blobs AS (
+        DELETE FROM checkpoint_blobs b USING expired WHERE b.thread_id = expired.thread_id
+        RETURNING pg_column_size(b.*) AS size
+    )
+    """
+    + _DELETED_STATS_SQL
+)
+
+# Delete everything stored for the given threads, in every namespace. One statement,
+# so the three tables are purged atomically in a single round trip.
+_PURGE_THREADS_SQL = (
+    """
+    WITH deleted_checkpoints AS (
+        DELETE FROM checkpoints c WHERE c.thread_id = ANY(%(thread_ids)s)
+        RETURNING pg_column_size(c.*) AS size
+    ),
+    deleted_writes AS (
+        DELETE FROM checkpoint_writes w WHERE w.thread_id = ANY(%(thread_ids)s)
+        RETURNING pg_column_size(w.*) AS size
+    ),
+    deleted_blobs AS (
+        DELETE FROM checkpoint_blobs b WHERE b.thread_id = ANY(%(thread_ids)s)
+        RETURNING pg_column_size(b.*) AS size
+    )
+    """
+    + _DELETED_STATS_SQL
+)
+
+# Per table: (rows deleted, bytes deleted)
+DeletedRows = Dict[str, Tuple[int, int]]
+
+
+class CheckpointStore:
+    """Direct queries against the checkpointer's tables, on the "checkpointer" pool quota."""
+
+    def __init__(self):
+        """Initialize the store; the serializer is created on first use."""
+        self._serde: Optional[CompactSerializer] = None
+
+    @property
+    def serde(self) -> CompactSerializer:
+        """The serializer shared with the checkpointer (it imports langgraph, so built lazily)."""
+        if self._serde is None:
+            self._serde = CompactSerializer(
+                compression=settings.CHECKPOINT_SERDE_COMPRESSION,
+                min_bytes=settings.CHECKPOINT_SERDE_COMPRESS_MIN_BYTES,
+                level=settings.CHECKPOINT_SERDE_COMPRESSION_LEVEL,
+            )
+        return self._serde
+
+    async def latest_messages(self, thread_id: str) -> List[BaseMessage]:
+        """Return the messages of a thread's latest checkpoint, without loading its other channels.
+
+        Args:
+            thread_id: The graph thread (session) id.
+
+        Returns:
+            List[BaseMessage]: The conversation, oldest first; empty for an unknown thread.
+        """
+        async with pool_manager.connection("checkpointer") as conn:
+            cursor = await conn.execute(
+                _LATEST_CHANNEL_SQL,
+                {"thread_id": thread_id, "checkpoint_ns": ROOT_NAMESPACE, "channel": "messages"},
+                binary=True,
+            )
+            row = await cursor.fetchone()
+            if row is None or row[0] == "empty":
+                return []
+            messages = self.serde.loads_typed((row[0], row[1]))
+            digests = payload_refs([messages])
+            if digests:
+                cursor = await conn.execute(
+                    PAYLOADS_SQL,
+                    {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": ROOT_NAMESPACE,
+                        "channel": PAYLOAD_CHANNEL,
+                        "digests": list(digests),
+                    },
+                    binary=True,
+                )
+                payloads = {
+                    digest: self.serde.loads_typed((type_, blob)) for digest, type_, blob in await cursor.fetchall()
+                }
+                restore_payloads(messages, payloads)
+        return messages
+
+    async def purge_threads(self, thread_ids: Sequence[str]) -> DeletedRows:
+        """Delete every checkpoint, write and blob of one or many threads in one transaction.
+
+        Args:
+            thread_ids: The graph thread (session) ids to purge.
+
+        Returns:
+            DeletedRows: Rows and bytes deleted per table.
+        """
+        if not thread_ids:
+            return {}
+        async with pool_manager.connection("checkpointer") as conn:
+            cursor = await conn.execute(_PURGE_THREADS_SQL, {"thread_ids": list(thread_ids)})
+            deleted = {table: (rows, size) for table, rows, size in await cursor.fetchall()}
+        logger.info(
+            "checkpoint_threads_purged",
+            threads=len(thread_ids),
+            rows={table: rows for table, (rows, _) in deleted.items()},
+        )
+        return deleted
+
+    # --------------------------------------------------
+    # Maintenance
+    # --------------------------------------------------
+    async def compaction_candidates(self, keep: int, idle_seconds: float, limit: int) -> List[str]:
+        """Threads with more than `keep` checkpoints whose last turn is older than `idle_seconds`."""
+        async with pool_manager.connection("checkpointer") as conn:
+            cursor = await conn.execute(
+                _COMPACTION_CANDIDATES_SQL,
+                {"checkpoint_ns": ROOT_NAMESPACE, "keep": keep, "idle": idle_seconds, "limit": limit},
+            )
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def compact_thread(self, thread_id: str, keep: int, idle_seconds: float) -> DeletedRows:
+        """Keep only a thread's newest `keep` checkpoints (and the blobs and writes they need).
+
+        A no-op unless the thread's last checkpoint is older than `idle_seconds` when
+        the statement runs. Callers should also hold the thread's single-flight lock
+        so no turn starts in this process while it runs.
+
+        Args:
+            thread_id: The graph thread (session) id.
+            keep: Number of newest checkpoints to keep (at least 1).
+            idle_seconds: Minimum age of the thread's newest checkpoint.
+
+        Returns:
+            DeletedRows: Rows and bytes deleted per table.
+        """
+        async with pool_manager.connection("checkpointer") as conn:
+            cursor = await conn.execute(
+                _COMPACT_THREAD_SQL,
+                {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": ROOT_NAMESPACE,
+                    "keep": max(keep, 1),
+                    "idle": idle_seconds,
+                    "payload_channel": PAYLOAD_CHANNEL,
+                },
+            )
+            return {table: (rows, size) for table, rows, size in await cursor.fetchall()}
+
+    async def expire_threads(self, max_age_seconds: float, limit: int) -> DeletedRows:
+        """Delete up to `limit` threads whose newest checkpoint is older than `max_age_seconds`.
+
+        Returns:
+            DeletedRows: Rows and bytes deleted per table.
+        """
+        async with pool_manager.connection("checkpointer") as conn:
+            cursor = await conn.execute(_EXPIRE_THREADS_SQL, {"max_age": max_age_seconds, "limit": limit})
+            return {table: (rows, size) for table, rows, size in await cursor.fetchall()}
+
+
+# Create singleton and export as checkpoint_store for service usage
+checkpoint_store = CheckpointStore()
@@ -0,0 +1,219 @@
+"""Per-model circuit breakers for LLM calls.
+
+Each model gets a breaker fed with the outcome and latency of every attempt,
+kept in a rolling time window. When the window's error rate or p95 latency
+crosses its threshold the breaker opens and the model is skipped (and its
+in-progress retries stop) until a cool-down elapses; then a limited number of
+half-open probes decide whether it closes again. The same window yields a
+health score used to order the fallback chain.
+"""
+
+import time
+from collections import deque
+from enum import Enum
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+)
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.core.metrics import (
+    llm_circuit_breaker_state,
+    llm_model_health_score,
+)
+
+logger = get_logger(__name__)
+
+
+class BreakerState(str, Enum):
+    """Circuit breaker states (gauge value in parentheses)."""
+
+    CLOSED = "closed"  # (0) calls flow normally
+    HALF_OPEN = "half_open"  # (1) a few probe calls test recovery
+    OPEN = "open"  # (2) calls are rejected until the cool-down elapses
+
+
+_STATE_GAUGE_VALUES = {BreakerState.CLOSED: 0, BreakerState.HALF_OPEN: 1, BreakerState.OPEN: 2}
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a rolling window of call outcomes.
+
+    Not thread-safe: meant to be used from the event loop only.
+    """
+
+    def __init__(self, name: str):
+        """Initialize a closed breaker configured from the LLM_BREAKER_* settings.
+
+        Args:
+            name: The model name (used for logs and metric labels).
+        """
+        self.name = name
+        self.window_seconds = settings.LLM_BREAKER_WINDOW_SECONDS
+        self.min_calls = settings.LLM_BREAKER_MIN_CALLS
+        self.error_rate_threshold = settings.LLM_BREAKER_ERROR_RATE
+        self.slow_call_seconds = settings.LLM_BREAKER_SLOW_CALL_SECONDS
+        self.open_seconds = settings.LLM_BREAKER_OPEN_SECONDS
+        self.half_open_probes = settings.LLM_BREAKER_HALF_OPEN_PROBES
+
+        self.state = BreakerState.CLOSED
+        # (finished_at, succeeded, latency_seconds)
+        self._window: Deque[Tuple[float, bool, float]] = deque()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._export()
+
+    # --------------------------------------------------
+    # Call gating
+    # --------------------------------------------------
+    def allow(self) -> bool:
+        """Return True if a call may be attempted now (reserving a probe slot when half-open).
+
+        Every admitted call must be followed by exactly one `release()`, however many
+        attempts (retries) it makes.
+        """
+        if self.state == BreakerState.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                return False
+            self._transition(BreakerState.HALF_OPEN)
+
+        if self.state == BreakerState.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_probes:
+                return False
+            self._probes_in_flight += 1
+        return True
+
+    def release(self) -> None:
+        """Free the probe slot reserved by `allow()` once the admitted call is over."""
+        if self.state == BreakerState.HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == BreakerState.OPEN
+
+    # --------------------------------------------------
+    # Outcome recording
+    # --------------------------------------------------
+    def record(self, succeeded: Optional[bool], latency: float) -> None:
+        """Record an attempt (probe slots are freed by `release()`, not here).
+
+        Args:
+            succeeded: True/False for a model success/failure; None for an outcome
+                that says nothing about model health (cancelled, bad request).
+            latency: Attempt duration in seconds.
+        """
+        if succeeded is None:
+            return
+
+        now = time.monotonic()
+        self._window.append((now, succeeded, latency))
+        self._evict(now)
+
+        if self.state == BreakerState.HALF_OPEN:
+            if succeeded:
+                # Recovered: start from a clean window so old failures don't re-trip it
+                self._window.clear()
+                self._transition(BreakerState.CLOSED)
+            else:
+                self._open()
+        elif self.state == BreakerState.CLOSED and self._should_trip():
+            self._open()
+        self._export()
+
+    # --------------------------------------------------
+    # Window statistics
+    # --------------------------------------------------
+    def stats(self) -> Tuple[int, float, float]:
+        """Return (calls, error_rate, p95_latency_seconds) for the current window."""
+        self._evict(time.monotonic())
+        calls = len(self._window)
+        if not calls:
+            return 0, 0.0, 0.0
+        failures = sum(1 for _, succeeded, _ in self._window if not succeeded)
+        latencies = sorted(latency for _, succeeded, latency in self._window if succeeded)
+        p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] if latencies else 0.0
+        return calls, failures / calls, p95
+
+    def health_score(self) -> float:
+        """Score in [0, 1]: 0 when open, otherwise success rate discounted by p95 latency."""
+        if self.state == BreakerState.OPEN:
+            return 0.0
+        _, error_rate, p95 = self.stats()
+        latency_factor = 1.0
+        if self.slow_call_seconds > 0:
+            latency_factor -= 0.5 * min(p95 / self.slow_call_seconds, 1.0)
+        score = (1.0 - error_rate) * latency_factor
+        return score * 0.5 if self.state == BreakerState.HALF_OPEN else score
+
+    def _should_trip(self) -> bool:
+        calls, error_rate, p95 = self.stats()
+        if calls < self.min_calls:
+            return False
+        if error_rate >= self.error_rate_threshold:
+            return True
+        # 0 disables the latency trip, as in health_score
+        return self.slow_call_seconds > 0 and p95 >= self.slow_call_seconds
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._window and self._window[0][0] < cutoff:
+            self._window.popleft()
+
+    # --------------------------------------------------
+    # State transitions
+    # --------------------------------------------------
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._probes_in_flight = 0
+        calls, error_rate, p95 = self.stats()
+        logger.warning(
+            "llm_circuit_opened",
+            model=self.name,
+            calls=calls,
+            error_rate=round(error_rate, 3),
+            p95_latency_seconds=round(p95, 3),
+            open_seconds=self.open_seconds,
+        )
+        self._transition(BreakerState.OPEN)
+
+    def _transition(self, state: BreakerState) -> None:
+        if state != self.state:
+            logger.info(
+                "llm_circuit_state_changed", model=self.name, from_state=self.state.value, to_state=state.value
+            )
+        self.state = state
+        self._export()
+
+    def _export(self) -> None:
+        llm_circuit_breaker_state.labels(model=self.name).set(_STATE_GAUGE_VALUES[self.state])
+        llm_model_health_score.labels(model=self.name).set(self.health_score())
+
+
+class CircuitBreakerRegistry:
+    """One breaker per model, created on first use."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, model_name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model_name)
+        if breaker is None:
+            breaker = self._breakers[model_name] = CircuitBreaker(model_name)
+        return breaker
+
+    def rank(self, model_names: Iterable[str]) -> Tuple[str, ...]:
+        """Order models healthiest first; ties keep the given order.
+
+        Scores are compared in 0.1 steps so small latency differences don't
+        pull traffic away from the preferred (first) model.
+        """
+        ordered = list(model_names)
+        position = {name: index for index, name in enumerate(ordered)}
+        return tuple(
+            sorted(ordered, key=lambda name: (-round(self.get(name).health_score(), 1), position[name]))
+        )
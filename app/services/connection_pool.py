@@ -0,0 +1,206 @@
+"""Process-wide PostgreSQL connection pool shared by every database consumer.
+
+The ORM (SQLAlchemy), the LangGraph checkpointer and mem0's pgvector store used to
+open three independent pools against the same database. This module owns a single
+connection budget split into per-consumer quotas (`POSTGRES_POOL_QUOTAS`), and
+exports pool-wait metrics to Prometheus. The pools are sized by the quotas;
+`POSTGRES_POOL_SIZE` is only a cap on their sum, checked when the pools open.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    AsyncIterator,
+    Dict,
+)
+from urllib.parse import quote_plus
+
+from psycopg import AsyncConnection
+from psycopg_pool import (
+    AsyncConnectionPool,
+    ConnectionPool,
+)
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.core.metrics import (
+    db_connections,
+    db_pool_connections_in_use,
+    db_pool_wait_seconds,
+)
+
+logger = get_logger(__name__)
+
+# Consumers that draw from the async pool; "memory" gets a sync pool because
+# mem0's pgvector store runs its queries from worker threads.
+ASYNC_CONSUMERS = ("orm", "checkpointer", "cache")
+MEMORY_CONSUMER = "memory"
+
+
+def get_connection_url() -> str:
+    """Build the libpq connection URL from settings.
+
+    Returns:
+        str: A postgresql:// URL with credentials quoted.
+    """
+    return (
+        "postgresql://"
+        f"{quote_plus(settings.POSTGRES_USER)}:{quote_plus(settings.POSTGRES_PASSWORD)}"
+        f"@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+    )
+
+
+async def _reset_connection(conn: AsyncConnection) -> None:
+    """Restore pool defaults on a connection returned by the ORM (which disables autocommit)."""
+    if not conn.autocommit:
+        await conn.set_autocommit(True)
+
+
+class ConnectionPoolManager:
+    """Owns the shared connection pools and per-consumer quotas.
+
+    A single async pool serves the ORM, the checkpointer and the Postgres-backed
+    result caches, each capped by an asyncio semaphore sized from its quota.
+    mem0 gets a small sync pool sized by the "memory" quota. The lifecycle is driven by `lifespan` in `app/main.py`.
+    """
+
+    def __init__(self):
+        """Create (but do not open) the pools."""
+        self._quotas: Dict[str, int] = dict(settings.POSTGRES_POOL_QUOTAS)
+        async_size = sum(self._quotas[consumer] for consumer in ASYNC_CONSUMERS)
+
+        self._pool = AsyncConnectionPool(
+            get_connection_url(),
+            open=False,
+            min_size=1,
+            max_size=async_size,
+            timeout=settings.POSTGRES_POOL_TIMEOUT,
+            # Lets SQLAlchemy "close" a borrowed connection to hand it back to us
+            close_returns=True,
+            check=AsyncConnectionPool.check_connection,
+            reset=_reset_connection,
+            kwargs={
+                "autocommit": True,
+                "connect_timeout": 5,
+                "prepare_threshold": None,
+            },
+        )
+        self._memory_pool = ConnectionPool(
+            get_connection_url(),
+            open=False,
+            min_size=1,
+            max_size=self._quotas[MEMORY_CONSUMER],
+            timeout=settings.POSTGRES_POOL_TIMEOUT,
+        )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {
+            consumer: asyncio.Semaphore(self._quotas[consumer]) for consumer in ASYNC_CONSUMERS
+        }
+        self._opened = False
+
+    @property
+    def pool(self) -> AsyncConnectionPool:
+        """The shared async pool (the LangGraph checkpointer borrows from it under the "checkpointer" quota)."""
+        return self._pool
+
+    @property
+    def memory_pool(self) -> ConnectionPool:
+        """The sync pool handed to mem0's pgvector store."""
+        return self._memory_pool
+
+    async def open(self) -> None:
+        """Open both pools. Safe to call more than once.
+
+        Raises:
+            ValueError: If the quotas add up to more than POSTGRES_POOL_SIZE.
+        """
+        if self._opened:
+            return
+        budget = sum(self._quotas.values())
+        if budget > settings.POSTGRES_POOL_SIZE:
+            logger.error(
+                "connection_pool_quotas_exceed_budget",
+                quotas=self._quotas,
+                budget=budget,
+                pool_size=settings.POSTGRES_POOL_SIZE,
+            )
+            raise ValueError(
+                f"POSTGRES_POOL_QUOTA_* add up to {budget} connections, "
+                f"more than POSTGRES_POOL_SIZE={settings.POSTGRES_POOL_SIZE}"
+            )
+        await self._pool.open()
+        await asyncio.to_thread(self._memory_pool.open)
+        self._opened = True
+        logger.info(
+            "connection_pool_opened",
+            quotas=self._quotas,
+            async_max_size=self._pool.max_size,
+            environment=settings.ENVIRONMENT.value,
+        )
+
+    async def close(self) -> None:
+        """Close both pools, waiting for borrowed connections to be returned."""
+        if not self._opened:
+            return
+        await self._pool.close()
+        await asyncio.to_thread(self._memory_pool.close)
+        self._opened = False
+        logger.info("connection_pool_closed")
+
+    @asynccontextmanager
+    async def quota(self, consumer: str) -> AsyncIterator[None]:
+        """Hold one of `consumer`'s quota slots for the duration of the block.
+
+        Args:
+            consumer: One of the async consumers ("orm", "checkpointer", "cache").
+        """
+        semaphore = self._semaphores[consumer]
+        start = time.perf_counter()
+        async with semaphore:
+            db_pool_wait_seconds.labels(consumer=consumer, stage="quota").observe(time.perf_counter() - start)
+            db_pool_connections_in_use.labels(consumer=consumer).inc()
+            try:
+                yield
+            finally:
+                db_pool_connections_in_use.labels(consumer=consumer).dec()
+
+    @asynccontextmanager
+    async def connection(self, consumer: str) -> AsyncIterator[AsyncConnection]:
+        """Borrow a pooled autocommit connection within `consumer`'s quota.
+
+        Args:
+            consumer: One of the async consumers ("orm", "checkpointer", "cache").
+
+        Yields:
+            AsyncConnection: A connection that returns to the pool on exit.
+        """
+        async with self.quota(consumer):
+            start = time.perf_counter()
+            async with self._pool.connection() as conn:
+                self._record_checkout(consumer, start)
+                yield conn
+
+    async def orm_connection(self) -> AsyncConnection:
+        """Connection factory for SQLAlchemy's `async_creator`.
+
+        The ORM manages its own transactions, so autocommit is switched off here
+        and restored by the pool's reset hook when SQLAlchemy closes the connection.
+
+        Returns:
+            AsyncConnection: A pooled connection with autocommit disabled.
+        """
+        start = time.perf_counter()
+        conn = await self._pool.getconn()
+        self._record_checkout("orm", start)
+        await conn.set_autocommit(False)
+        return conn
+
+    def _record_checkout(self, consumer: str, start: float) -> None:
+        """Record pool checkout wait and current pool usage."""
+        db_pool_wait_seconds.labels(consumer=consumer, stage="checkout").observe(time.perf_counter() - start)
+        stats = self._pool.get_stats()
+        db_connections.set(stats.get("pool_size", 0) - stats.get("pool_available", 0))
+
+
+# Create singleton and export as pool_manager for service usage
+pool_manager = ConnectionPoolManager()
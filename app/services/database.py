@@ -1,17 +1,26 @@
+from contextlib import (
+    AbstractAsyncContextManager,
+    asynccontextmanager,
+)
 from typing import (
+    AsyncIterator,
     List,
     Optional,
 )
 
 from fastapi import HTTPException
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.ext.asyncio import (
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import NullPool
 from sqlmodel import (
-    Session,
     SQLModel,
-    create_engine,
     select,
 )
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import (
     Environment,
@@ -20,6 +29,9 @@ from app.core.config import (
 from app.core.config.logging import get_logger
 from app.models.session import Session as ChatSession
 from app.models.user import User
+from app.services.checkpoint_store import checkpoint_store
+from app.services.connection_pool import pool_manager
+from app.utils.cache import TTLCache
 
 logger = get_logger(__name__)
 
@@ -28,40 +40,42 @@ class DatabaseService:
     """Service class for database operations.
 
     This class handles all database operations for Users, Sessions, and Messages.
-    It uses SQLModel for ORM operations and maintains a connection pool.
+    It uses SQLModel on top of an async SQLAlchemy engine (psycopg 3 driver), so
+    queries never block the event loop. Connections come from the shared
+    `pool_manager` and count against its "orm" quota.
     """
 
     def __init__(self):
-        """Initialize database service with connection pool."""
+        """Initialize database service on top of the shared connection pool.
+
+        The engine connects lazily; tables are created by `initialize()`, which
+        must be awaited once on application startup after the pool is opened.
+        """
         try:
-            # Configure environment-specific database connection pool settings
-            pool_size = settings.POSTGRES_POOL_SIZE
-            max_overflow = settings.POSTGRES_MAX_OVERFLOW
-
-            # Create engine with appropriate pool configuration
-            connection_url = (
-                f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
-                f"@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+            # SQLAlchemy does no pooling of its own: every connection is borrowed
+            # from the shared pool and handed back when SQLAlchemy closes it.
+            self.engine = create_async_engine(
+                "postgresql+psycopg://",
+                async_creator=pool_manager.orm_connection,
+                poolclass=NullPool,
             )
 
-            self.engine = create_engine(
-                connection_url,
-                pool_pre_ping=True,
-                poolclass=QueuePool,
-                pool_size=pool_size,
-                max_overflow=max_overflow,
-                pool_timeout=30,  # Connection timeout (seconds)
-                pool_recycle=1800,  # Recycle connections after 30 minutes
-            )
+            # expire_on_commit=False keeps returned models readable after the session closes
+            self._session_factory = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
 
-            # Create tables (only if they don't exist)
-            SQLModel.metadata.create_all(self.engine)
+            # Auth hot-path caches (per process). Mutations below invalidate them;
+            # other workers converge within AUTH_CACHE_TTL_SECONDS.
+            self._user_cache: TTLCache[int, User] = TTLCache(
+                "auth_user", maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+            )
+            self._session_cache: TTLCache[str, ChatSession] = TTLCache(
+                "auth_session", maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+            )
 
             logger.info(
                 "database_initialized",
                 environment=settings.ENVIRONMENT.value,
-                pool_size=pool_size,
-                max_overflow=max_overflow,
+                orm_quota=settings.POSTGRES_POOL_QUOTAS["orm"],
             )
         except SQLAlchemyError as e:
             logger.error("database_initialization_error", error=str(e), environment=settings.ENVIRONMENT.value)
@@ -69,6 +83,33 @@ class DatabaseService:
             if settings.ENVIRONMENT != Environment.PRODUCTION:
                 raise
 
+    async def initialize(self) -> None:
+        """Create tables (only if they don't exist).
+
+        Called once from the application lifespan, since DDL on an async engine
+        has to run inside the event loop.
+        """
+        try:
+            async with self.engine.begin() as conn:
+                await conn.run_sync(SQLModel.metadata.create_all)
+            logger.info("database_tables_created", environment=settings.ENVIRONMENT.value)
+        except SQLAlchemyError as e:
+            logger.error("database_table_creation_error", error=str(e), environment=settings.ENVIRONMENT.value)
+            if settings.ENVIRONMENT != Environment.PRODUCTION:
+                raise
+
+    async def close(self) -> None:
+        """Dispose of the engine (the shared pool itself is closed by `pool_manager`)."""
+        await self.engine.dispose()
+        logger.info("database_engine_disposed")
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        """Open an ORM session within the "orm" pool quota."""
+        async with pool_manager.quota("orm"):
+            async with self._session_factory() as session:
+                yield session
+
     async def create_user(self, email: str, password: str) -> User:
         """Create a new user.
 
@@ -79,11 +120,11 @@ class DatabaseService:
         Returns:
             User: The created user
         """
-        with Session(self.engine) as session:
+        async with self._session() as session:
             user = User(email=email, hashed_password=password)
             session.add(user)
-            session.commit()
-            session.refresh(user)
+            await session.commit()
+            await session.refresh(user)
             logger.info("user_created", email=email)
             return user
 
@@ -96,8 +137,14 @@ class DatabaseService:
         Returns:
             Optional[User]: The user if found, None otherwise
         """
-        with Session(self.engine) as session:
-            user = session.get(User, user_id)
+        user = self._user_cache.get(user_id)
+        if user is not None:
+            return user
+
+        async with self._session() as session:
+            user = await session.get(User, user_id)
+            if user is not None:
+                self._user_cache.set(user_id, user)
             return user
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
@@ -109,13 +156,14 @@ class DatabaseService:
         Returns:
             Optional[User]: The user if found, None otherwise
         """
-        with Session(self.engine) as session:
+        async with self._session() as session:
             statement = select(User).where(User.email == email)
-            user = session.exec(statement).first()
+            result = await session.exec(statement)
+            user = result.first()
             return user
 
     async def delete_user_by_email(self, email: str) -> bool:
-        """Delete a user by email.
+        """Delete a user by email, with the conversation history of all their sessions.
 
         Args:
             email: The email of the user to delete
@@ -123,13 +171,22 @@ class DatabaseService:
         Returns:
             bool: True if deletion was successful, False if user not found
         """
-        with Session(self.engine) as session:
-            user = session.exec(select(User).where(User.email == email)).first()
+        async with self._session() as session:
+            # Eager-load sessions: async sessions can't lazy-load relationships during delete
+            statement = select(User).where(User.email == email).options(selectinload(User.sessions))
+            result = await session.exec(statement)
+            user = result.first()
             if not user:
                 return False
 
-            session.delete(user)
-            session.commit()
+            session_ids = [chat_session.id for chat_session in user.sessions]
+            # All sessions' checkpoints in one statement; if this fails, the user is kept
+            await checkpoint_store.purge_threads(session_ids)
+            await session.delete(user)
+            await session.commit()
+            self._user_cache.pop(user.id)
+            for session_id in session_ids:
+                self._session_cache.pop(session_id)
             logger.info("user_deleted", email=email)
             return True
 
@@ -144,16 +201,16 @@ class DatabaseService:
         Returns:
             ChatSession: The created session
         """
-        with Session(self.engine) as session:
+        async with self._session() as session:
             chat_session = ChatSession(id=session_id, user_id=user_id, name=name)
             session.add(chat_session)
-            session.commit()
-            session.refresh(chat_session)
+            await session.commit()
+            await session.refresh(chat_session)
             logger.info("session_created", session_id=session_id, user_id=user_id, name=name)
             return chat_session
 
     async def delete_session(self, session_id: str) -> bool:
-        """Delete a session by ID.
+        """Delete a session by ID, with its conversation history.
 
         Args:
             session_id: The ID of the session to delete
@@ -161,13 +218,15 @@ class DatabaseService:
         Returns:
             bool: True if deletion was successful, False if session not found
         """
-        with Session(self.engine) as session:
-            chat_session = session.get(ChatSession, session_id)
+        async with self._session() as session:
+            chat_session = await session.get(ChatSession, session_id)
             if not chat_session:
                 return False
 
-            session.delete(chat_session)
-            session.commit()
+            await checkpoint_store.purge_threads([session_id])
+            await session.delete(chat_session)
+            await session.commit()
+            self._session_cache.pop(session_id)
             logger.info("session_deleted", session_id=session_id)
             return True
 
@@ -180,8 +239,14 @@ class DatabaseService:
         Returns:
             Optional[ChatSession]: The session if found, None otherwise
         """
-        with Session(self.engine) as session:
-            chat_session = session.get(ChatSession, session_id)
+        chat_session = self._session_cache.get(session_id)
+        if chat_session is not None:
+            return chat_session
+
+        async with self._session() as session:
+            chat_session = await session.get(ChatSession, session_id)
+            if chat_session is not None:
+                self._session_cache.set(session_id, chat_session)
             return chat_session
 
     async def get_user_sessions(self, user_id: int) -> List[ChatSession]:
@@ -193,9 +258,10 @@ class DatabaseService:
         Returns:
             List[ChatSession]: List of user's sessions
         """
-        with Session(self.engine) as session:
+        async with self._session() as session:
             statement = select(ChatSession).where(ChatSession.user_id == user_id).order_by(ChatSession.created_at)
-            sessions = session.exec(statement).all()
+            result = await session.exec(statement)
+            sessions = result.all()
             return sessions
 
     async def update_session_name(self, session_id: str, name: str) -> ChatSession:
@@ -211,25 +277,26 @@ class DatabaseService:
         Raises:
             HTTPException: If session is not found
         """
-        with Session(self.engine) as session:
-            chat_session = session.get(ChatSession, session_id)
+        async with self._session() as session:
+            chat_session = await session.get(ChatSession, session_id)
             if not chat_session:
                 raise HTTPException(status_code=404, detail="Session not found")
 
             chat_session.name = name
             session.add(chat_session)
-            session.commit()
-            session.refresh(chat_session)
+            await session.commit()
+            await session.refresh(chat_session)
+            self._session_cache.pop(session_id)
             logger.info("session_name_updated", session_id=session_id, name=name)
             return chat_session
 
-    def get_session_maker(self):
-        """Get a session maker for creating database sessions.
+    def get_session_maker(self) -> AbstractAsyncContextManager[AsyncSession]:
+        """Get a database session within the "orm" pool quota.
 
         Returns:
-            Session: A SQLModel session maker
+            AbstractAsyncContextManager[AsyncSession]: A SQLModel async session (use with `async with`)
         """
-        return Session(self.engine)
+        return self._session()
 
     async def health_check(self) -> bool:
         """Check database connection health.
@@ -238,9 +305,10 @@ class DatabaseService:
             bool: True if database is healthy, False otherwise
         """
         try:
-            with Session(self.engine) as session:
+            async with self._session() as session:
                 # Execute a simple query to check connection
-                session.exec(select(1)).first()
+                result = await session.exec(select(1))
+                result.first()
                 return True
         except Exception as e:
             logger.error("database_health_check_failed", error=str(e))
@@ -0,0 +1,56 @@
+"""Hedged LLM requests: when to fire a backup call, and how many we can afford.
+
+A hedge is sent when the primary call is still running after the configured
+percentile of that model's recent latencies (LLM_HEDGE_PERCENTILE), so only the
+slow tail pays for a second request. Spend is capped by a token bucket that
+earns LLM_HEDGE_BUDGET_RATIO hedges per hedgeable call (e.g. 0.05 = at most ~5%
+extra requests), with bursts up to LLM_HEDGE_BUDGET_BURST.
+"""
+
+from collections import deque
+from typing import (
+    Deque,
+    Dict,
+    Optional,
+)
+
+from app.core.config import settings
+
+
+class HedgePolicy:
+    """Per-model latency tracking plus the hedge budget.
+
+    Not thread-safe: meant to be used from the event loop only.
+    """
+
+    def __init__(self):
+        """Initialize an empty policy configured from the LLM_HEDGE_* settings."""
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._budget = float(settings.LLM_HEDGE_BUDGET_BURST)
+
+    def observe(self, model_name: str, latency: float) -> None:
+        """Record the latency of a successful call."""
+        window = self._latencies.get(model_name)
+        if window is None:
+            window = self._latencies[model_name] = deque(maxlen=settings.LLM_HEDGE_WINDOW)
+        window.append(latency)
+
+    def delay(self, model_name: str) -> Optional[float]:
+        """Seconds to wait before hedging a call to `model_name`, or None if there is too little data."""
+        window = self._latencies.get(model_name)
+        if not window or len(window) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(window)
+        index = min(int(len(ordered) * settings.LLM_HEDGE_PERCENTILE / 100), len(ordered) - 1)
+        return max(ordered[index], settings.LLM_HEDGE_MIN_DELAY)
+
+    def earn(self) -> None:
+        """Credit the budget for one hedgeable call."""
+        self._budget = min(self._budget + settings.LLM_HEDGE_BUDGET_RATIO, float(settings.LLM_HEDGE_BUDGET_BURST))
+
+    def try_spend(self) -> bool:
+        """Take one hedge from the budget; False if it is exhausted."""
+        if self._budget < 1.0:
+            return False
+        self._budget -= 1.0
+        return True
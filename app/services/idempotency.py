@@ -0,0 +1,105 @@
+"""Idempotent request execution for client-supplied Idempotency-Key headers.
+
+A retried request with the same key joins the original request while it is still
+running, or gets its stored result once it has completed, instead of running the
+work (and billing the completion) again. Failed runs are not remembered, so a retry
+after an error executes normally. State is per process.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Tuple,
+    TypeVar,
+)
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.utils.cache import TTLCache
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class IdempotencyKeyMismatchError(ValueError):
+    """The idempotency key was already used for a request with a different payload."""
+
+
+def request_fingerprint(payload: Any) -> str:
+    """Stable hash of a JSON-serializable request payload."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+
+class IdempotentRequests:
+    """In-flight tasks and completed results, keyed by idempotency key.
+
+    Not thread-safe: meant to be used from the event loop only.
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: int):
+        """Initialize the store.
+
+        Args:
+            name: Cache name used in metrics.
+            ttl: Seconds a completed result is replayed.
+            maxsize: Max completed results kept (LRU eviction).
+        """
+        self._completed: TTLCache[str, Tuple[str, Any]] = TTLCache(name, maxsize=maxsize, ttl=ttl)
+        self._in_flight: Dict[str, Tuple[str, asyncio.Task]] = {}
+
+    async def run(self, key: str, fingerprint: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run `func` once per key and return its result to every caller using that key.
+
+        The work runs in its own task, so a caller that disconnects doesn't cancel it
+        for the callers waiting on the same key.
+
+        Args:
+            key: The idempotency key (scoped by the caller, e.g. per session).
+            fingerprint: Hash of the request payload (see `request_fingerprint`).
+            func: Coroutine function performing the work.
+
+        Returns:
+            T: The result of the (single) run.
+
+        Raises:
+            IdempotencyKeyMismatchError: If the key was used with a different payload.
+        """
+        completed = self._completed.get(key)
+        if completed is not None:
+            self._check(key, fingerprint, completed[0])
+            logger.info("idempotent_request_replayed", key=key)
+            return completed[1]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self._check(key, fingerprint, in_flight[0])
+            logger.info("idempotent_request_joined", key=key)
+            return await asyncio.shield(in_flight[1])
+
+        task = asyncio.create_task(func())
+        self._in_flight[key] = (fingerprint, task)
+        task.add_done_callback(lambda done: self._settle(key, fingerprint, done))
+        return await asyncio.shield(task)
+
+    def _settle(self, key: str, fingerprint: str, task: asyncio.Task) -> None:
+        """Move a finished run out of the in-flight map, keeping its result if it succeeded."""
+        self._in_flight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._completed.set(key, (fingerprint, task.result()))
+
+    @staticmethod
+    def _check(key: str, fingerprint: str, expected: str) -> None:
+        if fingerprint != expected:
+            logger.warning("idempotency_key_reused_with_different_payload", key=key)
+            raise IdempotencyKeyMismatchError("Idempotency-Key was already used with a different request body")
+
+
+chat_requests = IdempotentRequests(
+    "idempotency:chat", ttl=settings.IDEMPOTENCY_KEY_TTL, maxsize=settings.IDEMPOTENCY_KEY_MAX_SIZE
+)
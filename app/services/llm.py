@@ -1,21 +1,47 @@
-from typing import Any, Dict, List, Optional, Union
+import asyncio
+import json
+import time
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import BaseMessage
-from langchain_openai import ChatOpenAI
-from openai import APIError, APITimeoutError, OpenAIError, RateLimitError
+from langchain_core.messages import AIMessageChunk, BaseMessage, BaseMessageChunk, message_chunk_to_message
+from openai import (
+    APIConnectionError,
+    APIError,
+    APITimeoutError,
+    InternalServerError,
+    OpenAIError,
+    RateLimitError,
+)
 from tenacity import (
+    RetryCallState,
     before_sleep_log,
     retry,
     retry_if_exception_type,
     stop_after_attempt,
+    stop_any,
     wait_exponential,
 )
 
 
 from app.core.config import settings, Environment
 from app.core.config.logging import get_logger
+from app.core.metrics import (
+    llm_hedged_requests_total,
+    llm_prompt_cached_tokens_total,
+    llm_prompt_tokens_total,
+    llm_time_to_first_token_seconds,
+)
+from app.services.circuit_breaker import CircuitBreakerRegistry
+from app.services.hedging import HedgePolicy
+from app.services.llm_dispatcher import Priority, llm_dispatcher
+from app.services.rate_limiter import RateLimiterRegistry, estimate_tokens
+from app.services.response_cache import LLMResponseCache, response_cache_key
 logger = get_logger(__name__)
 
+# Errors that say the model/provider is unhealthy (as opposed to a bad request)
+MODEL_HEALTH_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
 # ==================================================
 # LLM Registry
 # ==================================================
@@ -23,33 +49,46 @@ class LLMRegistry:
     """
     Registry of available LLM models.
     This allows us to switch "Brains" on the fly without changing code.
+
+    Models are declared as ChatOpenAI settings; clients are built on first use,
+    so importing this module constructs none of them.
     """
-    
+
     # We pre-configure models with different capabilities/costs
     LLMS: List[Dict[str, Any]] = [
         {
             "name": "gpt-4o-mini",  # Default: cost-effective, fast
-            "llm": ChatOpenAI(
-                model="gpt-4o-mini",
-                temperature=settings.DEFAULT_LLM_TEMPERATURE,
-                api_key=settings.OPENAI_API_KEY,
-                max_tokens=settings.MAX_TOKENS,
-                top_p=0.95 if settings.ENVIRONMENT == Environment.PRODUCTION else 0.8,
-                presence_penalty=0.1 if settings.ENVIRONMENT == Environment.PRODUCTION else 0.0,
-                frequency_penalty=0.1 if settings.ENVIRONMENT == Environment.PRODUCTION else 0.0,
-            ),
+            "config": {
+                "temperature": settings.DEFAULT_LLM_TEMPERATURE,
+                "max_tokens": settings.MAX_TOKENS,
+                "top_p": 0.95 if settings.ENVIRONMENT == Environment.PRODUCTION else 0.8,
+                "presence_penalty": 0.1 if settings.ENVIRONMENT == Environment.PRODUCTION else 0.0,
+                "frequency_penalty": 0.1 if settings.ENVIRONMENT == Environment.PRODUCTION else 0.0,
+            },
         },
         {
             "name": "gpt-4o",
-            "llm": ChatOpenAI(
-                model="gpt-4o",
-                temperature=settings.DEFAULT_LLM_TEMPERATURE,
-                api_key=settings.OPENAI_API_KEY,
-                max_tokens=settings.MAX_TOKENS,
-            ),
+            "config": {
+                "temperature": settings.DEFAULT_LLM_TEMPERATURE,
+                "max_tokens": settings.MAX_TOKENS,
+            },
         },
     ]
 
+    # Default client per model name, built by `get`
+    _clients: Dict[str, BaseChatModel] = {}
+
+    @classmethod
+    def _build(cls, model_name: str, **kwargs) -> BaseChatModel:
+        """Construct a client (the OpenAI integration is imported on first use)."""
+        from langchain_openai import ChatOpenAI
+
+        # x-ratelimit-* headers calibrate the client-side rate limiter; streamed
+        # usage feeds rate limiter settlement and prompt-cache metrics
+        kwargs.setdefault("include_response_headers", settings.LLM_RATE_LIMIT_ENABLED)
+        kwargs.setdefault("stream_usage", True)
+        return ChatOpenAI(model=model_name, api_key=settings.OPENAI_API_KEY, **kwargs)
+
     # --------------------------------------------------
     # Get a specific model instance by name
     # --------------------------------------------------
@@ -71,11 +110,14 @@ class LLMRegistry:
         # If user provides kwargs, create a new instance with those args
         if kwargs:
             logger.debug("creating_llm_with_custom_args", model_name=model_name, custom_args=list(kwargs.keys()))
-            return ChatOpenAI(model=model_name, api_key=settings.OPENAI_API_KEY, **kwargs)
+            return cls._build(model_name, **kwargs)
 
-        # Return the default instance
-        logger.debug("using_default_llm_instance", model_name=model_name)
-        return model_entry["llm"]
+        # Return the default instance, building it on first use
+        client = cls._clients.get(model_name)
+        if client is None:
+            logger.debug("building_default_llm_instance", model_name=model_name)
+            client = cls._clients[model_name] = cls._build(model_name, **model_entry["config"])
+        return client
 
     # --------------------------------------------------
     # Get all model names
@@ -87,79 +129,158 @@ class LLMRegistry:
     @classmethod
     def get_model_at_index(cls, index: int) -> Dict[str, Any]:
         """Get model entry at specific index"""
-        if 0 <= index < len(cls.LLMS):
-            return cls.LLMS[index]
-        return cls.LLMS[0]  # Wrap around to first model
+        entry = cls.LLMS[index] if 0 <= index < len(cls.LLMS) else cls.LLMS[0]  # Wrap around to first model
+        return {"name": entry["name"], "llm": cls.get(entry["name"])}
 
 
 # ==================================================
 # LLM Service (The Resilience Layer)
 # ==================================================
 
+def _stop_if_circuit_open(retry_state: RetryCallState) -> bool:
+    """Tenacity stop condition: give up retrying a model as soon as its breaker opens."""
+    service, _, model_name = retry_state.args[:3]
+    return service.breakers.get(model_name).is_open
+
+
+@dataclass(frozen=True)
+class LLMRoute:
+    """
+    Immutable routing decision for a single call.
+
+    Fallback walks `model_names` in order, so a failing request never changes
+    the model that concurrent requests use.
+    """
+
+    model_names: Tuple[str, ...]
+    # Custom kwargs for the primary model only (fallbacks use the registry instances)
+    model_kwargs: Tuple[Tuple[str, Any], ...] = ()
+    # Whether the agent's tools are bound (False for internal calls such as summarization)
+    tools: bool = True
+
+    @property
+    def primary(self) -> str:
+        return self.model_names[0]
+
+
 class LLMService:
     """
     Manages LLM calls with automatic retries and fallback logic.
+
+    The service holds no per-call state: every call builds its own LLMRoute, and
+    tool-bound model instances are built once per registry entry, on first use.
+    Per-model circuit breakers skip unhealthy models and order fallbacks by health,
+    and per-model RPM/TPM buckets move calls off models that are out of quota.
     """
 
     def __init__(self):
         """Initialize the LLM service."""
-        self._llm: Optional[BaseChatModel] = None
-        self._current_model_index: int = 0
+        self._tools: List = []
+        self._bound_llms: Dict[str, BaseChatModel] = {}
+        self.breakers = CircuitBreakerRegistry()
+        self.hedging = HedgePolicy()
+        self.rate_limits = RateLimiterRegistry()
+        self.response_cache = LLMResponseCache()
 
-        # Find index of default model in registry
         all_names = LLMRegistry.get_all_names()
-        try:
-            self._current_model_index = all_names.index(settings.DEFAULT_LLM_MODEL)
-            self._llm = LLMRegistry.get(settings.DEFAULT_LLM_MODEL)
+        if settings.DEFAULT_LLM_MODEL in all_names:
+            self.default_model = settings.DEFAULT_LLM_MODEL
             logger.info(
                 "llm_service_initialized",
-                default_model=settings.DEFAULT_LLM_MODEL,
-                model_index=self._current_model_index,
+                default_model=self.default_model,
+                model_index=all_names.index(self.default_model),
                 total_models=len(all_names),
                 environment=settings.ENVIRONMENT.value,
             )
-        except (ValueError, Exception) as e:
+        else:
             # Default model not found, use first model
-            self._current_model_index = 0
-            self._llm = LLMRegistry.LLMS[0]["llm"]
+            self.default_model = all_names[0]
             logger.warning(
                 "default_model_not_found_using_first",
                 requested=settings.DEFAULT_LLM_MODEL,
-                using=all_names[0] if all_names else "none",
-                error=str(e),
+                using=self.default_model,
             )
-    
-    def _get_next_model_index(self) -> int:
-        """Get the next model index in circular fashion"""
 
-        total_models = len(LLMRegistry.LLMS)
-        next_index = (self._current_model_index + 1) % total_models
-        return next_index
+    def route(self, model_name: Optional[str] = None, *, tools: bool = True, **model_kwargs) -> LLMRoute:
+        """Build the routing context for one call.
 
-    def _switch_to_next_model(self) -> bool:
-        """
-        Circular Fallback: Switches to the next available model in the registry.
-        Returns True if successful.
-        """
-        try:
-            next_index = self._get_next_model_index()
-            next_model_entry = LLMRegistry.get_model_at_index(next_index)
-
-            logger.warning(
-                "switching_to_next_model",
-                from_index=self._current_model_index,
-                to_index=next_index,
-                to_model=next_model_entry["name"],
-            )
+        Args:
+            model_name: Primary model; defaults to the service default.
+            tools: Bind the agent's tools to the route's models.
+            **model_kwargs: Optional kwargs to override the primary model's configuration
 
-            self._current_model_index = next_index
-            self._llm = next_model_entry["llm"]
+        Returns:
+            LLMRoute: An explicitly requested model first, then the other models by
+                health score (ties keep the registry's circular order). Without an
+                explicit model the default model leads only while it is the healthiest.
 
-            logger.info("model_switched", new_model=next_model_entry["name"], new_index=next_index)
-            return True
-        except Exception as e:
-            logger.error("model_switch_failed", error=str(e))
+        Raises:
+            ValueError: If the model is not in the registry.
+        """
+        primary = model_name or self.default_model
+        all_names = LLMRegistry.get_all_names()
+        if primary not in all_names:
+            raise ValueError(
+                f"model '{primary}' not found in registry. available models: {', '.join(all_names)}"
+            )
+        start = all_names.index(primary)
+        circular = all_names[start:] + all_names[:start]
+        if model_name:
+            model_names = (primary, *self.breakers.rank(circular[1:]))
+        else:
+            model_names = self.breakers.rank(circular)
+        return LLMRoute(model_names=model_names, model_kwargs=tuple(sorted(model_kwargs.items())), tools=tools)
+
+    def _llm_for(self, route: LLMRoute, model_name: str) -> BaseChatModel:
+        """Resolve the model instance to use for one step of a route."""
+        if model_name == route.primary and route.model_kwargs:
+            llm = LLMRegistry.get(model_name, **dict(route.model_kwargs))
+            return llm.bind_tools(self._tools) if self._tools and route.tools else llm
+        return self.get_llm(model_name) if route.tools else LLMRegistry.get(model_name)
+
+    async def _admit(self, route: LLMRoute, index: int, estimated_tokens: int) -> bool:
+        """Check the breaker and rate limit of the route's `index`-th model before calling it."""
+        model_name = route.model_names[index]
+        breaker = self.breakers.get(model_name)
+        if not breaker.allow():
+            logger.warning("llm_circuit_open_skipping_model", model=model_name)
             return False
+        if settings.LLM_RATE_LIMIT_ENABLED:
+            # Queue briefly for quota, or move on; the last model in the route queues longer
+            is_last = index == len(route.model_names) - 1
+            max_wait = settings.LLM_RATE_LIMIT_MAX_QUEUE_WAIT if is_last else settings.LLM_RATE_LIMIT_MAX_WAIT
+            if not await self.rate_limits.get(model_name).acquire(estimated_tokens, max_wait):
+                breaker.release()
+                return False
+        return True
+
+    def _settle_rate_limit(self, response: BaseMessage, model_name: str, estimated_tokens: int) -> None:
+        """Correct the rate-limit reservation with the response's real token usage."""
+        if settings.LLM_RATE_LIMIT_ENABLED:
+            usage = getattr(response, "usage_metadata", None) or {}
+            self.rate_limits.get(model_name).settle(estimated_tokens, usage.get("total_tokens"))
+
+    def _refund_rate_limit(self, model_name: str, estimated_tokens: int) -> None:
+        """Give back the token reservation of a call that failed, timed out or was cancelled."""
+        if settings.LLM_RATE_LIMIT_ENABLED:
+            self.rate_limits.get(model_name).refund(estimated_tokens)
+
+    def _calibrate_rate_limit(self, response: BaseMessage, model_name: str) -> None:
+        """Feed x-ratelimit-* headers to the rate limiter and drop them from the message."""
+        # Headers are only needed for calibration; don't carry them into the graph state
+        headers = response.response_metadata.pop("headers", None)
+        if headers:
+            self.rate_limits.get(model_name).calibrate(headers)
+
+    def _record_usage(self, response: BaseMessage, model_name: str) -> None:
+        """Export prompt / cached-prompt token counts from the response usage metadata."""
+        usage = getattr(response, "usage_metadata", None)
+        if not usage:
+            return
+        llm_prompt_tokens_total.labels(model=model_name).inc(usage.get("input_tokens", 0))
+        cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+        if cached:
+            llm_prompt_cached_tokens_total.labels(model=model_name).inc(cached)
 
     # --------------------------------------------------
     # The Retry Decorator
@@ -167,7 +288,7 @@ class LLMService:
     # This is the magic. If the function raises specific exceptions,
     # Tenacity will wait (exponentially) and try again.
     @retry(
-        stop=stop_after_attempt(settings.MAX_LLM_CALL_RETRIES),
+        stop=stop_any(stop_after_attempt(settings.MAX_LLM_CALL_RETRIES), _stop_if_circuit_open),
         wait=wait_exponential(multiplier=1, min=2, max=10),
         retry=retry_if_exception_type((RateLimitError, APITimeoutError, APIError)),
         before_sleep=before_sleep_log(logger, "WARNING"),
@@ -175,19 +296,31 @@ class LLMService:
     )
 
     async def _call_with_retry(
-        self, messages: Union[List[BaseMessage], List[dict]]
+        self, llm: BaseChatModel, model_name: str, messages: Union[List[BaseMessage], List[dict]]
     ) -> BaseMessage:
         """Internal method that executes the actual API call."""
-        if not self._llm:
-            raise RuntimeError("llm not initialized")
-
+        breaker = self.breakers.get(model_name)
+        start = time.perf_counter()
         try:
-            response = await self._llm.ainvoke(messages)
-            logger.debug("llm_call_successful", message_count=len(messages))
+            try:
+                response = await llm.ainvoke(messages)
+            except BaseException as e:
+                # Only provider-side failures count against the model's health
+                breaker.record(False if isinstance(e, MODEL_HEALTH_ERRORS) else None, time.perf_counter() - start)
+                if isinstance(e, RateLimitError):
+                    self.rate_limits.get(model_name).throttled(e.response.headers if e.response else None)
+                raise
+            latency = time.perf_counter() - start
+            self._calibrate_rate_limit(response, model_name)
+            breaker.record(True, latency)
+            self.hedging.observe(model_name, latency)
+            self._record_usage(response, model_name)
+            logger.debug("llm_call_successful", model=model_name, message_count=len(messages))
             return response
         except (RateLimitError, APITimeoutError, APIError) as e:
             logger.warning(
                 "llm_call_failed_retrying",
+                model=model_name,
                 error_type=type(e).__name__,
                 error=str(e),
                 exc_info=True,
@@ -196,6 +329,7 @@ class LLMService:
         except OpenAIError as e:
             logger.error(
                 "llm_call_failed",
+                model=model_name,
                 error_type=type(e).__name__,
                 error=str(e),
             )
@@ -205,51 +339,81 @@ class LLMService:
         self,
         messages: List[BaseMessage],
         model_name: Optional[str] = None,
+        *,
+        hedge: bool = False,
+        priority: Priority = Priority.CHAT,
+        tools: bool = True,
         **model_kwargs,
     ) -> BaseMessage:
         """Call the LLM with the specified messages and circular fallback.
 
+        Identical calls (same primary model configuration, bound tools and messages)
+        within LLM_RESPONSE_CACHE_TTL are answered from the response cache.
+
         Args:
             messages: List of messages to send to the LLM
-            model_name: Optional specific model to use. If None, uses current model.
+            model_name: Optional specific model to use. If None, uses the default model.
+            hedge: Allow a backup request when the call is slow (needs LLM_HEDGING_ENABLED).
+                Only for non-streaming callers: both requests would emit tokens otherwise.
+            priority: Admission class; the call waits for an LLM slot of this class.
+            tools: Bind the agent's tools (False for internal calls such as summarization).
             **model_kwargs: Optional kwargs to override default model configuration
 
         Returns:
             BaseMessage response from the LLM
 
         Raises:
+            ValueError: If the requested model is not in the registry
+            LLMOverloadedError: If no LLM slot was free within the priority's queue SLO
             RuntimeError: If all models fail after retries
         """
-        # If user specifies a model, get it from registry
+        try:
+            route = self.route(model_name, tools=tools, **model_kwargs)
+        except ValueError as e:
+            logger.error("requested_model_not_found", model_name=model_name, error=str(e))
+            raise
         if model_name:
-            try:
-                self._llm = LLMRegistry.get(model_name, **model_kwargs)
-                # Update index to match the requested model
-                all_names = LLMRegistry.get_all_names()
-                try:
-                    self._current_model_index = all_names.index(model_name)
-                except ValueError:
-                    pass  # Keep current index if model name not in list
-                logger.info("using_requested_model", model_name=model_name, has_custom_kwargs=bool(model_kwargs))
-            except ValueError as e:
-                logger.error("requested_model_not_found", model_name=model_name, error=str(e))
-                raise
-
-        # Track which models we've tried to prevent infinite loops
-        total_models = len(LLMRegistry.LLMS)
-        models_tried = 0
-        starting_index = self._current_model_index
+            logger.info("using_requested_model", model_name=model_name, has_custom_kwargs=bool(model_kwargs))
+
+        # Exact-match cache, keyed on the primary model's configuration and the payload
+        cache_key = None
+        if self.response_cache.enabled:
+            cache_key = response_cache_key(self._llm_for(route, route.primary), messages)
+            cached_response = await self.response_cache.get(cache_key)
+            if cached_response is not None:
+                logger.info("llm_response_cache_hit", model=route.primary)
+                return cached_response
+
+        async with llm_dispatcher.slot(priority):
+            if hedge and settings.LLM_HEDGING_ENABLED:
+                response = await self._call_hedged(route, messages)
+            else:
+                response = await self._call_route(route, messages)
+        if cache_key is not None:
+            await self.response_cache.set(cache_key, response)
+        return response
+
+    async def _call_route(self, route: LLMRoute, messages: List[BaseMessage]) -> BaseMessage:
+        """Walk a route's models until one succeeds (fallback state is local to this call)."""
+        total_models = len(route.model_names)
         last_error = None
+        models_tried = 0
+
+        estimated_tokens = estimate_tokens(messages, settings.MAX_TOKENS)
 
-        while models_tried < total_models:
+        for index, current_model_name in enumerate(route.model_names):
+            llm = self._llm_for(route, current_model_name)
+            if not await self._admit(route, index, estimated_tokens):
+                continue
+            settled = False
             try:
-                response = await self._call_with_retry(messages)
+                response = await self._call_with_retry(llm, current_model_name, messages)
+                self._settle_rate_limit(response, current_model_name, estimated_tokens)
+                settled = True
                 return response
             except OpenAIError as e:
                 last_error = e
                 models_tried += 1
-
-                current_model_name = LLMRegistry.LLMS[self._current_model_index]["name"]
                 logger.error(
                     "llm_call_failed_after_retries",
                     model=current_model_name,
@@ -257,39 +421,238 @@ class LLMService:
                     total_models=total_models,
                     error=str(e),
                 )
+                logger.warning("switching_to_next_model", from_model=current_model_name)
+            finally:
+                # One probe slot per admitted model, however many retries it made
+                self.breakers.get(current_model_name).release()
+                if not settled:
+                    self._refund_rate_limit(current_model_name, estimated_tokens)
+
+        self._raise_all_failed(route, models_tried, last_error)
+
+    @staticmethod
+    def _raise_all_failed(route: LLMRoute, models_tried: int, last_error: Optional[Exception]) -> None:
+        logger.error("all_models_failed", models_tried=models_tried, starting_model=route.primary)
+        if models_tried == 0:
+            raise RuntimeError(
+                "failed to get response from llm: every model's circuit breaker is open or its rate limit is exhausted"
+            )
+        raise RuntimeError(
+            f"failed to get response from llm after trying {models_tried} models. last error: {str(last_error)}"
+        )
 
-                # If we've tried all models, give up
-                if models_tried >= total_models:
-                    logger.error(
-                        "all_models_failed",
-                        models_tried=models_tried,
-                        starting_model=LLMRegistry.LLMS[starting_index]["name"],
-                    )
-                    break
+    async def astream(
+        self,
+        messages: List[BaseMessage],
+        model_name: Optional[str] = None,
+        *,
+        priority: Priority = Priority.STREAM,
+        **model_kwargs,
+    ) -> AsyncIterator[BaseMessageChunk]:
+        """Stream the LLM response chunk by chunk, with retries and fallback before the first chunk.
 
-                # Switch to next model in circular fashion
-                if not self._switch_to_next_model():
-                    logger.error("failed_to_switch_to_next_model")
-                    break
+        Until a model has produced its first chunk, failures are retried (same policy
+        as `call`) and then fail over along the route. Once chunks have been emitted
+        the caller has seen part of an answer, so a failure is raised instead.
 
-                # Continue loop to try next model
+        Args:
+            messages: List of messages to send to the LLM
+            model_name: Optional specific model to use. If None, uses the default model.
+            priority: Admission class; the call waits for an LLM slot of this class.
+            **model_kwargs: Optional kwargs to override default model configuration
 
-        # All models failed
-        raise RuntimeError(
-            f"failed to get response from llm after trying {models_tried} models. last error: {str(last_error)}"
-        )
+        Yields:
+            BaseMessageChunk: Response chunks (a single chunk on a response cache hit).
 
-    def get_llm(self) -> BaseChatModel:
-        return self._llm
-    
+        Raises:
+            ValueError: If the requested model is not in the registry
+            LLMOverloadedError: If no LLM slot was free within the priority's queue SLO
+            RuntimeError: If all models fail before streaming
+        """
+        route = self.route(model_name, **model_kwargs)
+        cache_key = None
+        if self.response_cache.enabled:
+            cache_key = response_cache_key(self._llm_for(route, route.primary), messages)
+            cached_response = await self.response_cache.get(cache_key)
+            if cached_response is not None:
+                logger.info("llm_response_cache_hit", model=route.primary, streaming=True)
+                yield _as_chunk(cached_response)
+                return
+
+        estimated_tokens = estimate_tokens(messages, settings.MAX_TOKENS)
+        last_error = None
+        models_tried = 0
+        async with llm_dispatcher.slot(priority):
+            start = time.perf_counter()
+            for index, current_model_name in enumerate(route.model_names):
+                if not await self._admit(route, index, estimated_tokens):
+                    continue
+                llm = self._llm_for(route, current_model_name)
+                breaker = self.breakers.get(current_model_name)
+                models_tried += 1
+                settled = False
+                try:
+                    for attempt in range(1, settings.MAX_LLM_CALL_RETRIES + 1):
+                        attempt_start = time.perf_counter()
+                        response = None
+                        try:
+                            async for chunk in llm.astream(messages):
+                                headers = chunk.response_metadata.pop("headers", None)
+                                if headers:
+                                    self.rate_limits.get(current_model_name).calibrate(headers)
+                                if response is None:
+                                    llm_time_to_first_token_seconds.labels(model=current_model_name).observe(
+                                        time.perf_counter() - start
+                                    )
+                                response = chunk if response is None else response + chunk
+                                yield chunk
+                        except BaseException as e:
+                            health = False if isinstance(e, MODEL_HEALTH_ERRORS) else None
+                            breaker.record(health, time.perf_counter() - attempt_start)
+                            if isinstance(e, RateLimitError):
+                                self.rate_limits.get(current_model_name).throttled(
+                                    e.response.headers if e.response else None
+                                )
+                            if response is not None or not isinstance(e, OpenAIError):
+                                # Part of the answer is out (or we were cancelled): no failover possible
+                                raise
+                            last_error = e
+                            retryable = isinstance(e, (RateLimitError, APITimeoutError, APIError))
+                            if not retryable or attempt == settings.MAX_LLM_CALL_RETRIES or breaker.is_open:
+                                logger.error(
+                                    "llm_stream_failed_before_first_chunk",
+                                    model=current_model_name,
+                                    attempt=attempt,
+                                    error_type=type(e).__name__,
+                                    error=str(e),
+                                )
+                                break
+                            logger.warning(
+                                "llm_stream_failed_retrying",
+                                model=current_model_name,
+                                attempt=attempt,
+                                error_type=type(e).__name__,
+                                error=str(e),
+                            )
+                            # Same backoff as the non-streaming retry decorator
+                            await asyncio.sleep(min(max(2 ** (attempt - 1), 2), 10))
+                            continue
+
+                        breaker.record(True, time.perf_counter() - attempt_start)
+                        if response is None:
+                            # Consumers always get at least one chunk
+                            response = AIMessageChunk(content="")
+                            yield response
+                        response = message_chunk_to_message(response)
+                        self._record_usage(response, current_model_name)
+                        self._settle_rate_limit(response, current_model_name, estimated_tokens)
+                        settled = True
+                        if cache_key is not None:
+                            await self.response_cache.set(cache_key, response)
+                        logger.debug("llm_stream_successful", model=current_model_name, message_count=len(messages))
+                        return
+                finally:
+                    breaker.release()
+                    if not settled:
+                        self._refund_rate_limit(current_model_name, estimated_tokens)
+                logger.warning("switching_to_next_model", from_model=current_model_name)
+
+        self._raise_all_failed(route, models_tried, last_error)
+
+    async def call_stream(
+        self,
+        messages: List[BaseMessage],
+        model_name: Optional[str] = None,
+        *,
+        priority: Priority = Priority.STREAM,
+        **model_kwargs,
+    ) -> BaseMessage:
+        """Streamed counterpart of `call`: consume `astream` and return the complete message.
+
+        Chunks reach streaming consumers (e.g. LangGraph's "messages" stream mode)
+        through the callbacks of the surrounding run as they arrive.
+        """
+        response = None
+        async for chunk in self.astream(messages, model_name, priority=priority, **model_kwargs):
+            response = chunk if response is None else response + chunk
+        return message_chunk_to_message(response)
+
+    async def _call_hedged(self, route: LLMRoute, messages: List[BaseMessage]) -> BaseMessage:
+        """Run the route, and race a backup request if it outlives the model's latency percentile.
+
+        The first successful response wins and the other request is cancelled. If the
+        hedge budget is exhausted, or there is not enough latency data yet, this is a
+        plain `_call_route`.
+        """
+        self.hedging.earn()
+        delay = self.hedging.delay(route.primary)
+        if delay is None:
+            return await self._call_route(route, messages)
+
+        primary = asyncio.create_task(self._call_route(route, messages))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+            if not self.hedging.try_spend():
+                llm_hedged_requests_total.labels(model=route.primary, outcome="budget_exhausted").inc()
+                return await primary
+
+            hedge_route = route
+            if settings.LLM_HEDGE_TARGET == "fallback" and len(route.model_names) > 1:
+                # Same tool binding and model kwargs, starting from the next model
+                hedge_route = replace(route, model_names=route.model_names[1:] + route.model_names[:1])
+            logger.info("llm_hedge_fired", model=route.primary, hedge_model=hedge_route.primary, delay=round(delay, 3))
+            hedge = asyncio.create_task(self._call_route(hedge_route, messages))
+            tasks.add(hedge)
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        outcome = "primary_won" if task is primary else "hedge_won"
+                        llm_hedged_requests_total.labels(model=route.primary, outcome=outcome).inc()
+                        return task.result()
+            # Both failed: surface the primary's error
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def get_llm(self, model_name: Optional[str] = None) -> BaseChatModel:
+        """Return the (tool-bound, if tools were bound) instance of a registry model."""
+        model_name = model_name or self.default_model
+        llm = self._bound_llms.get(model_name)
+        if llm is None:
+            llm = LLMRegistry.get(model_name)
+            if self._tools:
+                llm = self._bound_llms[model_name] = llm.bind_tools(self._tools)
+        return llm
 
     def bind_tools(self, tools: List) -> "LLMService":
-        """Bind tools to the current LLM instance."""
-        if self._llm:
-            self._llm = self._llm.bind_tools(tools)
-            logger.debug("tools_bound_to_llm", tool_count=len(tools))
+        """Bind tools to every registry model; each model is bound on first use and shared by all calls."""
+        self._tools = list(tools)
+        self._bound_llms = {}
+        logger.debug("tools_bound_to_llm", tool_count=len(self._tools))
         return self
 
 
+def _as_chunk(message: BaseMessage) -> AIMessageChunk:
+    """Replay a complete (cached) AI message as a single stream chunk."""
+    return AIMessageChunk(
+        content=message.content,
+        additional_kwargs=message.additional_kwargs,
+        response_metadata=message.response_metadata,
+        tool_call_chunks=[
+            {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+            for index, call in enumerate(getattr(message, "tool_calls", None) or [])
+        ],
+        usage_metadata=getattr(message, "usage_metadata", None),
+    )
+
+
 # Create global instance
-llm_service = LLMService()  
\ No newline at end of file
+llm_service = LLMService()
@@ -0,0 +1,155 @@
+"""Priority-aware admission control for LLM work.
+
+Every LLM call (and every background job that makes LLM calls, such as mem0 fact
+extraction) takes a slot from the dispatcher first. Slots are bounded globally
+(LLM_MAX_CONCURRENCY) and per priority class (LLM_CONCURRENCY_<CLASS>); when slots
+are short, waiting work is admitted in priority order: interactive streams, then
+synchronous chat, then background work.
+
+A caller that waits longer than its class's queue SLO (LLM_QUEUE_SLO_<CLASS>, 0 =
+never shed) is rejected with LLMOverloadedError, which the API turns into a 503
+with Retry-After instead of letting the request time out.
+"""
+
+import asyncio
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import (
+    AsyncIterator,
+    Dict,
+    List,
+    Tuple,
+)
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.core.metrics import (
+    llm_dispatcher_active,
+    llm_dispatcher_queue_wait_seconds,
+    llm_dispatcher_shed_total,
+)
+
+logger = get_logger(__name__)
+
+
+class Priority(IntEnum):
+    """LLM work classes; lower values are admitted first."""
+
+    STREAM = 0  # /chat/stream: a user is watching tokens arrive
+    CHAT = 1  # /chat: a user is waiting for the full answer
+    BACKGROUND = 2  # long-term memory extraction, evals
+
+
+class LLMOverloadedError(RuntimeError):
+    """The request waited longer than its queue SLO for an LLM slot."""
+
+    def __init__(self, priority: Priority, retry_after: float):
+        super().__init__(f"LLM capacity exhausted for {priority.name.lower()} work; retry in {retry_after:g}s")
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+class LLMDispatcher:
+    """Bounded slots with strict-priority, first-come-first-served admission.
+
+    Not thread-safe: meant to be used from the event loop only.
+    """
+
+    def __init__(self):
+        """Initialize the dispatcher from the LLM_MAX_CONCURRENCY / LLM_CONCURRENCY_* / LLM_QUEUE_SLO_* settings."""
+        self.max_concurrency = settings.LLM_MAX_CONCURRENCY
+        self.class_limits: Dict[Priority, int] = {
+            priority: settings.LLM_CONCURRENCY_LIMITS.get(priority.name.lower(), self.max_concurrency)
+            for priority in Priority
+        }
+        self.queue_slos: Dict[Priority, float] = {
+            priority: settings.LLM_QUEUE_SLOS.get(priority.name.lower(), 0.0) for priority in Priority
+        }
+        self._active: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self._waiters: List[Tuple[Priority, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def active(self) -> int:
+        return sum(self._active.values())
+
+    def _has_capacity(self, priority: Priority) -> bool:
+        return self.active < self.max_concurrency and self._active[priority] < self.class_limits[priority]
+
+    def _take(self, priority: Priority) -> None:
+        self._active[priority] += 1
+        llm_dispatcher_active.labels(priority=priority.name.lower()).set(self._active[priority])
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        """Hold an LLM slot for the duration of the block.
+
+        Raises:
+            LLMOverloadedError: If no slot was granted within the class's queue SLO.
+        """
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._active[priority] -= 1
+            llm_dispatcher_active.labels(priority=priority.name.lower()).set(self._active[priority])
+            self._grant()
+
+    async def _acquire(self, priority: Priority) -> None:
+        label = priority.name.lower()
+        # Don't overtake queued work of the same or a higher priority
+        if self._has_capacity(priority) and not any(waiter[0] <= priority for waiter in self._waiters):
+            self._take(priority)
+            llm_dispatcher_queue_wait_seconds.labels(priority=label).observe(0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((priority, next(self._sequence), future))
+        self._waiters.sort(key=lambda waiter: waiter[:2])
+        start = time.perf_counter()
+        slo = self.queue_slos[priority]
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=slo or None)
+        except asyncio.TimeoutError:
+            if self._remove(future):
+                llm_dispatcher_shed_total.labels(priority=label).inc()
+                logger.warning("llm_request_shed", priority=label, queue_slo_seconds=slo, queued=len(self._waiters))
+                raise LLMOverloadedError(priority, retry_after=float(max(math.ceil(slo), 1)))
+            # Granted just as the SLO expired: keep the slot
+        except BaseException:
+            # Cancelled while queued: give back a slot granted in the meantime
+            if not self._remove(future):
+                self._active[priority] -= 1
+                llm_dispatcher_active.labels(priority=label).set(self._active[priority])
+                self._grant()
+            raise
+        llm_dispatcher_queue_wait_seconds.labels(priority=label).observe(time.perf_counter() - start)
+
+    def _remove(self, future: asyncio.Future) -> bool:
+        """Drop a waiter that gave up; False if it was already granted a slot."""
+        for index, waiter in enumerate(self._waiters):
+            if waiter[2] is future:
+                del self._waiters[index]
+                future.cancel()
+                return True
+        return False
+
+    def _grant(self) -> None:
+        """Admit waiters in priority order while slots are free."""
+        index = 0
+        while index < len(self._waiters) and self.active < self.max_concurrency:
+            priority, _, future = self._waiters[index]
+            if self._active[priority] < self.class_limits[priority]:
+                del self._waiters[index]
+                self._take(priority)
+                future.set_result(None)
+            else:
+                # Class is at its own limit: let lower classes use the free slot
+                index += 1
+
+
+# Create singleton and export as llm_dispatcher for service usage
+llm_dispatcher = LLMDispatcher()
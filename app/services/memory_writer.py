@@ -0,0 +1,251 @@
+"""Background writer that batches long-term memory updates.
+
+Every chat turn used to fire an untracked `asyncio.create_task(memory.add(...))`
+with the whole conversation, making mem0 re-extract facts from the full history.
+This writer puts turns on a bounded queue, coalesces the turns of one user into a
+single `memory.add` after a short debounce, and only sends the messages that were
+not ingested by a previous flush. Ingested messages are tracked by id, so threads
+whose older messages were folded into a summary or cleared stay consistent.
+"""
+
+import asyncio
+import time
+from contextlib import suppress
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from langchain_core.messages import (
+    BaseMessage,
+    convert_to_openai_messages,
+)
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.core.metrics import (
+    memory_writer_dropped_total,
+    memory_writer_flushes_total,
+    memory_writer_queue_depth,
+)
+from app.services.llm_dispatcher import (
+    Priority,
+    llm_dispatcher,
+)
+from app.utils.cache import TTLCache
+
+if TYPE_CHECKING:
+    from mem0 import AsyncMemory
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _MemoryJob:
+    """One finished chat turn waiting to be ingested."""
+
+    user_id: str
+    session_id: str
+    messages: List[Tuple[Optional[str], dict]]
+    metadata: Optional[dict]
+
+
+@dataclass
+class _PendingUser:
+    """Coalesced turns for one user, keyed by session (latest snapshot wins)."""
+
+    due_at: float
+    sessions: Dict[str, List[Tuple[Optional[str], dict]]] = field(default_factory=dict)
+    metadata: Optional[dict] = None
+
+
+class MemoryWriter:
+    """Bounded, debounced ingestion queue in front of mem0's `memory.add`.
+
+    Call `submit()` from request handlers (never blocks), and `drain()` on shutdown.
+    """
+
+    def __init__(self, memory_factory: Callable[[], Awaitable["AsyncMemory"]]):
+        """Initialize the writer.
+
+        Args:
+            memory_factory: Coroutine function returning the (lazily built) mem0 instance.
+        """
+        self._memory_factory = memory_factory
+        self._queue: asyncio.Queue[_MemoryJob] = asyncio.Queue(maxsize=settings.LONG_TERM_MEMORY_QUEUE_SIZE)
+        self._pending: Dict[str, _PendingUser] = {}
+        self._in_flight: Set[str] = set()
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._flush_slots = asyncio.Semaphore(settings.LONG_TERM_MEMORY_WRITER_CONCURRENCY)
+        # session_id -> ids of the thread's current messages already sent to mem0
+        self._flushed_ids: TTLCache[str, Set[str]] = TTLCache(
+            "memory_flushed_ids", maxsize=settings.LONG_TERM_MEMORY_TRACKED_SESSIONS, ttl=24 * 3600
+        )
+        self._worker: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def submit(
+        self, user_id: str, session_id: str, messages: Sequence[BaseMessage], metadata: Optional[dict] = None
+    ) -> bool:
+        """Queue a finished turn for ingestion without waiting.
+
+        Args:
+            user_id: The user whose memory is updated.
+            session_id: The conversation the messages belong to.
+            messages: The thread's current messages.
+            metadata: Optional metadata passed through to mem0.
+
+        Returns:
+            bool: False if the turn was dropped (queue full or shutting down).
+        """
+        if self._closing:
+            memory_writer_dropped_total.labels(reason="shutdown").inc()
+            return False
+        self._ensure_worker()
+        snapshot = [(message.id, convert_to_openai_messages(message)) for message in messages]
+        try:
+            self._queue.put_nowait(_MemoryJob(str(user_id), session_id, snapshot, metadata))
+        except asyncio.QueueFull:
+            memory_writer_dropped_total.labels(reason="queue_full").inc()
+            logger.warning("long_term_memory_queue_full", user_id=user_id, queue_size=self._queue.maxsize)
+            return False
+        memory_writer_queue_depth.set(self._queue.qsize())
+        return True
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting turns, flush everything pending and stop the worker.
+
+        Args:
+            timeout: Max seconds to wait; defaults to LONG_TERM_MEMORY_DRAIN_TIMEOUT.
+        """
+        self._closing = True
+        if self._worker is None:
+            return
+        timeout = settings.LONG_TERM_MEMORY_DRAIN_TIMEOUT if timeout is None else timeout
+        try:
+            await asyncio.wait_for(self._drain(), timeout=timeout)
+            logger.info("long_term_memory_writer_drained")
+        except asyncio.TimeoutError:
+            dropped = self._queue.qsize() + len(self._pending)
+            memory_writer_dropped_total.labels(reason="shutdown").inc(dropped)
+            logger.warning("long_term_memory_drain_timeout", timeout_seconds=timeout, dropped=dropped)
+        finally:
+            self._worker.cancel()
+            for task in list(self._flush_tasks):
+                task.cancel()
+            self._worker = None
+
+    async def _drain(self) -> None:
+        """Merge the remaining queue, then flush every user immediately."""
+        # Stop the worker first so a turn it already took off the queue is merged, not lost
+        self._worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._worker
+        while not self._queue.empty():
+            self._merge(self._queue.get_nowait())
+        memory_writer_queue_depth.set(0)
+        while self._pending or self._flush_tasks:
+            for user_id in list(self._pending):
+                if user_id not in self._in_flight:
+                    self._start_flush(user_id)
+            if self._flush_tasks:
+                await asyncio.wait(set(self._flush_tasks), return_when=asyncio.FIRST_COMPLETED)
+
+    def _ensure_worker(self) -> None:
+        """Start the background worker on first use (in the running loop)."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Worker loop: merge incoming turns and flush users whose debounce elapsed."""
+        get_job: Optional[asyncio.Task] = None
+        try:
+            while True:
+                now = time.monotonic()
+                due = [user_id for user_id, pending in self._pending.items() if pending.due_at <= now]
+                for user_id in due:
+                    if user_id not in self._in_flight:
+                        self._start_flush(user_id)
+
+                # Users still flushing a previous batch wait for that flush, not for a timer
+                next_due = min(
+                    (pending.due_at for user_id, pending in self._pending.items() if user_id not in self._in_flight),
+                    default=None,
+                )
+                timeout = None if next_due is None else max(next_due - time.monotonic(), 0)
+                if get_job is None:
+                    get_job = asyncio.create_task(self._queue.get())
+                waiters = {get_job, *self._flush_tasks} if self._pending else {get_job}
+                await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if get_job.done():
+                    self._merge(get_job.result())
+                    get_job = None
+                    memory_writer_queue_depth.set(self._queue.qsize())
+        finally:
+            if get_job is not None:
+                if get_job.done() and not get_job.cancelled():
+                    self._merge(get_job.result())
+                else:
+                    get_job.cancel()
+
+    def _merge(self, job: _MemoryJob) -> None:
+        """Coalesce a turn into its user's pending batch."""
+        pending = self._pending.get(job.user_id)
+        if pending is None:
+            pending = _PendingUser(due_at=time.monotonic() + settings.LONG_TERM_MEMORY_FLUSH_DELAY)
+            self._pending[job.user_id] = pending
+        # Each snapshot contains the previous ones for the same session
+        pending.sessions[job.session_id] = job.messages
+        pending.metadata = job.metadata
+
+    def _start_flush(self, user_id: str) -> None:
+        """Detach a user's pending batch and flush it in a tracked task."""
+        pending = self._pending.pop(user_id)
+        self._in_flight.add(user_id)
+        task = asyncio.create_task(self._flush(user_id, pending))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, user_id: str, pending: _PendingUser) -> None:
+        """Send only the not-yet-ingested messages of every pending session in one `memory.add`."""
+        try:
+            batch: List[dict] = []
+            flushed: Dict[str, Set[str]] = {}
+            for session_id, messages in pending.sessions.items():
+                conversation = [
+                    (message_id, m)
+                    for message_id, m in messages
+                    if m.get("role") in ("user", "assistant") and m.get("content")
+                ]
+                sent = self._flushed_ids.get(session_id) or set()
+                batch.extend(m for message_id, m in conversation if message_id is None or message_id not in sent)
+                # Only ids still in the thread: folded or cleared messages drop out of the set
+                flushed[session_id] = {message_id for message_id, _ in conversation if message_id is not None}
+
+            if not batch:
+                return
+
+            # mem0 extracts facts with LLM calls: admit them as background work
+            async with self._flush_slots, llm_dispatcher.slot(Priority.BACKGROUND):
+                memory = await self._memory_factory()
+                await memory.add(batch, user_id=user_id, metadata=pending.metadata)
+            for session_id, message_ids in flushed.items():
+                self._flushed_ids.set(session_id, message_ids)
+            memory_writer_flushes_total.labels(status="success").inc()
+            logger.info("long_term_memory_updated_successfully", user_id=user_id, message_count=len(batch))
+        except Exception as e:
+            memory_writer_flushes_total.labels(status="error").inc()
+            logger.exception("failed_to_update_long_term_memory", user_id=user_id, error=str(e))
+        finally:
+            self._in_flight.discard(user_id)
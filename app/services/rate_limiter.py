@@ -0,0 +1,203 @@
+"""Client-side token buckets for provider RPM/TPM quotas.
+
+Each model gets two buckets, one for requests per minute and one for tokens per
+minute. A call reserves one request plus its estimated tokens (prompt estimate +
+max completion tokens, which is how providers count against TPM). If the
+reservation needs more than LLM_RATE_LIMIT_MAX_WAIT seconds of refill, the caller
+routes to another model instead of queueing, so we stop spending requests on 429s.
+
+Limits come from LLM_RPM_LIMIT / LLM_TPM_LIMIT (per model: LLM_RPM_LIMIT_<MODEL>,
+with "-" and "." written as "_") and are recalibrated from the provider's
+x-ratelimit-* response headers; a model with no known limit is not throttled.
+"""
+
+import asyncio
+import json
+import re
+import time
+from typing import (
+    Any,
+    Dict,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.core.metrics import (
+    llm_rate_limit_decisions_total,
+    llm_rate_limit_wait_seconds,
+)
+
+logger = get_logger(__name__)
+
+# Rough prompt-size estimate; exact counting would re-encode the whole prompt on every call
+CHARS_PER_TOKEN = 4
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse an x-ratelimit-reset-* value such as "6m0s", "1.5s" or "20ms" into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        parts = _DURATION_PART.findall(value)
+        return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts) if parts else None
+
+
+def estimate_tokens(messages: Sequence[Any], max_tokens: Optional[int]) -> int:
+    """Estimate the TPM cost of a call: prompt characters / CHARS_PER_TOKEN plus max completion tokens."""
+    chars = len(json.dumps(messages, default=str))
+    return chars // CHARS_PER_TOKEN + (max_tokens or 0)
+
+
+def _model_key(model_name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "_", model_name.lower())
+
+
+class TokenBucket:
+    """Bucket refilled continuously at `limit` units per minute, up to `limit`.
+
+    Reservations may drive the level negative: later callers then wait behind
+    earlier ones, which keeps queueing roughly first come, first served.
+    """
+
+    def __init__(self, limit: Optional[float] = None):
+        self.limit = limit
+        self.level = limit or 0.0
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return (self.limit or 0.0) / 60.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.limit:
+            self.level = min(self.level + (now - self._updated) * self.rate, self.limit)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds of refill needed before `amount` can be taken (0 when unlimited)."""
+        self._refill()
+        if not self.limit or self.level >= amount:
+            return 0.0
+        # A single call larger than the whole bucket only needs the bucket to be full
+        return (min(amount, self.limit) - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        if self.limit:
+            self.level -= amount
+
+    def calibrate(self, limit: Optional[float], remaining: Optional[float], reset: Optional[float]) -> None:
+        """Align with the provider's view: its limit, and what it says is left."""
+        self._refill()
+        if limit:
+            if not self.limit:
+                self.level = limit
+            self.limit = limit
+        if self.limit and remaining is not None:
+            self.level = min(self.level, remaining)
+        if self.limit and reset and remaining is not None and remaining <= 0:
+            # Exhausted: nothing is available until the provider's reset time
+            self.level = min(self.level, -reset * self.rate)
+
+
+class ModelRateLimiter:
+    """Request and token buckets for one model."""
+
+    def __init__(self, name: str):
+        """Initialize the buckets from LLM_RPM_LIMIT / LLM_TPM_LIMIT and their per-model overrides."""
+        self.name = name
+        key = _model_key(name)
+        rpm = settings.LLM_RPM_LIMITS.get(key, settings.LLM_RPM_LIMIT)
+        tpm = settings.LLM_TPM_LIMITS.get(key, settings.LLM_TPM_LIMIT)
+        self.requests = TokenBucket(rpm or None)
+        self.tokens = TokenBucket(tpm or None)
+        self._throttled_until = 0.0
+
+    async def acquire(self, tokens: int, max_wait: float) -> bool:
+        """Reserve one request and `tokens` tokens, waiting at most `max_wait` seconds.
+
+        Returns:
+            bool: False (and nothing reserved) if the quota would take longer to refill.
+        """
+        wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+        if wait > max_wait:
+            llm_rate_limit_decisions_total.labels(model=self.name, decision="rerouted").inc()
+            logger.info("llm_rate_limit_reroute", model=self.name, wait_seconds=round(wait, 3))
+            return False
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        if wait > 0:
+            llm_rate_limit_decisions_total.labels(model=self.name, decision="queued").inc()
+            llm_rate_limit_wait_seconds.labels(model=self.name).observe(wait)
+            await asyncio.sleep(wait)
+        return True
+
+    def settle(self, estimated: int, actual: Optional[int]) -> None:
+        """Correct a reservation once the real token usage is known."""
+        if actual is not None:
+            self.tokens.take(actual - estimated)
+
+    def refund(self, estimated: int) -> None:
+        """Give back the tokens of a reservation whose call failed or was cancelled.
+
+        The request itself stays spent (the provider saw it). Nothing is given back
+        while a 429 throttle is in force: the provider's view of the quota wins.
+        """
+        if time.monotonic() >= self._throttled_until:
+            self.settle(estimated, 0)
+
+    def calibrate(self, headers: Mapping[str, str]) -> None:
+        """Update limits and remaining quota from x-ratelimit-* response headers."""
+        headers = {k.lower(): v for k, v in headers.items()}
+
+        def number(name: str) -> Optional[float]:
+            try:
+                return float(headers[name]) if name in headers else None
+            except ValueError:
+                return None
+
+        self.requests.calibrate(
+            number("x-ratelimit-limit-requests"),
+            number("x-ratelimit-remaining-requests"),
+            parse_reset(headers.get("x-ratelimit-reset-requests")),
+        )
+        self.tokens.calibrate(
+            number("x-ratelimit-limit-tokens"),
+            number("x-ratelimit-remaining-tokens"),
+            parse_reset(headers.get("x-ratelimit-reset-tokens")),
+        )
+
+    def throttled(self, headers: Optional[Mapping[str, str]]) -> None:
+        """The provider returned 429: stop sending until its retry-after (or reset) time."""
+        llm_rate_limit_decisions_total.labels(model=self.name, decision="throttled").inc()
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self.calibrate(headers)
+        retry_after = parse_reset(headers.get("retry-after"))
+        pause = retry_after or parse_reset(headers.get("x-ratelimit-reset-tokens")) or 0.0
+        self._throttled_until = time.monotonic() + pause
+        if retry_after:
+            for bucket in (self.requests, self.tokens):
+                if bucket.limit:
+                    bucket.take(bucket.level + retry_after * bucket.rate)
+
+
+class RateLimiterRegistry:
+    """One limiter per model, created on first use."""
+
+    def __init__(self):
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+
+    def get(self, model_name: str) -> ModelRateLimiter:
+        limiter = self._limiters.get(model_name)
+        if limiter is None:
+            limiter = self._limiters[model_name] = ModelRateLimiter(model_name)
+        return limiter
@@ -0,0 +1,182 @@
+"""Exact-match cache of LLM responses.
+
+Responses are content-addressed by the effective model configuration (model,
+temperature and other sampling parameters, bound tools) and the exact, already
+trimmed message payload, so a retried request that reaches the model with the same
+prompt reuses the earlier completion instead of paying for it again.
+
+Tiers: an in-process LRU (LLM_RESPONSE_CACHE_BACKEND=memory), backed by a Postgres
+table shared by all workers when LLM_RESPONSE_CACHE_BACKEND=postgres. Off by default
+(LLM_RESPONSE_CACHE_BACKEND=none): the key is not scoped to a user or session, so any
+caller sending the same prompt within the TTL gets the same completion.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+)
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    BaseMessage,
+    message_to_dict,
+    messages_from_dict,
+)
+from psycopg.types.json import Jsonb
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.core.metrics import cache_lookups_total
+from app.services.connection_pool import pool_manager
+from app.utils.cache import TTLCache
+
+logger = get_logger(__name__)
+
+CACHE_LABEL = "llm_response"
+POSTGRES_CACHE_LABEL = "llm_response:postgres"
+
+# Model attributes that change the completion for the same prompt
+_MODEL_PARAMS = (
+    "model_name",
+    "temperature",
+    "max_tokens",
+    "top_p",
+    "presence_penalty",
+    "frequency_penalty",
+    "reasoning_effort",
+    "model_kwargs",
+)
+
+
+def model_fingerprint(llm: BaseChatModel) -> Dict[str, Any]:
+    """Describe the effective configuration of a (possibly tool-bound) model instance."""
+    # bind_tools returns a RunnableBinding: tools live in .kwargs, the model in .bound
+    model = getattr(llm, "bound", llm)
+    fingerprint = {param: getattr(model, param, None) for param in _MODEL_PARAMS}
+    fingerprint["bound"] = getattr(llm, "kwargs", None) or {}
+    return fingerprint
+
+
+def response_cache_key(llm: BaseChatModel, messages: List[Any]) -> str:
+    """Stable hash of a model configuration and the exact message payload sent to it."""
+    payload = json.dumps(
+        [model_fingerprint(llm), [message_to_dict(m) if isinstance(m, BaseMessage) else m for m in messages]],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """Two-tier response store; Postgres errors are logged and treated as misses."""
+
+    PRUNE_EVERY = 100
+
+    def __init__(self):
+        """Initialize the cache from the LLM_RESPONSE_CACHE_* settings."""
+        self.backend = settings.LLM_RESPONSE_CACHE_BACKEND
+        self.ttl = settings.LLM_RESPONSE_CACHE_TTL
+        self.maxsize = settings.LLM_RESPONSE_CACHE_MAX_SIZE
+        self._memory: TTLCache[str, Dict[str, Any]] = TTLCache(CACHE_LABEL, maxsize=self.maxsize, ttl=self.ttl)
+        self._setup_lock = asyncio.Lock()
+        self._table_ready = False
+        self._writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend in ("memory", "postgres") and self.ttl > 0 and self.maxsize > 0
+
+    async def get(self, key: str) -> Optional[BaseMessage]:
+        """Return a copy of the cached response, or None on a miss."""
+        data = self._memory.get(key)
+        if data is None and self.backend == "postgres":
+            data = await self._db_get(key)
+            if data is not None:
+                self._memory.set(key, data)
+        if data is None:
+            return None
+        response = messages_from_dict([data])[0]
+        # A fresh id, so the graph appends the replayed message instead of replacing an earlier one
+        response.id = None
+        return response
+
+    async def set(self, key: str, response: BaseMessage) -> None:
+        """Store a response in every configured tier."""
+        data = message_to_dict(response)
+        self._memory.set(key, data)
+        if self.backend == "postgres":
+            await self._db_set(key, data)
+
+    # --------------------------------------------------
+    # Postgres tier
+    # --------------------------------------------------
+    async def _ensure_table(self) -> None:
+        """Create the cache table once per process."""
+        if self._table_ready:
+            return
+        async with self._setup_lock:
+            if self._table_ready:
+                return
+            async with pool_manager.connection("cache") as conn:
+                await conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS llm_response_cache (
+                        key TEXT PRIMARY KEY,
+                        value JSONB NOT NULL,
+                        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                        expires_at TIMESTAMPTZ NOT NULL
+                    )
+                    """
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS llm_response_cache_created_idx ON llm_response_cache (created_at)"
+                )
+            self._table_ready = True
+
+    async def _db_get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = None
+        try:
+            await self._ensure_table()
+            async with pool_manager.connection("cache") as conn:
+                cursor = await conn.execute(
+                    "SELECT value FROM llm_response_cache WHERE key = %s AND expires_at > now()", (key,)
+                )
+                row = await cursor.fetchone()
+            value = row[0] if row else None
+        except Exception as e:
+            logger.warning("llm_response_cache_read_failed", error=str(e))
+        cache_lookups_total.labels(cache=POSTGRES_CACHE_LABEL, result="miss" if value is None else "hit").inc()
+        return value
+
+    async def _db_set(self, key: str, data: Dict[str, Any]) -> None:
+        try:
+            await self._ensure_table()
+            async with pool_manager.connection("cache") as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO llm_response_cache (key, value, expires_at)
+                    VALUES (%s, %s, now() + make_interval(secs => %s))
+                    ON CONFLICT (key) DO UPDATE
+                    SET value = EXCLUDED.value, created_at = now(), expires_at = EXCLUDED.expires_at
+                    """,
+                    (key, Jsonb(data), self.ttl),
+                )
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    await conn.execute(
+                        """
+                        DELETE FROM llm_response_cache
+                        WHERE expires_at <= now() OR key IN (
+                            SELECT key FROM llm_response_cache ORDER BY created_at DESC OFFSET %s
+                        )
+                        """,
+                        (self.maxsize,),
+                    )
+        except Exception as e:
+            logger.warning("llm_response_cache_write_failed", error=str(e))
@@ -0,0 +1,275 @@
+"""Semantic response cache for near-duplicate chat questions.
+
+The normalized final user message is embedded and matched (cosine similarity >=
+SEMANTIC_CACHE_THRESHOLD) against earlier answers stored under the same scope
+(per user by default) and the same prompt hash (model + rendered system prompt),
+so an answer is never reused across tenants, models or prompt versions.
+
+Backends: "local" keeps a small per-scope index in process; "postgres" stores
+entries in a pgvector table shared by all workers. Deciding *whether* a turn is
+cacheable (no tool results, no user memory) is up to the caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+)
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+)
+
+from app.core.config import settings
+from app.core.config.logging import get_logger
+from app.core.metrics import cache_lookups_total
+from app.services.connection_pool import pool_manager
+from app.utils.cache import TTLCache
+
+if TYPE_CHECKING:
+    # Imported on first use: the cache is opt-in and both are slow to import
+    import numpy as np
+    from langchain_openai import OpenAIEmbeddings
+
+logger = get_logger(__name__)
+
+CACHE_LABEL = "semantic"
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different questions embed the same."""
+    return " ".join(text.lower().split())
+
+
+# ==================================================
+# Vector Indexes
+# ==================================================
+class SemanticIndex(Protocol):
+    """Nearest-neighbour store of (embedding -> answer) per scope and prompt hash."""
+
+    async def search(self, scope: str, prompt_hash: str, embedding: np.ndarray) -> Optional[Tuple[float, str]]: ...
+
+    async def add(self, scope: str, prompt_hash: str, embedding: np.ndarray, answer: str) -> None: ...
+
+
+class LocalSemanticIndex:
+    """In-process index: per scope, a bounded list of unit vectors scanned with one matrix product.
+
+    Scopes are evicted least-recently-used beyond SEMANTIC_CACHE_MAX_SCOPES; entries
+    within a scope oldest-first beyond SEMANTIC_CACHE_MAX_ENTRIES, or when expired.
+    """
+
+    def __init__(self):
+        # scope -> list of (expires_at, prompt_hash, unit_embedding, answer)
+        self._scopes: OrderedDict[str, List[Tuple[float, str, np.ndarray, str]]] = OrderedDict()
+
+    async def search(self, scope: str, prompt_hash: str, embedding: np.ndarray) -> Optional[Tuple[float, str]]:
+        entries = self._scopes.get(scope)
+        if not entries:
+            return None
+        self._scopes.move_to_end(scope)
+        now = time.monotonic()
+        entries[:] = [entry for entry in entries if entry[0] > now]
+        candidates = [entry for entry in entries if entry[1] == prompt_hash]
+        if not candidates:
+            return None
+        import numpy as np
+
+        similarities = np.stack([entry[2] for entry in candidates]) @ embedding
+        best = int(np.argmax(similarities))
+        return float(similarities[best]), candidates[best][3]
+
+    async def add(self, scope: str, prompt_hash: str, embedding: np.ndarray, answer: str) -> None:
+        entries = self._scopes.setdefault(scope, [])
+        self._scopes.move_to_end(scope)
+        entries.append((time.monotonic() + settings.SEMANTIC_CACHE_TTL, prompt_hash, embedding, answer))
+        del entries[: -settings.SEMANTIC_CACHE_MAX_ENTRIES]
+        while len(self._scopes) > settings.SEMANTIC_CACHE_MAX_SCOPES:
+            self._scopes.popitem(last=False)
+
+
+class PostgresSemanticIndex:
+    """pgvector-backed index in the `semantic_cache` table (pool quota "cache").
+
+    Expired and over-SEMANTIC_CACHE_MAX_ENTRIES rows of a scope are pruned every
+    PRUNE_EVERY writes.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self):
+        self._setup_lock = asyncio.Lock()
+        self._table_ready = False
+        self._writes = 0
+
+    async def _ensure_table(self) -> None:
+        """Create the extension, table and HNSW index once per process."""
+        if self._table_ready:
+            return
+        async with self._setup_lock:
+            if self._table_ready:
+                return
+            async with pool_manager.connection("cache") as conn:
+                await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+                await conn.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS semantic_cache (
+                        id BIGSERIAL PRIMARY KEY,
+                        scope TEXT NOT NULL,
+                        prompt_hash TEXT NOT NULL,
+                        embedding vector({settings.SEMANTIC_CACHE_EMBEDDING_DIMS}) NOT NULL,
+                        answer TEXT NOT NULL,
+                        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                        expires_at TIMESTAMPTZ NOT NULL
+                    )
+                    """
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS semantic_cache_scope_idx ON semantic_cache (scope, prompt_hash)"
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS semantic_cache_embedding_idx "
+                    "ON semantic_cache USING hnsw (embedding vector_cosine_ops)"
+                )
+            self._table_ready = True
+
+    @staticmethod
+    def _vector_literal(embedding: np.ndarray) -> str:
+        return "[" + ",".join(f"{value:.7g}" for value in embedding) + "]"
+
+    async def search(self, scope: str, prompt_hash: str, embedding: np.ndarray) -> Optional[Tuple[float, str]]:
+        await self._ensure_table()
+        vector = self._vector_literal(embedding)
+        async with pool_manager.connection("cache") as conn:
+            cursor = await conn.execute(
+                """
+                SELECT 1 - (embedding <=> %s::vector) AS similarity, answer
+                FROM semantic_cache
+                WHERE scope = %s AND prompt_hash = %s AND expires_at > now()
+                ORDER BY embedding <=> %s::vector
+                LIMIT 1
+                """,
+                (vector, scope, prompt_hash, vector),
+            )
+            row = await cursor.fetchone()
+        return (float(row[0]), row[1]) if row else None
+
+    async def add(self, scope: str, prompt_hash: str, embedding: np.ndarray, answer: str) -> None:
+        await self._ensure_table()
+        async with pool_manager.connection("cache") as conn:
+            await conn.execute(
+                """
+                INSERT INTO semantic_cache (scope, prompt_hash, embedding, answer, expires_at)
+                VALUES (%s, %s, %s::vector, %s, now() + make_interval(secs => %s))
+                """,
+                (scope, prompt_hash, self._vector_literal(embedding), answer, settings.SEMANTIC_CACHE_TTL),
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                await conn.execute(
+                    """
+                    DELETE FROM semantic_cache
+                    WHERE expires_at <= now() OR id IN (
+                        SELECT id FROM semantic_cache WHERE scope = %s ORDER BY created_at DESC OFFSET %s
+                    )
+                    """,
+                    (scope, settings.SEMANTIC_CACHE_MAX_ENTRIES),
+                )
+
+
+# ==================================================
+# Semantic Cache
+# ==================================================
+class SemanticCache:
+    """Embeds questions and looks up / stores answers in the configured index.
+
+    Index and embedding failures are logged and treated as misses.
+    """
+
+    def __init__(self):
+        """Initialize the cache; the embeddings client is created on first use."""
+        self._index: SemanticIndex = (
+            PostgresSemanticIndex() if settings.SEMANTIC_CACHE_BACKEND == "postgres" else LocalSemanticIndex()
+        )
+        self._embedder: Optional[OpenAIEmbeddings] = None
+        # lookup() and the store() that follows a miss embed the same question
+        self._embeddings: TTLCache[str, np.ndarray] = TTLCache("semantic_cache_embeddings", maxsize=1000, ttl=300)
+
+    @staticmethod
+    def prompt_hash(model_name: str, *system_prompts: str) -> str:
+        """Hash of the model and the rendered system prompt(s) an answer was produced with."""
+        digest = hashlib.sha256(model_name.encode())
+        for prompt in system_prompts:
+            digest.update(b"\0" + prompt.encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def record_bypass(reason: str) -> None:
+        """Count a turn that skipped the cache (e.g. tool results or user memory involved)."""
+        cache_lookups_total.labels(cache=CACHE_LABEL, result="bypass").inc()
+        logger.debug("semantic_cache_bypassed", reason=reason)
+
+    async def _embed(self, query: str) -> np.ndarray:
+        """Embed a normalized question as a unit vector."""
+        import numpy as np
+
+        embedding = self._embeddings.get(query)
+        if embedding is None:
+            if self._embedder is None:
+                from langchain_openai import OpenAIEmbeddings
+
+                self._embedder = OpenAIEmbeddings(
+                    model=settings.SEMANTIC_CACHE_EMBEDDING_MODEL, api_key=settings.OPENAI_API_KEY
+                )
+            vector = np.asarray(await self._embedder.aembed_query(query), dtype=np.float32)
+            embedding = vector / (np.linalg.norm(vector) or 1.0)
+            self._embeddings.set(query, embedding)
+        return embedding
+
+    async def lookup(self, scope: str, prompt_hash: str, question: str) -> Optional[AIMessage]:
+        """Return a cached answer to a semantically equivalent question, if any.
+
+        Args:
+            scope: Tenant scope (e.g. "user:42").
+            prompt_hash: See `prompt_hash`.
+            question: The final user message.
+
+        Returns:
+            Optional[AIMessage]: The cached answer, or None on a miss.
+        """
+        match = None
+        try:
+            embedding = await self._embed(normalize_query(question))
+            match = await self._index.search(scope, prompt_hash, embedding)
+        except Exception as e:
+            logger.warning("semantic_cache_lookup_failed", error=str(e))
+
+        if match is None or match[0] < settings.SEMANTIC_CACHE_THRESHOLD:
+            cache_lookups_total.labels(cache=CACHE_LABEL, result="miss").inc()
+            return None
+        cache_lookups_total.labels(cache=CACHE_LABEL, result="hit").inc()
+        logger.info("semantic_cache_hit", scope=scope, similarity=round(match[0], 4))
+        return AIMessage(content=match[1], response_metadata={"semantic_cache": True, "similarity": match[0]})
+
+    async def store(self, scope: str, prompt_hash: str, question: str, response: BaseMessage) -> None:
+        """Store a plain-text answer (responses with tool calls are never cached)."""
+        if getattr(response, "tool_calls", None) or not isinstance(response.content, str) or not response.content:
+            return
+        try:
+            embedding = await self._embed(normalize_query(question))
+            await self._index.add(scope, prompt_hash, embedding, response.content)
+        except Exception as e:
+            logger.warning("semantic_cache_store_failed", error=str(e))
+
+
+# Create singleton and export as semantic_cache for service usage
+semantic_cache = SemanticCache()
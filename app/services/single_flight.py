@@ -0,0 +1,95 @@
+"""Per-thread single flight for graph runs.
+
+Two runs on the same LangGraph thread would each load the same checkpoint and
+then race to write the next one. This layer makes sure there is at most one run
+per thread at a time:
+
+- identical concurrent requests (same thread, same fingerprint) share one run
+  and its result;
+- different requests on the same thread wait for each other, in arrival order.
+
+State is per process; with several workers, sticky sessions give the same guarantee.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Tuple,
+    TypeVar,
+)
+
+from app.core.config.logging import get_logger
+from app.core.metrics import graph_single_flight_total
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class ThreadSingleFlight:
+    """Coalesces identical runs and serializes the others, per thread id.
+
+    Not thread-safe: meant to be used from the event loop only.
+    """
+
+    def __init__(self):
+        """Initialize with no threads tracked."""
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Runs holding or waiting for each thread's lock; the lock is dropped at zero
+        self._users: Dict[str, int] = {}
+        self._in_flight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    async def run(self, thread_id: str, fingerprint: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run `func` on a thread, joining an identical run that is queued or in progress.
+
+        The run happens in its own task, so one caller disconnecting doesn't cancel
+        it for the others sharing it.
+
+        Args:
+            thread_id: The graph thread (session) id.
+            fingerprint: Hash identifying the request payload.
+            func: Coroutine function performing the run.
+
+        Returns:
+            T: The result of the shared run.
+        """
+        key = (thread_id, fingerprint)
+        task = self._in_flight.get(key)
+        if task is not None:
+            graph_single_flight_total.labels(outcome="coalesced").inc()
+            logger.info("graph_run_coalesced", thread_id=thread_id)
+            return await asyncio.shield(task)
+
+        task = asyncio.create_task(self._run_serialized(thread_id, func))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _run_serialized(self, thread_id: str, func: Callable[[], Awaitable[T]]) -> T:
+        async with self.serialized(thread_id):
+            return await func()
+
+    @asynccontextmanager
+    async def serialized(self, thread_id: str) -> AsyncIterator[None]:
+        """Hold the thread's lock for the duration of the block (e.g. a streamed run)."""
+        lock = self._locks.get(thread_id)
+        if lock is None:
+            lock = self._locks[thread_id] = asyncio.Lock()
+        self._users[thread_id] = self._users.get(thread_id, 0) + 1
+        try:
+            if lock.locked():
+                graph_single_flight_total.labels(outcome="queued").inc()
+                logger.info("graph_run_queued", thread_id=thread_id)
+            else:
+                graph_single_flight_total.labels(outcome="started").inc()
+            async with lock:
+                yield
+        finally:
+            self._users[thread_id] -= 1
+            if not self._users[thread_id]:
+                del self._users[thread_id]
+                del self._locks[thread_id]
@@ -1,8 +1,9 @@
-# Re-export so "from app.utils import dump_messages, prepare_messages, process_llm_response" works
-from app.utils.graph import dump_messages, prepare_messages, process_llm_response
+# Re-export so "from app.utils import dump_messages, layout_messages, process_llm_response" works
+from app.utils.graph import dump_messages, layout_messages, process_llm_response, trim_history
 
 __all__ = [
     "dump_messages",
-    "prepare_messages",
+    "layout_messages",
     "process_llm_response",
+    "trim_history",
 ]
@@ -5,11 +5,17 @@ from jose import JWTError, jwt
 
 from app.core.config import settings
 from app.schemas.auth import Token
+from app.utils.cache import TTLCache
 from app.utils.sanitization import sanitize_string
 from app.core.config.logging import get_logger
 
 
 logger = get_logger(__name__)
+
+# Verified token -> subject. Entries never outlive the token's own expiry.
+_token_cache: TTLCache[str, str] = TTLCache(
+    "auth_token", maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
 # ==================================================
 # JWT Authentication Utilities
 # ==================================================
@@ -43,7 +49,12 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
 def verify_token(token: str) -> Optional[str]:
     """
     Decodes and verifies a JWT token. Returns the subject (User ID) if valid.
+    Successful verifications are cached, so repeat calls skip the regex and decode.
     """
+    cached_subject = _token_cache.get(token)
+    if cached_subject is not None:
+        return cached_subject
+
     # Basic format validation before attempting decode
     # JWT tokens consist of 3 base64url-encoded segments separated by dots
     if not re.match(r"^[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+$", token):
@@ -57,6 +68,9 @@ def verify_token(token: str) -> Optional[str]:
             return None
 
         logger.info("token_verified", thread_id=thread_id)
+        exp = payload.get("exp")
+        ttl = exp - datetime.now(UTC).timestamp() if exp is not None else None
+        _token_cache.set(token, thread_id, ttl=ttl)
         return thread_id
 
     except JWTError as e:
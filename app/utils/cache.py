@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from typing import (
+    Generic,
+    Hashable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from app.core.metrics import (
+    cache_entries,
+    cache_lookups_total,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+# ==================================================
+# Bounded LRU + TTL Cache
+# ==================================================
+class TTLCache(Generic[K, V]):
+    """
+    In-process cache that evicts the least recently used entry once `maxsize`
+    is reached and treats entries older than their TTL as misses.
+
+    Not thread-safe: meant to be used from the event loop only.
+    Hits and misses are exported per cache `name` (see cache_lookups_total).
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value, or None on a miss or expired entry."""
+        entry = self._data.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                cache_lookups_total.labels(cache=self.name, result="hit").inc()
+                return value
+            # Expired: drop it so it doesn't hold an LRU slot
+            del self._data[key]
+            cache_entries.labels(cache=self.name).set(len(self._data))
+        cache_lookups_total.labels(cache=self.name, result="miss").inc()
+        return None
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """Store a value, optionally with a shorter TTL than the cache default."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        cache_entries.labels(cache=self.name).set(len(self._data))
+
+    def pop(self, key: K) -> Optional[V]:
+        """Invalidate a key, returning its value if it was cached."""
+        entry = self._data.pop(key, None)
+        cache_entries.labels(cache=self.name).set(len(self._data))
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+        cache_entries.labels(cache=self.name).set(0)
+
+    def __len__(self) -> int:
+        return len(self._data)
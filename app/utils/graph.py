@@ -9,6 +9,7 @@ from langchain_core.messages import (
     AIMessage,
     SystemMessage,
     ToolMessage,
+    convert_to_openai_messages,
     trim_messages as _trim_messages,
 )
 from langchain_core.messages.utils import count_tokens_approximately
@@ -16,6 +17,7 @@ from langchain_core.messages.utils import count_tokens_approximately
 from app.core.config import settings
 from app.core.config.logging import get_logger
 from app.schemas import Message
+from app.utils.tokens import suffix_start
 
 logger = get_logger(__name__)
 
@@ -25,12 +27,14 @@ logger = get_logger(__name__)
 # ==================================================
 
 InputMsg = Union[Message, Dict[str, Any], BaseMessage]
+# Trimmed history: API messages, plus LangChain tool calls/results kept as-is
+HistoryMsg = Union[Message, BaseMessage]
 
-def dump_messages(messages: list[Message]) -> list[dict]:
+def dump_messages(messages: list[HistoryMsg]) -> list[dict]:
     """
     Backwards-compatible helper: converts your Pydantic Message list to OpenAI-style dicts.
     """
-    return [m.model_dump() for m in messages]
+    return [m.model_dump() if isinstance(m, Message) else convert_to_openai_messages(m) for m in messages]
 
 # ==================================================
 # Content & Role Helpers
@@ -134,10 +138,13 @@ def _to_langchain_message(m: InputMsg) -> BaseMessage:
     return HumanMessage(content=content)
 
 
-def _from_langchain_message(m: BaseMessage) -> Optional[Message]:
+def _from_langchain_message(m: BaseMessage) -> Optional[HistoryMsg]:
     """
     Convert LangChain BaseMessage back into your Pydantic Message schema.
     Returns None for empty/unsupported messages.
+
+    Tool results and assistant turns that request tools can't be expressed by the
+    API Message schema, so they are returned unchanged to keep the tool loop intact.
     """
     role_map = {
         "human": "user",
@@ -148,17 +155,15 @@ def _from_langchain_message(m: BaseMessage) -> Optional[Message]:
         "tool": "tool",
     }
     role = role_map.get(getattr(m, "type", "user"), "user")
+    if role == "tool" or (role == "assistant" and getattr(m, "tool_calls", None)):
+        return m
+
     content = _coerce_content_to_str(getattr(m, "content", ""))
 
     # Drop empty messages (optional behavior)
     if not content:
         return None
 
-    # If your Pydantic Message supports tool_call_id, preserve it
-    if role == "tool" and hasattr(Message, "model_fields") and "tool_call_id" in Message.model_fields:
-        tcid = getattr(m, "tool_call_id", None)
-        return Message(role=role, content=content, tool_call_id=str(tcid) if tcid else None)
-
     return Message(role=role, content=content)
 
 
@@ -166,35 +171,64 @@ def _from_langchain_message(m: BaseMessage) -> Optional[Message]:
 # Core LLM Utilities
 # ==================================================
 
-def prepare_messages(
+def trim_history(
     messages: List[InputMsg],
     llm: BaseChatModel,
-    system_prompt: str,
     *,
+    token_counts: Optional[List[int]] = None,
     max_fallback_messages: Optional[int] = None,
-) -> List[Message]:
+) -> List[HistoryMsg]:
     """
-    Prepares chat history for the LLM by trimming it to fit the context window.
+    Trims chat history to fit the context window, without a system prompt.
 
     Logic:
-    1. Normalize all messages to LangChain BaseMessage objects.
+    1. If per-message `token_counts` are given (see app/utils/tokens.py), keep the
+       longest suffix that fits and normalize only that: no re-tokenization.
+       Otherwise normalize all messages to LangChain BaseMessage objects and:
     2. Attempt precision trimming using the model token counter (token_counter=llm).
     3. If that fails (e.g., unrecognized content blocks), fall back to approximate counting.
     4. If the approximate fallback also fails, fall back to a hard-cap by message count.
-    5. Always return a clean List[Message] starting with the system prompt.
+    5. Return a clean List[Message] (tool calls/results stay LangChain messages).
 
     Notes:
-    - We exclude system messages during trimming and prepend our canonical system prompt.
+    - We exclude system messages during trimming; callers prepend the canonical system prompt.
     - start_on="human" is correct because we normalize user messages to HumanMessage.
+    - Kept separate from the prompt so it can run before long-term memory is available.
     """
     if max_fallback_messages is None:
         # Sensible default: keep the last N messages if all trimming fails
         max_fallback_messages = getattr(settings, "MAX_FALLBACK_MSGS", 30)
 
-    # 1) Normalize inputs
-    lc_messages = [_to_langchain_message(m) for m in messages]
+    if token_counts is not None and len(token_counts) == len(messages):
+        # 1) Suffix sum over cached counts
+        trimmed_lc = _trim_by_token_counts(messages, token_counts)
+    else:
+        # 2-4) Normalize inputs, then precision / approximate / hard-cap trimming
+        lc_messages = [_to_langchain_message(m) for m in messages]
+        trimmed_lc = _trim_with_counter(lc_messages, llm, max_fallback_messages)
+
+    # 5) Convert back to your schema (consistent return type)
+    history: List[HistoryMsg] = []
+    for m in trimmed_lc:
+        pm = _from_langchain_message(m)
+        if pm is not None:
+            history.append(pm)
+
+    return history
+
+
+def _trim_by_token_counts(messages: List[InputMsg], token_counts: List[int]) -> List[BaseMessage]:
+    """Keep the newest messages within MAX_TOKENS, then start on a human message."""
+    start = suffix_start(token_counts, settings.MAX_TOKENS)
+    lc_tail = [_to_langchain_message(m) for m in messages[start:]]
+    first_human = next((i for i, m in enumerate(lc_tail) if m.type == "human"), len(lc_tail))
+    return lc_tail[first_human:]
 
-    # 2) Trim (precision)
+
+def _trim_with_counter(
+    lc_messages: List[BaseMessage], llm: BaseChatModel, max_fallback_messages: int
+) -> List[BaseMessage]:
+    """Trim by re-counting the history with the model's token counter (with fallbacks)."""
     try:
         trimmed_lc = _trim_messages(
             lc_messages,
@@ -232,15 +266,50 @@ def prepare_messages(
             # 4) Last resort hard-cap (never send full history)
             trimmed_lc = lc_messages[-max_fallback_messages:]
 
-    # 5) Convert back to your schema (consistent return type)
-    final_history: List[Message] = [Message(role="system", content=system_prompt)]
+    return trimmed_lc
 
-    for m in trimmed_lc:
-        pm = _from_langchain_message(m)
-        if pm is not None:
-            final_history.append(pm)
 
-    return final_history
+def fold_point(messages: List[BaseMessage], keep: int) -> int:
+    """
+    Index of the first message to keep when older messages are folded into a summary.
+
+    At least the last `keep` messages stay, and the kept part starts on a human
+    message so a tool call is never separated from its results. Returns 0 when
+    there is nothing to fold.
+    """
+    for index in range(len(messages) - keep, 0, -1):
+        if getattr(messages[index], "type", None) == "human":
+            return index
+    return 0
+
+
+def layout_messages(
+    history: List[HistoryMsg],
+    system_prompt: str,
+    context: Optional[str] = None,
+    *,
+    layout: Optional[str] = None,
+) -> List[HistoryMsg]:
+    """
+    Arranges the prompt around already-trimmed history.
+
+    Layouts (settings.PROMPT_LAYOUT):
+    - "cache_aware": [static system prompt, *history, context]. OpenAI caches the
+      longest previously seen prefix (tool schemas, then messages), so keeping the
+      volatile context (date, long-term memory) last lets every turn of a thread
+      reuse the cached instructions and history.
+    - "legacy": a single system message with the context appended, then history.
+    """
+    layout = layout or settings.PROMPT_LAYOUT
+    if not context:
+        return [Message(role="system", content=system_prompt), *history]
+    if layout == "cache_aware":
+        return [
+            Message(role="system", content=system_prompt),
+            *history,
+            Message(role="system", content=context),
+        ]
+    return [Message(role="system", content=f"{system_prompt}\n\n{context}"), *history]
 
 
 def process_llm_response(response: BaseMessage) -> BaseMessage:
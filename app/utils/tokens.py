@@ -0,0 +1,121 @@
+import json
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from langchain_core.messages import BaseMessage
+
+if TYPE_CHECKING:
+    import tiktoken
+
+# OpenAI chat format overhead per message, and for priming the assistant reply
+# (same accounting as ChatOpenAI.get_num_tokens_from_messages)
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_NAME = 1
+REPLY_PRIMING_TOKENS = 3
+
+# Used for models tiktoken doesn't know yet
+DEFAULT_ENCODING = "o200k_base"
+
+_ROLE_NAMES = {"human": "user", "ai": "assistant", "system": "system", "tool": "tool"}
+
+
+# ==================================================
+# Encoding & Per-Message Counts
+# ==================================================
+@lru_cache(maxsize=32)
+def get_encoding(model: str) -> "tiktoken.Encoding":
+    """Return the tiktoken encoding for a model, falling back to DEFAULT_ENCODING."""
+    # Loaded with the first count rather than when the app starts
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
+def _encoded_len(encoding: "tiktoken.Encoding", text: str) -> int:
+    # User text may legitimately contain strings like "<|endoftext|>"
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(message: BaseMessage, encoding: "tiktoken.Encoding") -> int:
+    """Count the prompt tokens one message contributes, including format overhead."""
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+    tokens = TOKENS_PER_MESSAGE
+    tokens += _encoded_len(encoding, _ROLE_NAMES.get(message.type, message.type))
+    tokens += _encoded_len(encoding, content)
+    if message.name:
+        tokens += TOKENS_PER_NAME + _encoded_len(encoding, message.name)
+
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        serialized = [{"name": call["name"], "args": call["args"]} for call in tool_calls]
+        tokens += _encoded_len(encoding, json.dumps(serialized, sort_keys=True))
+    tool_call_id = getattr(message, "tool_call_id", None)
+    if tool_call_id:
+        tokens += _encoded_len(encoding, tool_call_id)
+    return tokens
+
+
+# ==================================================
+# Incremental Accounting
+# ==================================================
+def count_tokens_incremental(
+    messages: Sequence[BaseMessage],
+    model: str,
+    cached: Optional[Dict[str, int]] = None,
+) -> Tuple[List[int], Dict[str, int]]:
+    """
+    Per-message token counts for a thread, tokenizing only messages not seen before.
+
+    Args:
+        messages: The conversation, oldest first.
+        model: Model name used to pick the tiktoken encoding.
+        cached: Counts from previous turns, keyed by message id.
+
+    Returns:
+        Tuple of (counts aligned with `messages`, newly computed counts keyed by
+        message id). Messages without an id are counted but not cached.
+    """
+    cached = cached or {}
+    encoding: Optional["tiktoken.Encoding"] = None
+    counts: List[int] = []
+    new_counts: Dict[str, int] = {}
+
+    for message in messages:
+        message_id = message.id
+        count = cached.get(message_id) if message_id else None
+        if count is None:
+            if encoding is None:
+                encoding = get_encoding(model)
+            count = count_message_tokens(message, encoding)
+            if message_id:
+                new_counts[message_id] = count
+        counts.append(count)
+
+    return counts, new_counts
+
+
+def suffix_start(counts: Sequence[int], max_tokens: int) -> int:
+    """
+    Index of the oldest message of the longest suffix that fits in `max_tokens`.
+
+    Returns len(counts) when not even the last message fits.
+    """
+    budget = max_tokens - REPLY_PRIMING_TOKENS
+    total = 0
+    start = len(counts)
+    for index in range(len(counts) - 1, -1, -1):
+        total += counts[index]
+        if total > budget:
+            break
+        start = index
+    return start
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Benchmark deleting conversation history: per-table, per-thread DELETEs vs one bulk purge.
+
+Seeds the checkpoint tables with `--threads` synthetic threads of `--checkpoints`
+checkpoints each (plus a blob and a write per checkpoint), then deletes groups
+of `--batch` threads, the sessions of one user being deleted:
+
+- "per-table loop": the previous `clear_chat_history`, one autocommit DELETE per
+  table per thread (3 x batch round trips, not atomic);
+- "bulk purge": `checkpoint_store.purge_threads`, one statement with
+  `thread_id = ANY(%s)` over all tables.
+
+Usage:
+    python -m benchmarks.checkpoint_purge --threads 5000 --checkpoints 20 --batch 20 --rounds 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from typing import (
+    Dict,
+    List,
+)
+
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.services.checkpoint_store import checkpoint_store
+from app.services.connection_pool import pool_manager
+from benchmarks.helpers import (
+    print_results,
+    summarize,
+)
+
+TABLES = ["checkpoint_blobs", "checkpoint_writes", "checkpoints"]
+
+SEED_SQL = [
+    """
+    INSERT INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, checkpoint, metadata)
+    SELECT %(prefix)s || t, '', lpad(c::text, 8, '0'),
+        jsonb_build_object('v', 1, 'ts', now(), 'channel_versions', jsonb_build_object('messages', c::text)),
+        '{}'::jsonb
+    FROM generate_series(1, %(threads)s) t, generate_series(1, %(checkpoints)s) c
+    """,
+    """
+    INSERT INTO checkpoint_blobs (thread_id, checkpoint_ns, channel, version, type, blob)
+    SELECT %(prefix)s || t, '', 'messages', c::text, 'msgpack', convert_to(repeat('x', %(blob_bytes)s), 'UTF8')
+    FROM generate_series(1, %(threads)s) t, generate_series(1, %(checkpoints)s) c
+    """,
+    """
+    INSERT INTO checkpoint_writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, blob)
+    SELECT %(prefix)s || t, '', lpad(c::text, 8, '0'), 'task', 0, 'messages', 'msgpack', '\\x00'::bytea
+    FROM generate_series(1, %(threads)s) t, generate_series(1, %(checkpoints)s) c
+    """,
+]
+
+
+async def delete_per_table(thread_ids: List[str]) -> None:
+    """The previous implementation, applied to each of a user's sessions in turn."""
+    for thread_id in thread_ids:
+        async with pool_manager.connection("checkpointer") as conn:
+            for table in TABLES:
+                await conn.execute(f"DELETE FROM {table} WHERE thread_id = %s", (thread_id,))
+
+
+async def main(threads: int, checkpoints: int, blob_bytes: int, batch: int, rounds: int) -> None:
+    """Seed the tables, time both deletion paths on disjoint thread groups, then clean up.
+
+    Args:
+        threads: Synthetic threads to seed.
+        checkpoints: Checkpoints (and blobs, writes) per thread.
+        blob_bytes: Size of each seeded blob.
+        batch: Threads deleted per operation.
+        rounds: Timed operations per variant.
+    """
+    if 2 * batch * rounds > threads:
+        raise SystemExit(f"need at least {2 * batch * rounds} threads for {rounds} rounds of {batch}")
+    await pool_manager.open()
+    await AsyncPostgresSaver(pool_manager.pool).setup()
+    prefix = f"bench-purge-{uuid.uuid4().hex[:8]}-"
+    params = {"prefix": prefix, "threads": threads, "checkpoints": checkpoints, "blob_bytes": blob_bytes}
+    async with pool_manager.connection("checkpointer") as conn:
+        for statement in SEED_SQL:
+            await conn.execute(statement, params)
+        await conn.execute("ANALYZE checkpoints, checkpoint_blobs, checkpoint_writes")
+
+    groups = [[f"{prefix}{batch * index + offset + 1}" for offset in range(batch)] for index in range(2 * rounds)]
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for name, func, variant_groups in (
+            ("per-table loop", delete_per_table, groups[::2]),
+            ("bulk purge", checkpoint_store.purge_threads, groups[1::2]),
+        ):
+            latencies: List[float] = []
+            start = time.perf_counter()
+            for thread_ids in variant_groups:
+                call_start = time.perf_counter()
+                await func(thread_ids)
+                latencies.append(time.perf_counter() - call_start)
+            results[name] = summarize(latencies, time.perf_counter() - start)
+        print_results(
+            f"Delete {batch} threads ({threads * checkpoints:,} checkpoints seeded)",
+            results,
+        )
+    finally:
+        async with pool_manager.connection("checkpointer") as conn:
+            for table in TABLES:
+                await conn.execute(f"DELETE FROM {table} WHERE thread_id LIKE %s", (prefix + "%",))
+        await pool_manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark checkpoint purges")
+    parser.add_argument("--threads", type=int, default=5000, help="Synthetic threads to seed")
+    parser.add_argument("--checkpoints", type=int, default=20, help="Checkpoints per thread")
+    parser.add_argument("--blob-bytes", type=int, default=2000, help="Size of each seeded blob")
+    parser.add_argument("--batch", type=int, default=20, help="Threads deleted per operation (sessions of a user)")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed operations per variant")
+    args = parser.parse_args()
+    asyncio.run(main(args.threads, args.checkpoints, args.blob_bytes, args.batch, args.rounds))
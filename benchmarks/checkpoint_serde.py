@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Benchmark checkpoint blob size and (de)serialization time per serializer.
+
+Builds a tool-heavy conversation of `--turns` turns (question, tool call, a
+DuckDuckGo-style result of ten snippets, answer; `--repeat-ratio` of the results
+repeat an earlier one) and encodes the `messages` channel the way the
+checkpointer does: one full blob per super-step, four per turn.
+
+- "default": JsonPlusSerializer, the checkpointer's default;
+- "compact": CompactSerializer (msgpack + zstd/zlib above the size threshold);
+- "compact + payloads": what CompactPostgresSaver stores, the compressed
+  blobs with large tool results replaced by digests, plus each distinct result
+  once (repeats hit ON CONFLICT DO NOTHING).
+
+Reports stored bytes per turn, then the time to serialize and deserialize the
+final thread's blob (what every turn writes and loads).
+
+Usage:
+    python -m benchmarks.checkpoint_serde --turns 30 --repeat 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import uuid
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+from colorama import (
+    Fore,
+    Style,
+)
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.core.config import settings
+from app.services.checkpoint_serde import (
+    CompactSerializer,
+    externalize_payloads,
+    payload_refs,
+    restore_payloads,
+)
+from benchmarks.helpers import (
+    print_results,
+    time_sync,
+)
+
+WORDS = (
+    "checkpoint postgres latency pool async connection thread model token cache summary search result "
+    "graph node state message agent tool memory vector index query stream response request user session"
+).split()
+
+
+def search_result(rng: random.Random) -> str:
+    """A DuckDuckGo-style result: ten snippets with titles and links."""
+    snippets = []
+    for _ in range(10):
+        title = " ".join(rng.choices(WORDS, k=6)).title()
+        body = " ".join(rng.choices(WORDS, k=40))
+        link = f"https://example.com/{uuid.UUID(int=rng.getrandbits(128))}"
+        snippets.append(f"snippet: {body}, title: {title}, link: {link}")
+    return "[" + "], [".join(snippets) + "]"
+
+
+def build_steps(turns: int, repeat_ratio: float, seed: int) -> List[List[BaseMessage]]:
+    """The `messages` channel value after each super-step of the conversation."""
+    rng = random.Random(seed)
+    messages: List[BaseMessage] = []
+    results: List[str] = []
+    steps: List[List[BaseMessage]] = []
+    for turn in range(turns):
+        call_id = f"call_{turn}"
+        if results and rng.random() < repeat_ratio:
+            result = rng.choice(results)
+        else:
+            result = search_result(rng)
+            results.append(result)
+        for message in (
+            HumanMessage(content=" ".join(rng.choices(WORDS, k=15)), id=str(uuid.uuid4())),
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "duckduckgo_results_json", "args": {"query": "checkpoint"}, "id": call_id}],
+                id=str(uuid.uuid4()),
+            ),
+            ToolMessage(content=result, name="duckduckgo_results_json", tool_call_id=call_id, id=str(uuid.uuid4())),
+            AIMessage(content=" ".join(rng.choices(WORDS, k=120)), id=str(uuid.uuid4())),
+        ):
+            messages.append(message)
+            steps.append(list(messages))
+    return steps
+
+
+def stored_bytes(steps: List[List[BaseMessage]], serde: Any, min_bytes: int) -> int:
+    """Bytes written to checkpoint_blobs for the whole conversation."""
+    total = 0
+    stored_payloads: Dict[str, int] = {}
+    for value in steps:
+        payloads: Dict[str, str] = {}
+        total += len(serde.dumps_typed(externalize_payloads(value, min_bytes, payloads))[1])
+        for digest, content in payloads.items():
+            if digest not in stored_payloads:
+                stored_payloads[digest] = len(serde.dumps_typed(content)[1])
+    return total + sum(stored_payloads.values())
+
+
+def main(turns: int, repeat_ratio: float, repeat: int, seed: int) -> None:
+    """Encode the conversation with each serializer and print sizes and timings.
+
+    Args:
+        turns: Conversation turns (four super-steps each).
+        repeat_ratio: Fraction of tool results that repeat an earlier one.
+        repeat: Timed (de)serializations of the final blob per variant.
+        seed: Random seed for the generated conversation.
+    """
+    steps = build_steps(turns, repeat_ratio, seed)
+    payload_min_bytes = settings.CHECKPOINT_PAYLOAD_MIN_BYTES or 2048
+    compact = CompactSerializer(
+        compression=settings.CHECKPOINT_SERDE_COMPRESSION,
+        min_bytes=settings.CHECKPOINT_SERDE_COMPRESS_MIN_BYTES,
+        level=settings.CHECKPOINT_SERDE_COMPRESSION_LEVEL,
+    )
+    variants = {
+        "default": (JsonPlusSerializer(), 0),
+        "compact": (compact, 0),
+        "compact + payloads": (compact, payload_min_bytes),
+    }
+
+    print("\n" + "=" * 72)
+    title = f"Checkpoint bytes, {turns} turns ({len(steps)} blobs)"
+    print(f"{Fore.CYAN}{Style.BRIGHT}{title.center(72)}{Style.RESET_ALL}")
+    print("=" * 72)
+    print(f"{'variant':<28}{'bytes/turn':>14}{'total KiB':>14}{'vs default':>14}")
+    baseline = None
+    for name, (serde, min_bytes) in variants.items():
+        total = stored_bytes(steps, serde, min_bytes)
+        baseline = baseline or total
+        print(f"{name:<28}{total / turns:>14,.0f}{total / 1024:>14,.1f}{total / baseline:>13.0%}")
+
+    final = steps[-1]
+    results: Dict[str, Dict[str, float]] = {}
+    for name, (serde, min_bytes) in variants.items():
+        payloads: Dict[str, str] = {}
+        encoded = serde.dumps_typed(externalize_payloads(final, min_bytes, payloads))
+        encoded_payloads = {digest: serde.dumps_typed(content) for digest, content in payloads.items()}
+
+        def dump() -> None:
+            serde.dumps_typed(externalize_payloads(final, min_bytes, {}))
+
+        def load() -> None:
+            messages = serde.loads_typed(encoded)
+            digests = payload_refs([messages])
+            restore_payloads(messages, {digest: serde.loads_typed(encoded_payloads[digest]) for digest in digests})
+
+        results[f"{name} (dump)"] = time_sync(dump, repeat)
+        results[f"{name} (load)"] = time_sync(load, repeat)
+    print_results(f"Serialize / deserialize the final {len(final)}-message blob", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark checkpoint serializers")
+    parser.add_argument("--turns", type=int, default=30, help="Conversation turns (four checkpoints each)")
+    parser.add_argument("--repeat-ratio", type=float, default=0.3, help="Fraction of repeated tool results")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed (de)serializations per variant")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = parser.parse_args()
+    main(args.turns, args.repeat_ratio, args.repeat, args.seed)
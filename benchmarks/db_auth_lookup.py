@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent /chat auth lookups: blocking sync sessions vs the async DatabaseService.
+
+The "sync" variant reproduces the previous implementation (an `async def` wrapping a
+blocking `sqlmodel.Session`), so every lookup stalls the event loop for a full DB
+round-trip. The "async" variant runs the real `get_current_session` dependency.
+
+Usage:
+    python -m benchmarks.db_auth_lookup --total 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+from urllib.parse import quote_plus
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlmodel import (
+    Session,
+    create_engine,
+)
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.api.v1.auth import get_current_session
+from app.core.config import settings
+from app.models.session import Session as ChatSession
+from app.models.user import User
+from app.services.connection_pool import pool_manager
+from app.services.database import database_service
+from app.utils.auth import (
+    create_access_token,
+    verify_token,
+)
+from benchmarks.helpers import (
+    print_results,
+    run_concurrently,
+)
+
+
+async def main(total: int, concurrency: int) -> None:
+    """Create a throwaway user/session, benchmark both lookup paths, then clean up.
+
+    Args:
+        total: Number of lookups per variant.
+        concurrency: Number of lookups in flight at once.
+    """
+    await pool_manager.open()
+    await database_service.initialize()
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    user = await database_service.create_user(email=email, password=User.hash_password("Bench!12345"))
+    session_id = str(uuid.uuid4())
+    await database_service.create_session(session_id, user.id)
+    token = create_access_token(session_id).access_token
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    sync_engine = create_engine(
+        "postgresql+psycopg://"
+        f"{quote_plus(settings.POSTGRES_USER)}:{quote_plus(settings.POSTGRES_PASSWORD)}"
+        f"@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}",
+        pool_size=settings.POSTGRES_POOL_QUOTAS["orm"],
+    )
+
+    async def sync_lookup() -> None:
+        with Session(sync_engine) as session:
+            session.get(ChatSession, verify_token(token))
+
+    async def async_lookup() -> None:
+        await get_current_session(credentials)
+
+    try:
+        results = {
+            "sync session (before)": await run_concurrently(sync_lookup, total, concurrency),
+            "async session (after)": await run_concurrently(async_lookup, total, concurrency),
+        }
+        print_results(f"auth lookups: total={total} concurrency={concurrency}", results)
+    finally:
+        sync_engine.dispose()
+        await database_service.delete_session(session_id)
+        await database_service.delete_user_by_email(email)
+        await database_service.close()
+        await pool_manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent session auth lookups")
+    parser.add_argument("--total", type=int, default=2000, help="Lookups per variant")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent lookups in flight")
+    args = parser.parse_args()
+    asyncio.run(main(args.total, args.concurrency))
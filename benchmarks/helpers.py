@@ -0,0 +1,101 @@
+"""Shared helpers for the benchmark scripts."""
+
+import asyncio
+import statistics
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+)
+
+from colorama import (
+    Fore,
+    Style,
+)
+
+
+async def run_concurrently(
+    func: Callable[[], Awaitable[Any]], total: int, concurrency: int
+) -> Dict[str, float]:
+    """Run an async callable `total` times with at most `concurrency` in flight.
+
+    Args:
+        func: Zero-argument coroutine factory to benchmark.
+        total: Total number of calls to make.
+        concurrency: Maximum number of concurrent calls.
+
+    Returns:
+        Dict[str, float]: Throughput and latency percentiles (milliseconds).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await func()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed)
+
+
+def time_sync(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Time a synchronous callable `repeat` times sequentially.
+
+    Args:
+        func: Zero-argument callable to benchmark.
+        repeat: Number of calls to make.
+
+    Returns:
+        Dict[str, float]: Throughput and latency percentiles (milliseconds).
+    """
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call_start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_start)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Summarize raw latencies (seconds) into a report row.
+
+    Args:
+        latencies: Per-call latencies in seconds.
+        elapsed: Wall-clock time for the whole run in seconds.
+
+    Returns:
+        Dict[str, float]: ops/sec plus p50/p99/mean latency in milliseconds.
+    """
+    ordered = sorted(latencies)
+    p99_index = max(0, int(len(ordered) * 0.99) - 1)
+    return {
+        "ops_per_sec": len(ordered) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(ordered) * 1000 if ordered else 0.0,
+        "p99_ms": ordered[p99_index] * 1000 if ordered else 0.0,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+    }
+
+
+def print_results(title: str, results: Dict[str, Dict[str, float]]) -> None:
+    """Print a small comparison table of benchmark results.
+
+    Args:
+        title: Heading for the table.
+        results: Mapping of variant name to its summary row.
+    """
+    print("\n" + "=" * 72)
+    print(f"{Fore.CYAN}{Style.BRIGHT}{title.center(72)}{Style.RESET_ALL}")
+    print("=" * 72)
+    print(f"{'variant':<28}{'ops/sec':>11}{'p50 ms':>11}{'p99 ms':>11}{'mean ms':>11}")
+    for name, row in results.items():
+        print(
+            f"{name:<28}{row['ops_per_sec']:>11.1f}{row['p50_ms']:>11.2f}{row['p99_ms']:>11.2f}{row['mean_ms']:>11.2f}"
+        )
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark GET /messages history reads on long threads.
+
+Seeds a throwaway thread with `--size` messages, written as `--turns` checkpoints
+like real conversation turns, then times three read paths under concurrency:
+
+- "sync get_state": the previous implementation, `sync_to_async(graph.get_state)`,
+  which runs the sync checkpointer API on a worker thread that round-trips back
+  to the event loop's async pool;
+- "aget_state": the async checkpointer API, which still loads every channel and
+  the pending writes of the latest checkpoint;
+- "history page": what the endpoint does now, `get_chat_history` with a page
+  size of `--limit`, which fetches only the latest `messages` blob.
+
+Usage:
+    python -m benchmarks.history_read --size 1000 --turns 20 --total 200 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+from typing import (
+    Dict,
+    List,
+)
+
+from asgiref.sync import sync_to_async
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+)
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.core.langgraph.graph import LangGraphAgent
+from app.services.connection_pool import pool_manager
+from benchmarks.helpers import (
+    print_results,
+    run_concurrently,
+)
+
+SAMPLE_TEXT = (
+    "Here is a detailed answer covering connection pooling, checkpoint storage and "
+    "how LangGraph persists state between turns of a long-running conversation. "
+)
+
+
+def build_thread(size: int) -> List[BaseMessage]:
+    """Build an alternating user/assistant thread of `size` messages with stable ids."""
+    messages: List[BaseMessage] = []
+    for index in range(size):
+        message_class = HumanMessage if index % 2 == 0 else AIMessage
+        messages.append(message_class(content=SAMPLE_TEXT * (1 + index % 4), id=str(uuid.uuid4())))
+    return messages
+
+
+async def main(size: int, turns: int, limit: int, total: int, concurrency: int) -> None:
+    """Seed a thread, benchmark the three read paths, then delete the thread.
+
+    Args:
+        size: Messages in the seeded thread.
+        turns: Checkpoints the messages are spread over.
+        limit: Page size for the paginated read.
+        total: Reads per variant.
+        concurrency: Reads in flight at once.
+    """
+    await pool_manager.open()
+    agent = LangGraphAgent()
+    graph = await agent.create_graph()
+    session_id = f"bench-{uuid.uuid4().hex[:12]}"
+    config = {"configurable": {"thread_id": session_id}}
+
+    thread = build_thread(size)
+    step = max(1, size // turns)
+    for start in range(0, size, step):
+        await graph.aupdate_state(config, {"messages": thread[start : start + step]}, as_node="chat")
+
+    async def sync_get_state() -> None:
+        await sync_to_async(graph.get_state)(config=config)
+
+    async def aget_state() -> None:
+        await graph.aget_state(config)
+
+    async def history_page() -> None:
+        await agent.get_chat_history(session_id, limit=limit)
+
+    try:
+        results: Dict[str, Dict[str, float]] = {
+            "sync get_state": await run_concurrently(sync_get_state, total, concurrency),
+            "aget_state": await run_concurrently(aget_state, total, concurrency),
+            f"history page ({limit})": await run_concurrently(history_page, total, concurrency),
+        }
+        print_results(f"History read on a {size}-message thread (concurrency={concurrency})", results)
+    finally:
+        await agent.clear_chat_history(session_id)
+        await pool_manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark chat history reads")
+    parser.add_argument("--size", type=int, default=1000, help="Messages in the seeded thread")
+    parser.add_argument("--turns", type=int, default=20, help="Checkpoints the messages are written as")
+    parser.add_argument("--limit", type=int, default=50, help="Page size for the paginated read")
+    parser.add_argument("--total", type=int, default=200, help="Reads per variant")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent reads")
+    args = parser.parse_args()
+    asyncio.run(main(args.size, args.turns, args.limit, args.total, args.concurrency))
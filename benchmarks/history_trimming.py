@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark per-turn history trimming: full re-tokenization vs cached per-message counts.
+
+The "full" variant is the previous behaviour: `trim_messages` with the model as token
+counter, which re-tokenizes the whole thread on every turn. The "incremental" variant
+is what the chat node does now: reuse the counts stored in the checkpoint, tokenize
+only the two messages added since the last turn, and trim with a suffix sum.
+
+Usage:
+    python -m benchmarks.history_trimming --sizes 10 100 1000 --repeat 20
+"""
+
+import argparse
+import os
+import sys
+import uuid
+from typing import (
+    Dict,
+    List,
+)
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+)
+from langchain_openai import ChatOpenAI
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.core.config import settings
+from app.utils.graph import trim_history
+from app.utils.tokens import count_tokens_incremental
+from benchmarks.helpers import (
+    print_results,
+    time_sync,
+)
+
+SAMPLE_TEXT = (
+    "Could you summarize the trade-offs between optimistic and pessimistic locking "
+    "for a multi-tenant Postgres workload with frequent short transactions? "
+)
+
+
+def build_thread(size: int) -> List[BaseMessage]:
+    """Build an alternating user/assistant thread of `size` messages with stable ids."""
+    messages: List[BaseMessage] = []
+    for index in range(size):
+        message_class = HumanMessage if index % 2 == 0 else AIMessage
+        messages.append(message_class(content=SAMPLE_TEXT * (1 + index % 3), id=str(uuid.uuid4())))
+    return messages
+
+
+def main(sizes: List[int], repeat: int) -> None:
+    """Time one turn of trimming per thread size for both variants.
+
+    Args:
+        sizes: Thread lengths (number of messages) to benchmark.
+        repeat: Number of timed turns per variant.
+    """
+    model = settings.DEFAULT_LLM_MODEL
+    llm = ChatOpenAI(model=model, api_key=settings.OPENAI_API_KEY)
+    results: Dict[str, Dict[str, float]] = {}
+
+    for size in sizes:
+        thread = build_thread(size)
+        # Counts persisted by previous turns: everything except the latest exchange
+        _, cached = count_tokens_incremental(thread[:-2], model)
+
+        def full() -> None:
+            trim_history(thread, llm)
+
+        def incremental() -> None:
+            counts, _ = count_tokens_incremental(thread, model, cached)
+            trim_history(thread, llm, token_counts=counts)
+
+        results[f"full ({size} msgs)"] = time_sync(full, repeat)
+        results[f"incremental ({size} msgs)"] = time_sync(incremental, repeat)
+
+    print_results(f"History trimming per turn (MAX_TOKENS={settings.MAX_TOKENS})", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark history trimming")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Thread lengths")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed turns per variant")
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark cold import time of the application.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters (so nothing
+is already in sys.modules), reports the total, and lists the modules with the
+largest cumulative import time from the fastest run. With --max-ms it exits
+non-zero when the total exceeds the budget, so it can guard against a heavy
+dependency creeping back into module scope.
+
+Usage:
+    python -m benchmarks.import_time --repeat 5 --top 15 --max-ms 3000
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import (
+    Dict,
+    List,
+    Tuple,
+)
+
+from colorama import (
+    Fore,
+    Style,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time:       self [us] |  cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+
+
+def measure(module: str) -> List[Tuple[str, int, int]]:
+    """Import `module` in a fresh interpreter and parse its -X importtime report.
+
+    Args:
+        module: Dotted module path to import.
+
+    Returns:
+        List[Tuple[str, int, int]]: (module, cumulative µs, nesting depth) per import.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            # importtime indents nested imports by two spaces per level
+            rows.append((name.strip(), int(cumulative), (len(indent) - 1) // 2))
+            if rows[-1][0] == "site" and rows[-1][2] == 0:
+                # Interpreter startup (site and its .pth hooks) happens before `-c` runs
+                rows.clear()
+    return rows
+
+
+def main(module: str, repeat: int, top: int, max_ms: float) -> int:
+    """Measure cold import time of `module` and print the heaviest imports.
+
+    Args:
+        module: Dotted module path to import.
+        repeat: Number of fresh interpreters to time; the fastest run is reported.
+        top: Number of heaviest modules to list.
+        max_ms: Fail when the fastest total exceeds this many milliseconds (0 = no budget).
+
+    Returns:
+        int: Process exit code.
+    """
+    runs = [measure(module) for _ in range(repeat)]
+    # Top-level entries are the imports made directly by `-c`; their sum is the total
+    totals = [sum(cumulative for _, cumulative, depth in rows if depth == 0) / 1000 for rows in runs]
+    best = min(range(repeat), key=lambda index: totals[index])
+
+    heaviest: Dict[str, int] = {}
+    for name, cumulative, _ in runs[best]:
+        heaviest[name] = max(heaviest.get(name, 0), cumulative)
+    # Only third-party roots and app modules: their submodules are included in the cumulative time
+    ranked = sorted(
+        ((name, us) for name, us in heaviest.items() if "." not in name or name.startswith("app.")),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:top]
+
+    print("\n" + "=" * 72)
+    print(f"{Fore.CYAN}{Style.BRIGHT}{f'Cold import of {module}'.center(72)}{Style.RESET_ALL}")
+    print("=" * 72)
+    print(f"fastest {totals[best]:.0f} ms, slowest {max(totals):.0f} ms over {repeat} run(s)\n")
+    print(f"{'module':<56}{'cumulative ms':>16}")
+    for name, us in ranked:
+        print(f"{name:<56}{us / 1000:>16.1f}")
+
+    if max_ms and totals[best] > max_ms:
+        print(f"\n{Fore.RED}Import time {totals[best]:.0f} ms exceeds the {max_ms:.0f} ms budget{Style.RESET_ALL}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark application import time")
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=15, help="Heaviest modules to list")
+    parser.add_argument("--max-ms", type=float, default=0, help="Fail above this import time (0 = no budget)")
+    args = parser.parse_args()
+    sys.exit(main(args.module, args.repeat, args.top, args.max_ms))
@@ -0,0 +1,40 @@
+"""Guard against heavy dependencies creeping back into the `app.main` import path.
+
+benchmarks/import_time.py measures the cost; this test only checks which modules load.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Loaded on first use (graph build, first LLM call, first memory lookup), never at startup
+LAZY_PACKAGES = ("langgraph", "mem0", "tiktoken", "numpy", "langfuse")
+
+
+def imported_modules(statement: str) -> set:
+    """Return the modules loaded by `statement` in a fresh interpreter, from `-X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        env={**os.environ, "APP_ENV": "test"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like "import time:       123 |        456 |     package.module"
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def test_app_main_does_not_import_heavy_packages():
+    modules = imported_modules("import app.main")
+
+    assert "app.main" in modules
+    eager = sorted(module for module in modules if module.split(".")[0] in LAZY_PACKAGES)
+    assert eager == []
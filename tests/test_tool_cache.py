@@ -0,0 +1,84 @@
+"""Tests for the tool result cache wrapper (app/core/langgraph/tools/cache.py)."""
+
+import asyncio
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.tools import tool
+
+from app.core.langgraph.tools.cache import (
+    CachedTool,
+    MemoryToolCache,
+)
+from app.core.langgraph.tools.executor import ToolExecutor
+
+calls = []
+
+
+@tool
+async def lookup(query: str) -> str:
+    """Return a result for the query, recording each real call."""
+    calls.append(query)
+    return f"result:{query}"
+
+
+class ToolRunRecorder(AsyncCallbackHandler):
+    """Record the name of every tool run that starts and ends."""
+
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    async def on_tool_start(self, serialized, input_str, **kwargs):
+        self.started.append(serialized["name"])
+
+    async def on_tool_end(self, output, **kwargs):
+        self.ended.append(kwargs.get("name"))
+
+
+def cached_lookup() -> CachedTool:
+    calls.clear()
+    return CachedTool(lookup, MemoryToolCache("lookup", ttl=60, maxsize=10))
+
+
+def test_cache_hit_skips_the_tool_but_fires_callbacks():
+    cached_tool = cached_lookup()
+    recorder = ToolRunRecorder()
+    config = {"callbacks": [recorder]}
+
+    async def invoke_twice():
+        first = await cached_tool.ainvoke({"query": "a  b"}, config)
+        second = await cached_tool.ainvoke({"query": "a b"}, config)
+        return first, second
+
+    first, second = asyncio.run(invoke_twice())
+
+    assert first == second == "result:a  b"
+    assert calls == ["a  b"]
+    # Miss: the wrapper run plus the wrapped tool's child run; hit: the wrapper run only
+    assert recorder.started == ["lookup", "lookup", "lookup"]
+    assert recorder.ended == ["lookup", "lookup", "lookup"]
+
+
+def test_tool_call_input_is_cached():
+    cached_tool = cached_lookup()
+    tool_call = {"name": "lookup", "args": {"query": "x"}, "id": "1", "type": "tool_call"}
+
+    async def invoke_twice():
+        return await cached_tool.ainvoke(tool_call), await cached_tool.ainvoke({**tool_call, "id": "2"})
+
+    first, second = asyncio.run(invoke_twice())
+
+    assert (first.content, first.tool_call_id) == ("result:x", "1")
+    assert (second.content, second.tool_call_id) == ("result:x", "2")
+    assert calls == ["x"]
+
+
+def test_executor_passes_config_to_tools():
+    executor = ToolExecutor([cached_lookup()])
+    recorder = ToolRunRecorder()
+    tool_call = {"name": "lookup", "args": {"query": "q"}, "id": "1", "type": "tool_call"}
+
+    messages = asyncio.run(executor.run([tool_call], {"callbacks": [recorder]}))
+
+    assert messages[0].content == "result:q"
+    assert recorder.started[0] == "lookup"
@@ -0,0 +1,83 @@
+"""Tests for the concurrent tool executor (app/core/langgraph/tools/executor.py)."""
+
+import asyncio
+import time
+
+from langchain_core.tools import tool
+
+from app.core.config import settings
+from app.core.langgraph.tools.executor import ToolExecutor
+
+DELAY = 0.2
+
+
+@tool
+async def slow_echo(text: str) -> str:
+    """Return the text after a delay."""
+    await asyncio.sleep(DELAY)
+    return f"echo:{text}"
+
+
+@tool
+async def slow_upper(text: str) -> str:
+    """Return the text upper-cased after a delay."""
+    await asyncio.sleep(DELAY)
+    return text.upper()
+
+
+@tool
+async def broken(text: str) -> str:
+    """Always fail."""
+    raise RuntimeError("backend down")
+
+
+@tool
+async def hang(text: str) -> str:
+    """Never return in time."""
+    await asyncio.sleep(60)
+    return text
+
+
+def tool_call(name: str, call_id: str, text: str = "hi") -> dict:
+    return {"name": name, "args": {"text": text}, "id": call_id, "type": "tool_call"}
+
+
+def run(executor: ToolExecutor, tool_calls: list) -> tuple:
+    """Run the calls and return (messages, elapsed seconds)."""
+    start = time.perf_counter()
+    messages = asyncio.run(executor.run(tool_calls))
+    return messages, time.perf_counter() - start
+
+
+def test_tool_calls_overlap():
+    executor = ToolExecutor([slow_echo, slow_upper])
+
+    _, elapsed = run(executor, [tool_call("slow_echo", "1"), tool_call("slow_upper", "2")])
+
+    # Concurrent: about max(DELAY, DELAY), well under the sequential sum
+    assert elapsed < 1.5 * DELAY
+
+
+def test_results_keep_tool_call_order():
+    executor = ToolExecutor([slow_echo, slow_upper])
+    calls = [tool_call("slow_upper", "a", "first"), tool_call("slow_echo", "b", "second"), tool_call("slow_upper", "c")]
+
+    messages, _ = run(executor, calls)
+
+    assert [message.tool_call_id for message in messages] == ["a", "b", "c"]
+    assert [message.content for message in messages] == ["FIRST", "echo:second", "HI"]
+
+
+def test_failure_becomes_error_message(monkeypatch):
+    monkeypatch.setitem(settings.TOOL_TIMEOUTS, "hang", 0.05)
+    executor = ToolExecutor([slow_echo, broken, hang])
+    calls = [tool_call("broken", "1"), tool_call("slow_echo", "2"), tool_call("hang", "3"), tool_call("missing", "4")]
+
+    messages, elapsed = run(executor, calls)
+
+    assert [message.status for message in messages] == ["error", "success", "error", "error"]
+    assert "backend down" in messages[0].content
+    assert messages[1].content == "echo:hi"
+    assert "timed out" in messages[2].content
+    assert "unknown tool" in messages[3].content
+    assert elapsed < 1.5 * DELAY